@@ -4,9 +4,11 @@ from TreePrinter import print_tree
 import random
 
 class AVLNode(Node):
+    __slots__ = ("_key", "_value", "_left", "_right", "_parent", "_height")
+
     def __init__(self, key=None, value=None):
-        self.key = key
-        self.value = value
+        self._key = key
+        self._value = value
         self._left = None
         self._right = None
         self._parent = None
@@ -95,14 +97,39 @@ class AVLNode(Node):
         return self._height
 
     def _update_height(self):
-        l_height = 0 if self.left is None else self.left._height
-        r_height = 0 if self.right is None else self.right._height
-        self._height = 1 + max(l_height, r_height)
+        l_height = 0 if self._left is None else self._left._height
+        r_height = 0 if self._right is None else self._right._height
+        self._height = 1 + (l_height if l_height > r_height else r_height)
+
+    def _set_left(self, node):
+        """Link a left child without the checks of the `left` setter.
+
+        Used by the tree's rotations, which know that `node` is an AVLNode
+        or None and rewire every affected link themselves. The height of
+        self is not updated; the caller calls `_update_height()` once the
+        subtree below it is final.
+
+        Args:
+            node: the new left child.
+        """
+        self._left = node
+        if node is not None:
+            node._parent = self
+
+    def _set_right(self, node):
+        """Link a right child without the checks of the `right` setter.
+
+        Args:
+            node: the new right child.
+        """
+        self._right = node
+        if node is not None:
+            node._parent = self
 
     @property
     def balance(self):
-        l_height = 0 if self.left is None else self.left.height
-        r_height = 0 if self.right is None else self.right.height
+        l_height = 0 if self._left is None else self._left._height
+        r_height = 0 if self._right is None else self._right._height
         return l_height - r_height
 
 
@@ -130,11 +157,338 @@ class AVLNode(Node):
             return False
 
 
+def _sorted_nodes(tree, items):
+    """Create a detached node for each (key, value) pair, checking the key order.
+
+    Args:
+        tree: the AVLTree the nodes are for, which creates them with `_new_node`.
+        items: an iterable of (key, value) pairs.
+
+    Returns:
+        list: the AVLNodes, in the order of the pairs.
+
+    Raises:
+        ValueError: if the keys are not strictly increasing.
+    """
+    new_node = tree._new_node
+    nodes = [new_node(key, value) for key, value in items]
+    for i in range(1, len(nodes)):
+        if not nodes[i - 1]._key < nodes[i]._key:
+            raise ValueError("Keys must be strictly increasing.")
+    return nodes
+
+
+def _build_balanced(nodes, lo, hi):
+    """Link nodes[lo:hi] into a perfectly balanced subtree.
+
+    The recursion is only as deep as the subtree is high, O(log n).
+
+    Args:
+        nodes: AVLNodes in increasing key order.
+        lo: the index of the first node of the subtree.
+        hi: one past the index of the last node of the subtree.
+
+    Returns:
+        AVLNode: the root of the subtree, with no parent, or None if it is empty.
+    """
+    if lo >= hi:
+        return None
+    mid = (lo + hi) // 2
+    root = nodes[mid]
+    root._set_left(_build_balanced(nodes, lo, mid))
+    root._set_right(_build_balanced(nodes, mid + 1, hi))
+    root._update_height()
+    root._parent = None
+    return root
+
+
+class AVLCursor:
+    """A cursor over the entries of an AVLTree, in key order.
+
+    The cursor is positioned at one node of the tree, or off the tree. `seek`
+    and `seek_floor` position it by a descent from the root in O(log n).
+    `next` and `prev` then step to the neighbouring keys by following the
+    child and parent links, which costs amortized O(1) per step: a full
+    in-order walk crosses every edge twice. No recursion or stack is used.
+
+    The tree must not be modified while a cursor is in use.
+    """
+
+    def __init__(self, tree):
+        """Create a cursor over a tree, positioned off the tree.
+
+        Args:
+            tree: the AVLTree to walk.
+        """
+        self._tree = tree
+        self._node = None
+
+    def seek(self, key) -> bool:
+        """Move to the entry with the smallest key greater than or equal to key.
+
+        Args:
+            key: the lower bound.
+
+        Returns:
+            bool: True if there is such an entry, otherwise the cursor is off the tree.
+        """
+        best = None
+        node = self._tree.root
+        while node is not None:
+            if node._key < key:
+                node = node._right
+            else:
+                best = node
+                node = node._left
+        self._node = best
+        return best is not None
+
+    def seek_floor(self, key) -> bool:
+        """Move to the entry with the largest key less than or equal to key.
+
+        Args:
+            key: the upper bound.
+
+        Returns:
+            bool: True if there is such an entry, otherwise the cursor is off the tree.
+        """
+        best = None
+        node = self._tree.root
+        while node is not None:
+            if node._key > key:
+                node = node._left
+            else:
+                best = node
+                node = node._right
+        self._node = best
+        return best is not None
+
+    def seek_first(self) -> bool:
+        """Move to the entry with the smallest key.
+
+        Returns:
+            bool: True unless the tree is empty.
+        """
+        node = self._tree.root
+        if node is not None:
+            while node._left is not None:
+                node = node._left
+        self._node = node
+        return node is not None
+
+    def seek_last(self) -> bool:
+        """Move to the entry with the largest key.
+
+        Returns:
+            bool: True unless the tree is empty.
+        """
+        node = self._tree.root
+        if node is not None:
+            while node._right is not None:
+                node = node._right
+        self._node = node
+        return node is not None
+
+    def peek(self):
+        """Return the entry at the cursor without moving it.
+
+        Returns:
+            tuple: the (key, value) pair, or None if the cursor is off the tree.
+        """
+        node = self._node
+        return None if node is None else (node._key, node._value)
+
+    def next(self):
+        """Move to the entry with the next larger key.
+
+        Returns:
+            tuple: the (key, value) pair of the new entry, or None if there is
+                none, which leaves the cursor off the tree.
+        """
+        node = self._node
+        if node is None:
+            return None
+        if node._right is not None:
+            # The successor is the leftmost node of the right subtree
+            node = node._right
+            while node._left is not None:
+                node = node._left
+        else:
+            # Otherwise it is the first ancestor reached from a left subtree
+            parent = node._parent
+            while parent is not None and node is parent._right:
+                node, parent = parent, parent._parent
+            node = parent
+        self._node = node
+        return None if node is None else (node._key, node._value)
+
+    def prev(self):
+        """Move to the entry with the next smaller key.
+
+        Returns:
+            tuple: the (key, value) pair of the new entry, or None if there is
+                none, which leaves the cursor off the tree.
+        """
+        node = self._node
+        if node is None:
+            return None
+        if node._left is not None:
+            node = node._left
+            while node._right is not None:
+                node = node._right
+        else:
+            parent = node._parent
+            while parent is not None and node is parent._left:
+                node, parent = parent, parent._parent
+            node = parent
+        self._node = node
+        return None if node is None else (node._key, node._value)
+
+    def iter_to(self, high):
+        """Yield the entries from the cursor onwards while their keys are at most high.
+
+        This is `peek` followed by `next` in a loop, with the stepping inlined.
+        The cursor moves along, and ends on the first entry past high.
+
+        Args:
+            high: the highest key to yield.
+
+        Yields:
+            tuple: a (key, value) pair for each entry, in increasing key order.
+        """
+        node = self._node
+        while node is not None and not high < node._key:
+            yield (node._key, node._value)
+            if node._right is not None:
+                node = node._right
+                while node._left is not None:
+                    node = node._left
+            else:
+                parent = node._parent
+                while parent is not None and node is parent._right:
+                    node, parent = parent, parent._parent
+                node = parent
+            self._node = node
+
+
 class AVLTree(BST):
     def __init__(self):
         self.root = None
         self._size = 0
 
+    def _new_node(self, key, value):
+        """Create a detached node for a new entry.
+
+        Subclasses that keep extra data in their nodes override this.
+
+        Args:
+            key: the key of the entry.
+            value: the value of the entry.
+
+        Returns:
+            AVLNode: the new node.
+        """
+        return AVLNode(key, value)
+
+    def _replace_value(self, node, value):
+        """Replace the value of an existing entry.
+
+        Args:
+            node: the node of the entry.
+            value: the new value.
+        """
+        node.value = value
+
+    @classmethod
+    def from_sorted(cls, items, **kwargs):
+        """Build a tree from (key, value) pairs in increasing key order in O(n).
+
+        The middle pair becomes the root and each half is built the same way,
+        so the tree is perfectly balanced, with no rotations.
+
+        Args:
+            items: an iterable of (key, value) pairs with strictly increasing keys.
+            **kwargs: the arguments of the tree's constructor.
+
+        Returns:
+            AVLTree: the new tree.
+
+        Raises:
+            ValueError: if the keys are not strictly increasing.
+        """
+        tree = cls(**kwargs)
+        nodes = _sorted_nodes(tree, items)
+        tree.root = _build_balanced(nodes, 0, len(nodes))
+        tree._size = len(nodes)
+        return tree
+
+    def extend_sorted(self, items):
+        """Add (key, value) pairs whose keys all exceed the largest key in the tree.
+
+        The batch is built into a balanced tree in O(k), and joined to this
+        tree through its first node: that node is hung on the right spine of
+        the taller tree (or the left spine, if the batch is taller) where the
+        heights match, and the path above it is rebalanced. This costs
+        O(k + log n) for k new pairs, instead of O(k log n) for inserts.
+
+        Args:
+            items: an iterable of (key, value) pairs with strictly increasing keys.
+
+        Raises:
+            ValueError: if the keys are not strictly increasing, or the first
+                is not larger than every key in the tree.
+        """
+        nodes = _sorted_nodes(self, items)
+        if not nodes:
+            return
+        left = self.root
+        if left is not None:
+            last = left
+            while last._right is not None:
+                last = last._right
+            if not last._key < nodes[0]._key:
+                raise ValueError("Keys must be larger than every key in the tree.")
+        pivot = nodes[0]
+        right = _build_balanced(nodes, 1, len(nodes))
+        self._size += len(nodes)
+        l_height = 0 if left is None else left._height
+        r_height = 0 if right is None else right._height
+        if abs(l_height - r_height) <= 1:
+            pivot._set_left(left)
+            pivot._set_right(right)
+            pivot._update_height()
+            self.root = pivot
+            return
+        if l_height > r_height:
+            # Descend the right spine of the tree to a subtree as high as the batch
+            parent, node = None, left
+            while node is not None and node._height > r_height + 1:
+                parent, node = node, node._right
+            pivot._set_left(node)
+            pivot._set_right(right)
+            pivot._update_height()
+            parent._set_right(pivot)
+        else:
+            # Descend the left spine of the batch to a subtree as high as the tree
+            parent, node = None, right
+            while node is not None and node._height > l_height + 1:
+                parent, node = node, node._left
+            pivot._set_left(left)
+            pivot._set_right(node)
+            pivot._update_height()
+            parent._set_left(pivot)
+            self.root = right
+        # The joined subtree is at most one level higher than the one it replaced
+        self._restore_balance_from(pivot)
+
+    def cursor(self) -> AVLCursor:
+        """Return a new cursor over the tree, positioned off the tree.
+
+        Returns:
+            AVLCursor: the cursor.
+        """
+        return AVLCursor(self)
+
     def __len__(self):
         return self._size
 
@@ -176,9 +530,9 @@ class AVLTree(BST):
             else:
                 # We found the key, so update the value. This does not
                 # affect the balance or size so return immediately.
-                node.value = value
+                self._replace_value(node, value)
                 return
-        new_node = AVLNode(key, value)
+        new_node = self._new_node(key, value)
         # If prev is still none, we are at the root, and this is the first
         # node inserted into the tree.
         if prev is None:
@@ -188,9 +542,10 @@ class AVLTree(BST):
         # Figure out which child of the previous node we should insert 
         # the new node at
         if key < prev.key:
-            prev.left = new_node
+            prev._set_left(new_node)
         else:
-            prev.right = new_node
+            prev._set_right(new_node)
+        prev._update_height()
         # Rebalance the tree starting and the parent of the newly
         # inserted node
         self._restore_balance_from(prev)
@@ -206,15 +561,20 @@ class AVLTree(BST):
         self._remove_node(self.search(key))
 
     def _rot_right(self, n):
-        x = n.left
-        n.left = x.right
-        x.right = n
+        # The caller links the returned root x into n's old position
+        x = n._left
+        n._set_left(x._right)
+        n._update_height()
+        x._set_right(n)
+        x._update_height()
         return x
 
     def _rot_left(self, n):
-        x = n.right
-        n.right = x.left
-        x.left = n
+        x = n._right
+        n._set_right(x._left)
+        n._update_height()
+        x._set_left(n)
+        x._update_height()
         return x
 
     def _rebalance(self, node):
@@ -231,12 +591,12 @@ class AVLTree(BST):
         if abs(b) <= 1:
             return node
         if b > 1:
-            if node.left.balance < 0:
-                node.left = self._rot_left(node.left)
+            if node._left.balance < 0:
+                node._set_left(self._rot_left(node._left))
             x = self._rot_right(node)
         else: # b < -1
-            if node.right.balance > 0:
-                node.right = self._rot_right(node.right)
+            if node._right.balance > 0:
+                node._set_right(self._rot_right(node._right))
             x = self._rot_left(node)
         return x
 
@@ -250,16 +610,18 @@ class AVLTree(BST):
         if node is None:
             raise ValueError
         cur = node
-        p = node.parent
+        p = node._parent
         while p is not None:
-            if cur is p.left:
-                p.left = self._rebalance(cur)
+            if cur is p._left:
+                p._set_left(self._rebalance(cur))
             else:
-                p.right = self._rebalance(cur)
+                p._set_right(self._rebalance(cur))
+            p._update_height()
             cur = p
-            p = p.parent
+            p = p._parent
         # We have now reached the root
-        self.root = self._rebalance(cur)
+        root = self.root = self._rebalance(cur)
+        root._parent = None
 
     def _get_successor(self, node: AVLNode):
         if node is None or node.right is None:
@@ -317,6 +679,6 @@ class AVLTree(BST):
         # the size here.
         else:
             s = self._get_successor(node)
-            node.value = s.value
+            self._replace_value(node, s.value)
             node.key = s.key
             self._remove_node(s)
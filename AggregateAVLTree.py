@@ -0,0 +1,136 @@
+from collections import namedtuple
+from AVLTree import AVLTree, AVLNode
+
+# The aggregate of the measured values of a range of entries: their number, sum,
+# minimum and maximum. The minimum and maximum are None for an empty range.
+Aggregate = namedtuple("Aggregate", ["count", "total", "min", "max"])
+
+EMPTY = Aggregate(0, 0, None, None)
+
+
+class AggregateAVLNode(AVLNode):
+    """An AVLNode that also holds aggregates of the measured values of its subtree.
+
+    Every node stores the measure of its own value (its weight), and the count,
+    sum, minimum and maximum of the weights in its subtree. They are recomputed
+    from the children in `_update_height`, which the tree already calls for
+    every node whose subtree changes: on the path of an insert or delete, and
+    for both nodes of each rotation.
+    """
+    __slots__ = ("_weight", "_count", "_sum", "_min", "_max")
+
+    def __init__(self, key=None, value=None, weight=0):
+        """Create a detached node.
+
+        Args:
+            key: the key of the node.
+            value: the value of the node.
+            weight: the measure of the value. (Default: 0)
+        """
+        super().__init__(key, value)
+        self._weight = self._sum = self._min = self._max = weight
+        self._count = 1
+
+    def _update_height(self):
+        left, right = self._left, self._right
+        weight = self._weight
+        count, total, lo, hi = 1, weight, weight, weight
+        l_height = r_height = 0
+        if left is not None:
+            l_height = left._height
+            count += left._count
+            total += left._sum
+            if left._min < lo:
+                lo = left._min
+            if left._max > hi:
+                hi = left._max
+        if right is not None:
+            r_height = right._height
+            count += right._count
+            total += right._sum
+            if right._min < lo:
+                lo = right._min
+            if right._max > hi:
+                hi = right._max
+        self._height = 1 + (l_height if l_height > r_height else r_height)
+        self._count, self._sum, self._min, self._max = count, total, lo, hi
+
+
+class AggregateAVLTree(AVLTree):
+    """An AVLTree that answers count, sum, min and max over any key range in O(log n).
+
+    Each value is mapped to a number by a `measure` function, e.g. the price of a
+    (price, min, max, avg) tuple. Nodes keep the aggregates of their subtrees, so
+    `aggregate(low, high)` combines O(log n) subtrees instead of visiting every
+    entry in the range.
+    """
+
+    def __init__(self, measure=None):
+        """Create an empty tree.
+
+        Args:
+            measure: a function of one argument that maps each value to the number
+                that is aggregated. (Default: None, which aggregates the values)
+        """
+        super().__init__()
+        self._measure = measure
+
+    def _new_node(self, key, value):
+        weight = value if self._measure is None else self._measure(value)
+        return AggregateAVLNode(key, value, weight)
+
+    def _replace_value(self, node, value):
+        node.value = value
+        node._weight = value if self._measure is None else self._measure(value)
+        # Refresh the aggregates of the node and of every subtree that contains it
+        while node is not None:
+            node._update_height()
+            node = node._parent
+
+    def aggregate(self, low, high) -> Aggregate:
+        """Aggregate the measured values of the entries with keys in [low, high].
+
+        The search descends to the first node inside the range, where the paths
+        to low and high split. Below it, each node on the path to low that is in
+        the range contributes its weight and its whole right subtree, and each
+        node on the path to high contributes its weight and its left subtree.
+
+        Args:
+            low: the lowest key to include.
+            high: the highest key to include.
+
+        Returns:
+            Aggregate: the count, total, min and max of the measured values, or
+                EMPTY if no key is in the range.
+        """
+        node = self.root
+        while node is not None and not low <= node._key <= high:
+            node = node._right if node._key < low else node._left
+        if node is None:
+            return EMPTY
+        weight = node._weight
+        pieces = [(1, weight, weight, weight)]
+        # The left boundary: every key found here is below the split node's
+        n = node._left
+        while n is not None:
+            if n._key < low:
+                n = n._right
+            else:
+                pieces.append((1, n._weight, n._weight, n._weight))
+                r = n._right
+                if r is not None:
+                    pieces.append((r._count, r._sum, r._min, r._max))
+                n = n._left
+        # The right boundary: every key found here is above the split node's
+        n = node._right
+        while n is not None:
+            if n._key > high:
+                n = n._left
+            else:
+                pieces.append((1, n._weight, n._weight, n._weight))
+                l = n._left
+                if l is not None:
+                    pieces.append((l._count, l._sum, l._min, l._max))
+                n = n._right
+        return Aggregate(sum(p[0] for p in pieces), sum(p[1] for p in pieces),
+                         min(p[2] for p in pieces), max(p[3] for p in pieces))
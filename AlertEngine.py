@@ -0,0 +1,206 @@
+from collections import namedtuple
+from datetime import datetime
+from AVLTree import AVLTree
+from BST import range_iter
+
+# An alert raised when a rule fires
+Alert = namedtuple("Alert", ["rule_id", "name", "kind", "level", "time", "price"])
+
+# Kinds of rules: price crossing a level upwards or downwards, and price breaking
+# the 10-day maximum or minimum it had before the tick
+LEVEL_KINDS = ("above", "below")
+BREAK_KINDS = ("new_high", "new_low")
+
+
+class AlertEngine:
+    """
+    A class to evaluate price alert rules on every tick.
+
+    Level rules ("above" and "below") are indexed per asset in AVL trees keyed by
+    level, so a tick moving the price from `old` to `new` only visits the levels in
+    between: an "above" rule fires when old < level <= new, and a "below" rule fires
+    when new <= level < old. This costs O(log R + F) for R rules on the asset, F of
+    which fire. Break rules ("new_high" and "new_low") fire when a price exceeds the
+    10-day maximum, or falls below the 10-day minimum, recorded at the previous tick.
+
+    Fired alerts are queued, and `flush()` delivers them in batches: each callback is
+    called once with the list of all its alerts queued since the last flush.
+    """
+
+    def __init__(self):
+        """
+        Initializes an AlertEngine with no rules.
+        """
+        self._rules = {}  # Maps rule IDs to (asset ID, name, kind, level, callback)
+        self._next_id = 0
+        self._levels = {"above": {}, "below": {}}  # Kind -> asset ID -> AVLTree of level -> {rule ID: None}
+        self._breaks = {"new_high": {}, "new_low": {}}  # Kind -> asset ID -> {rule ID: None}
+        self._rule_count = {}  # Maps asset IDs to their number of rules
+        self._pending = []  # Queued (callback, Alert) pairs
+
+    def __len__(self):
+        """Return the number of registered rules.
+
+        Returns:
+            int: the number of rules.
+        """
+        return len(self._rules)
+
+    def watches(self, asset_id: int) -> bool:
+        """
+        Checks whether an asset has any rules.
+
+        Args:
+            asset_id (int): The ID of the asset.
+
+        Returns:
+            bool: True if at least one rule is registered for the asset.
+        """
+        return asset_id in self._rule_count
+
+    def add_rule(self, asset_id: int, name: str, kind: str, level: float, callback) -> int:
+        """
+        Registers a new rule.
+
+        Args:
+            asset_id (int): The ID of the asset the rule watches.
+            name (str): The name of the asset, reported in its alerts.
+            kind (str): One of "above", "below", "new_high" or "new_low".
+            level (float): The price level of "above" and "below" rules, ignored otherwise.
+            callback (callable): Called with a list of Alerts when the rule fires.
+
+        Returns:
+            int: The ID of the new rule.
+
+        Raises:
+            ValueError: If `kind` is unknown or a level rule has no level.
+        """
+        if kind in LEVEL_KINDS:
+            if level is None:
+                raise ValueError(f"A '{kind}' rule needs a level.")
+            tree = self._levels[kind].setdefault(asset_id, AVLTree())
+            try:
+                rules = tree.get_value(level)
+            except KeyError:
+                rules = {}
+                tree.insert(level, rules)
+        elif kind in BREAK_KINDS:
+            level = None
+            rules = self._breaks[kind].setdefault(asset_id, {})
+        else:
+            raise ValueError(f"Unknown rule kind '{kind}', expected one of {LEVEL_KINDS + BREAK_KINDS}.")
+
+        rule_id = self._next_id
+        self._next_id += 1
+        rules[rule_id] = None
+        self._rules[rule_id] = (asset_id, name, kind, level, callback)
+        self._rule_count[asset_id] = self._rule_count.get(asset_id, 0) + 1
+        return rule_id
+
+    def remove_rule(self, rule_id: int):
+        """
+        Removes a rule.
+
+        Args:
+            rule_id (int): The ID returned by `add_rule()`.
+
+        Raises:
+            KeyError: If no rule has this ID.
+        """
+        if rule_id not in self._rules:
+            raise KeyError(f"Alert rule {rule_id} not found.")
+        asset_id, _, kind, level, _ = self._rules.pop(rule_id)
+        if kind in LEVEL_KINDS:
+            tree = self._levels[kind][asset_id]
+            rules = tree.get_value(level)
+            del rules[rule_id]
+            if not rules:
+                tree.delete(level)
+            if len(tree) == 0:
+                del self._levels[kind][asset_id]
+        else:
+            rules = self._breaks[kind][asset_id]
+            del rules[rule_id]
+            if not rules:
+                del self._breaks[kind][asset_id]
+        self._rule_count[asset_id] -= 1
+        if self._rule_count[asset_id] == 0:
+            del self._rule_count[asset_id]
+
+    def on_tick(self, asset_id: int, time: datetime, price: float, previous):
+        """
+        Queues the alerts fired by a new price of an asset.
+
+        Args:
+            asset_id (int): The ID of the asset.
+            time (datetime): The timestamp of the new price.
+            price (float): The new price.
+            previous (tuple): The (time, (price, 10-day min, 10-day max, 10-day avg)) of the
+                asset's previous data point, or None if this is its first price.
+        """
+        if previous is None:
+            return
+        old_price, old_min, old_max, _ = previous[1]
+        if price > old_price:
+            tree = self._levels["above"].get(asset_id)
+            if tree is not None:
+                for level, rules in range_iter(tree, old_price, price):
+                    if level != old_price:
+                        self._queue(rules, time, price)
+        elif price < old_price:
+            tree = self._levels["below"].get(asset_id)
+            if tree is not None:
+                for level, rules in range_iter(tree, price, old_price):
+                    if level != old_price:
+                        self._queue(rules, time, price)
+        if price > old_max:
+            rules = self._breaks["new_high"].get(asset_id)
+            if rules is not None:
+                self._queue(rules, time, price)
+        elif price < old_min:
+            rules = self._breaks["new_low"].get(asset_id)
+            if rules is not None:
+                self._queue(rules, time, price)
+
+    def _queue(self, rules, time: datetime, price: float):
+        """
+        Queues one alert for each of the given rules.
+
+        Args:
+            rules (dict): The IDs of the rules that fired, as keys.
+            time (datetime): The timestamp of the price that fired them.
+            price (float): The price that fired them.
+        """
+        for rule_id in rules:
+            _, name, kind, level, callback = self._rules[rule_id]
+            self._pending.append((callback, Alert(rule_id, name, kind, level, time, price)))
+
+    def flush(self):
+        """
+        Delivers all queued alerts, calling each callback once with its alerts in firing order.
+
+        Callbacks are grouped by identity, so they need not be hashable. Every callback is
+        called even if an earlier one raises; the first exception is raised afterwards.
+
+        Raises:
+            Exception: The first exception raised by a callback, once every callback has
+                been called.
+        """
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        batches = {}  # Maps id(callback) to the callback and its alerts
+        for callback, alert in pending:
+            batch = batches.get(id(callback))
+            if batch is None:
+                batch = batches[id(callback)] = (callback, [])
+            batch[1].append(alert)
+        error = None
+        for callback, alerts in batches.values():
+            try:
+                callback(alerts)
+            except Exception as e:
+                if error is None:
+                    error = e
+        if error is not None:
+            raise error
@@ -116,8 +116,59 @@ def range_query(tree : BST, low, high):
     return result
 
 
+def range_iter(tree : BST, low, high):
+    """Lazily yield all key-value pairs in a BST with keys in the specified range.
 
+    This visits the same entries as range_query, in increasing key order,
+    but walks the tree with an explicit stack and yields each pair as it
+    is reached instead of building a list.
 
+    Args:
+        tree: A BST in which we want to search.
+        low: The lowest key to include in the query.
+        high: The highest key to include in the query.
 
+    Yields:
+        tuple: a (key, value) pair for each key in the range.
+    """
+    stack = []
+    node = tree.root
+    while True:
+        # Walk left as far as keys can still be in range
+        while node is not None:
+            if node._key < low:
+                node = node._right
+            else:
+                stack.append(node)
+                node = node._left
+        if not stack:
+            return
+        node = stack.pop()
+        if node._key > high:
+            return
+        yield (node._key, node._value)
+        node = node._right
 
 
+def floor_item(tree : BST, key):
+    """Return the entry with the largest key less than or equal to key.
+
+    Args:
+        tree: A BST in which we want to search.
+        key: The key to search for.
+
+    Returns:
+        tuple: the (key, value) pair found, or None if every key in the
+            tree is greater than key.
+    """
+    best = None
+    node = tree.root
+    while node is not None:
+        if node._key > key:
+            node = node._left
+        else:
+            best = node
+            node = node._right
+    if best is None:
+        return None
+    return (best._key, best._value)
@@ -0,0 +1,125 @@
+from datetime import datetime
+from PriceTracker import PriceTracker
+
+# Number of updates after which a basket recomputes its value from scratch, so
+# rounding errors from applying deltas cannot build up
+RESYNC_EVERY = 100_000
+
+
+class Basket:
+    """
+    A class to maintain the value of a weighted basket of assets, such as a custom index.
+
+    The value of the basket is the weighted sum of the latest prices of its constituents.
+    It becomes available once every constituent has a price, and from then on each
+    constituent tick updates it in O(1) by adding weight * (new price - old price).
+    Every update is recorded in an internal `PriceTracker`, which provides the basket's
+    time series together with its rolling 10-day minimum, maximum and average.
+
+    Attributes:
+        name (str): The name of the basket.
+        value (float): The current value of the basket, or None until every constituent
+            has a price.
+    """
+
+    def __init__(self, name: str, weights: dict):
+        """
+        Initializes a basket with the given constituent weights and no prices.
+
+        Args:
+            name (str): The name of the basket.
+            weights (dict[str, float]): Maps each constituent asset name to its weight.
+
+        Raises:
+            ValueError: If `weights` is empty.
+        """
+        if not weights:
+            raise ValueError("A basket needs at least one constituent.")
+        self.name = name
+        self.value = None
+        self._weights = dict(weights)
+        self._prices = {}  # Latest price of each constituent that has one
+        self._updates = 0  # Updates since the value was last computed from scratch
+        self._tracker = PriceTracker()
+        self._last_time = None
+
+    @property
+    def weights(self) -> dict:
+        """
+        dict: a copy of the weight of each constituent, keyed by asset name.
+        """
+        return dict(self._weights)
+
+    def seed(self, prices: dict):
+        """
+        Sets the latest prices of some constituents without recording a value.
+
+        This is used when a basket is created over assets that already have prices.
+
+        Args:
+            prices (dict[str, float]): Maps constituent names to their latest prices.
+
+        Raises:
+            KeyError: If a name is not a constituent of the basket.
+        """
+        for name, price in prices.items():
+            if name not in self._weights:
+                raise KeyError(f"Asset '{name}' is not a constituent of basket '{self.name}'.")
+            self._prices[name] = price
+        if len(self._prices) == len(self._weights):
+            self._resync()
+
+    def update(self, name: str, time: datetime, price: float):
+        """
+        Applies a constituent tick to the basket value and records the new value.
+
+        A tick with the same timestamp as the last recorded value replaces that value
+        in the basket's time series instead of adding a new one.
+
+        Args:
+            name (str): The constituent that ticked.
+            time (datetime): The timestamp of the tick.
+            price (float): The new price of the constituent.
+
+        Raises:
+            KeyError: If `name` is not a constituent of the basket.
+        """
+        weight = self._weights[name]
+        old = self._prices.get(name)
+        self._prices[name] = price
+        if self.value is None:
+            if len(self._prices) < len(self._weights):
+                return
+            self._resync()
+        elif self._updates >= RESYNC_EVERY:
+            self._resync()
+        else:
+            self.value += weight * (price - old)
+            self._updates += 1
+
+        if self._last_time is None or time > self._last_time:
+            self._tracker.add_price(time, self.value)
+            self._last_time = time
+        elif time == self._last_time:
+            self._tracker.correct_price(time, self.value)
+
+    def _resync(self):
+        """
+        Recomputes the basket value from the latest constituent prices.
+        """
+        self.value = sum(w * self._prices[n] for n, w in self._weights.items())
+        self._updates = 0
+
+    def get_price_data(self, start: datetime, end: datetime):
+        """
+        Retrieves the recorded basket values within the specified datetime range (inclusive).
+
+        Args:
+            start (datetime): The start of the time range (inclusive).
+            end (datetime): The end of the time range (inclusive).
+
+        Returns:
+            list[tuple[datetime, tuple[float, float, float, float]]]: The timestamp and the
+                (value, 10-day min, 10-day max, 10-day average) of each recorded value.
+        """
+        return self._tracker.get_price_data(start, end)
@@ -1,3 +1,5 @@
+from collections import deque
+from heapq import heappop, heappush
 from TreeNode import TreeNode
 from TreePrinter import print_tree
 
@@ -49,52 +51,45 @@ class MinHeap:
         Raises:
              ValueError: if x does not have a parent.
         """
-        p = x.parent
+        p = x._parent
         if p is None:
             raise ValueError("Node {x} has no parent")
 
-        # Save the left and right children of p and x then break these
-        # links from p to its children (including x)
-        pr, pl = p.right, p.left
-        p.right, p.left = None, None
+        # Save the children of p and x. The links are rewritten below with the
+        # unchecked _set_left/_set_right, which also set the parents.
+        pl, pr = p._left, p._right
+        xl, xr = x._left, x._right
 
         # Now we put x into the correct position with respect to p's
         # parent p2:
-        p2 = p.parent
+        p2 = p._parent
         # If p was the root, make x the root instead
         if p2 is None:
             self.root = x
+            x._parent = None
         # If p was a left child of its parent, make x the left child
         # of this parent instead
-        elif p2.left is p:
-            p2.left = x
+        elif p2._left is p:
+            p2._set_left(x)
         # If p was a right child of its parent, make x a right child
         # instead
         else:
-            p2.right = x
+            p2._set_right(x)
 
-        # Next we need to exchange x and p's children One of these
-        # will be x so we need to put that in the position that p was
-        # in:
-
-        # First, save x's old left and right children, then break
-        # these links
-        xl, xr = x.left, x.right
-        x.left, x.right = None, None
         # Next, set x's new children to be p's old children, except...
         # ...if x was a left child of p, then p should be a left
         # child of x
         if x is pl:
-            x.left = p
-            x.right = pr
+            x._set_left(p)
+            x._set_right(pr)
         # ...if x was a right child of p, then p should be a right
         # child of x
         else:
-            x.left = pl
-            x.right = p
+            x._set_left(pl)
+            x._set_right(p)
         # Finally, make p's new children x's old children
-        p.left = xl
-        p.right = xr
+        p._set_left(xl)
+        p._set_right(xr)
 
     def _replace_node_with_leaf(self, node: TreeNode, leaf: TreeNode):
         """Replaces the given node with the given leaf node.
@@ -126,26 +121,34 @@ class MinHeap:
         if leaf.parent is None:
             raise ValueError("The specified node has no parent")
         # Remove the leaf node from its parent
-        leaf.parent.remove_leaf(leaf)
+        leaf_parent = leaf._parent
+        if leaf_parent._left is leaf:
+            leaf_parent._left = None
+        else:
+            leaf_parent._right = None
         # Remove the children from the replaced node, and then assign them
         # as children to the leaf that is replacing node.
-        nl, nr = node.left, node.right
-        node.left, node.right = None, None
-        leaf.left, leaf.right = nl, nr
+        nl, nr = node._left, node._right
+        node._left = node._right = None
+        leaf._set_left(nl)
+        leaf._set_right(nr)
 
         # Insert the leaf node into the same position as the removed
         # node:
 
         # Check if the removed node is the root. If so, we make
         # replacement leaf the root:
-        if node.parent is None:
+        parent = node._parent
+        if parent is None:
             self.root = leaf
+            leaf._parent = None
         # Otherwise, make the leaf the left or right child of the replaced
         # node's parent, as appropriate:
-        elif node is node.parent.left:
-            node.parent.left = leaf
+        elif node is parent._left:
+            parent._set_left(leaf)
         else:
-            node.parent.right = leaf
+            parent._set_right(leaf)
+        node._parent = None
         return node
 
     def _get_node_at(self, ix: int) -> TreeNode:
@@ -224,7 +227,7 @@ class MinHeap:
         Args:
             node (TreeNode): The node to be sifted upward.
         """
-        while node.parent and node.key < node.parent.key:
+        while node._parent is not None and node._key < node._parent._key:
             # Swap node with its parent
             self._swap_node_with_parent(node)
 
@@ -238,17 +241,18 @@ class MinHeap:
         """
         while node:
             smallest = node
+            left, right = node._left, node._right
 
             # Check if left child exists and is smaller
-            if node.left and node.left.key < smallest.key:
-                smallest = node.left
+            if left is not None and left._key < smallest._key:
+                smallest = left
 
             # Check if right child exists and is smaller
-            if node.right and node.right.key < smallest.key:
-                smallest = node.right
+            if right is not None and right._key < smallest._key:
+                smallest = right
 
             # If the smallest node is not the current node, swap them
-            if smallest != node:
+            if smallest is not node:
                 self._swap_node_with_parent(smallest)
             else:
                 break  # Stop when the node is in the correct position
@@ -312,6 +316,137 @@ class MinHeap:
 
         return self.insert_node(new_node) # Return the newly inserted node for testing
 
+    def update_key(self, node: TreeNode, key):
+        """
+        Changes the key of a node in the heap and restores the heap order.
+
+        The node is sifted up or down in place, so references to it stay valid.
+
+        Args:
+            node (TreeNode): A node in the heap.
+            key (Comparable): The new key.
+        """
+        node.key = key
+        if node.parent is not None and key < node.parent.key:
+            self._sift_up(node)
+        else:
+            self._sift_down(node)
+
+    @classmethod
+    def from_iterable(cls, pairs):
+        """
+        Builds a heap from (key, value) pairs in O(n) time.
+
+        Args:
+            pairs (Iterable[tuple]): The (key, value) pairs to store.
+
+        Returns:
+            tuple[MinHeap, list[TreeNode]]: The new heap and the node of each pair, in
+                input order.
+        """
+        heap = cls()
+        nodes = heap.heapify(pairs)
+        return heap, nodes
+
+    def heapify(self, pairs):
+        """
+        Adds many (key, value) pairs to the heap at once.
+
+        Instead of sifting up every new node, all nodes are relinked into a complete
+        binary tree in level order and then sifted down bottom-up, starting from the
+        last node with children. This costs O(n) for n nodes in total, instead of
+        O(n log n) for repeated inserts.
+
+        Args:
+            pairs (Iterable[tuple]): The (key, value) pairs to add.
+
+        Returns:
+            list[TreeNode]: The new node of each pair, in input order.
+        """
+        new_nodes = [TreeNode(key, value) for key, value in pairs]
+        if not new_nodes:
+            return new_nodes
+
+        # Collect the existing nodes in level order, then unlink every node
+        nodes = []
+        queue = deque([] if self.root is None else [self.root])
+        while queue:
+            node = queue.popleft()
+            nodes.append(node)
+            if node.left is not None:
+                queue.append(node.left)
+            if node.right is not None:
+                queue.append(node.right)
+        nodes.extend(new_nodes)
+        for node in nodes:
+            node._left = node._right = node._parent = None
+
+        # Node i of the level order is the child of node (i - 1) // 2
+        for i in range(1, len(nodes)):
+            parent = nodes[(i - 1) // 2]
+            if i % 2 == 1:
+                parent.left = nodes[i]
+            else:
+                parent.right = nodes[i]
+        self.root = nodes[0]
+        self._size = len(nodes)
+
+        # Sifting down a node only moves nodes within its subtree, so the nodes
+        # before it in the level order are still where the list says they are
+        for i in range(len(nodes) // 2 - 1, -1, -1):
+            self._sift_down(nodes[i])
+        return new_nodes
+
+    def iter_sorted(self, limit: int = None):
+        """
+        Lazily yields the nodes of the heap in key order, without changing the heap.
+
+        A frontier heap holds the nodes whose parents have been yielded, starting with
+        the root. The smallest node in the frontier is always the next in key order;
+        once it is yielded its children join the frontier. The first k nodes therefore
+        cost O(k log k), however large the heap is. The heap must not be modified
+        while the iteration is in progress.
+
+        Args:
+            limit (int, optional): The largest number of nodes to yield. Defaults to
+                None, which yields every node.
+
+        Returns:
+            Iterator[TreeNode]: The nodes, from the smallest key up.
+
+        Raises:
+            ValueError: If `limit` is negative.
+        """
+        if limit is not None and limit < 0:
+            raise ValueError("limit must not be negative.")
+        return self._iter_sorted(len(self) if limit is None else limit)
+
+    def _iter_sorted(self, limit: int):
+        """
+        Yields the first `limit` nodes in key order, for `iter_sorted()`.
+
+        Args:
+            limit (int): The number of nodes to yield.
+
+        Yields:
+            TreeNode: The nodes, from the smallest key up.
+        """
+        if self.root is None or limit == 0:
+            return
+        # The counter breaks ties between equal keys, so nodes are never compared
+        frontier = [(self.root._key, 0, self.root)]
+        seq = 1
+        while frontier:
+            node = heappop(frontier)[2]
+            yield node
+            limit -= 1
+            if limit == 0:
+                return
+            for child in (node._left, node._right):
+                if child is not None:
+                    heappush(frontier, (child._key, seq, child))
+                    seq += 1
+
     def extract(self):
         """
         Removes and returns the root node (minimum key node) from the heap. After
@@ -0,0 +1,531 @@
+ARITIES = (2, 4, 8)
+
+
+class HeapEntry:
+    """
+    A handle to an element of an IndexedMinHeap.
+
+    Attributes:
+        key (Comparable): The key used to order the heap.
+        value (Any): The data stored with the key.
+    """
+
+    __slots__ = ("key", "value", "_rank", "_pos")
+
+    def __init__(self, key=None, value=None):
+        """
+        Initializes an entry that is not in any heap.
+
+        Args:
+            key (Comparable, optional): The key used to order the heap.
+            value (Any, optional): The data stored with the key.
+        """
+        self.key = key
+        self.value = value
+        self._rank = key  # What the heap compares: the key, or its key function applied to it
+        self._pos = -1  # Index of the entry in its heap's list, or -1 if it is not in a heap
+
+    def __repr__(self):
+        """
+        Returns a string representation of the entry, showing its key and value.
+
+        Returns:
+            str: String representation of the HeapEntry.
+        """
+        return f"HeapEntry(key={self.key}, value={self.value})"
+
+
+class IndexedMinHeap:
+    """This class implements an array-backed d-ary min-heap with handles.
+
+    The heap has the same interface as the linked `MinHeap`: `insert` returns a
+    handle (a HeapEntry) that can later be passed to `delete_node`, and `root` is
+    the entry with the smallest key. The entries are stored in a Python list, with
+    the children of index i at d*i + 1 to d*i + d, and every entry remembers its own
+    index. Deleting an arbitrary entry therefore costs O(log n) with no walk from
+    the root, and sifting moves references within the list instead of relinking nodes.
+
+    A wider arity d makes the tree shallower, so sifting up (on insert) is cheaper,
+    while each step of sifting down (on extract and delete) compares more children.
+    Like `sorted`, the heap can order entries by a `key` function of their keys: the
+    function is applied once per insert, and its result is what the heap compares.
+    `IndexedMaxHeap` keeps the largest key at the root instead.
+
+    With a `compact_ratio`, deletion is lazy: `delete_node` only marks the entry as a
+    tombstone in O(1). A tombstone stays in the array until it surfaces at the root,
+    where it is discarded, or until tombstones make up more than `compact_ratio` of the
+    array, when the live entries are rebuilt into a heap in O(n). Windows that drop
+    many old entries at once then pay for few sifts.
+
+    Attributes:
+        root: Optional[HeapEntry] the entry with the smallest key, or None if the heap is empty.
+    """
+
+    def __init__(self, arity: int = 2, key=None, compact_ratio: float = None):
+        """
+        Creates a new, empty heap.
+
+        Args:
+            arity (int): The number of children of each entry: 2, 4 or 8. Defaults to 2.
+            key (callable, optional): A function of one argument that maps each key to
+                the value that is compared. Defaults to None, which compares the keys.
+            compact_ratio (float, optional): The fraction of tombstones in the array above
+                which the heap is compacted, between 0 and 1. Defaults to None, which
+                deletes entries eagerly.
+
+        Raises:
+            ValueError: If `arity` is not 2, 4 or 8, or `compact_ratio` is not between 0 and 1.
+        """
+        if arity not in ARITIES:
+            raise ValueError(f"arity must be one of {ARITIES}.")
+        if compact_ratio is not None and not 0 < compact_ratio < 1:
+            raise ValueError("compact_ratio must be between 0 and 1.")
+        self._entries = []
+        self._arity = arity
+        self._key = key
+        self._compact_ratio = compact_ratio
+        self._dead = set()  # Tombstoned entries still in the array
+
+    def __len__(self):
+        """Return the number of entries stored in the heap.
+
+        Returns:
+            int: the number of entries in the heap, not counting tombstones.
+        """
+        return len(self._entries) - len(self._dead)
+
+    @property
+    def root(self):
+        """
+        HeapEntry: the entry with the smallest key, or None if the heap is empty.
+        """
+        if self._dead:
+            self._discard_dead_roots()
+        return self._entries[0] if self._entries else None
+
+    def _pop_root(self) -> HeapEntry:
+        """
+        Removes the root from the array, moving the last entry in its place.
+
+        Returns:
+            HeapEntry: The removed entry.
+        """
+        entries = self._entries
+        root = entries[0]
+        last = entries.pop()
+        if entries:
+            entries[0] = last
+            self._sift_down(0)
+        root._pos = -1
+        return root
+
+    def _discard_dead_roots(self):
+        """
+        Removes tombstones from the root until a live entry, or nothing, is left there.
+        """
+        entries = self._entries
+        dead = self._dead
+        while entries and entries[0] in dead:
+            dead.remove(self._pop_root())
+
+    def _compact(self):
+        """
+        Removes all tombstones from the array and rebuilds the heap bottom-up in O(n).
+        """
+        dead = self._dead
+        for entry in dead:
+            entry._pos = -1
+        entries = self._entries = [entry for entry in self._entries if entry._pos != -1]
+        dead.clear()
+        for pos, entry in enumerate(entries):
+            entry._pos = pos
+        for pos in range((len(entries) - 2) // self._arity, -1, -1):
+            self._sift_down(pos)
+
+    def _check_live(self, node: HeapEntry):
+        """
+        Checks that an entry is in this heap and is not a tombstone.
+
+        Args:
+            node (HeapEntry): The handle of the entry.
+
+        Raises:
+            KeyError: If the entry is not in this heap or has been deleted.
+        """
+        entries = self._entries
+        pos = node._pos
+        if not 0 <= pos < len(entries) or entries[pos] is not node or node in self._dead:
+            raise KeyError(f"{node} is not in the heap.")
+
+    def _sift_up(self, pos: int):
+        """
+        Moves the entry at `pos` towards the root until its parent's rank is not larger.
+
+        Args:
+            pos (int): The index of the entry.
+        """
+        entries = self._entries
+        arity = self._arity
+        entry = entries[pos]
+        rank = entry._rank
+        while pos > 0:
+            parent_pos = (pos - 1) // arity
+            parent = entries[parent_pos]
+            if not rank < parent._rank:
+                break
+            entries[pos] = parent
+            parent._pos = pos
+            pos = parent_pos
+        entries[pos] = entry
+        entry._pos = pos
+
+    def _sift_down(self, pos: int):
+        """
+        Moves the entry at `pos` towards the leaves until no child has a smaller rank.
+
+        Args:
+            pos (int): The index of the entry.
+        """
+        entries = self._entries
+        arity = self._arity
+        n = len(entries)
+        entry = entries[pos]
+        rank = entry._rank
+        first = arity * pos + 1
+        while first < n:
+            # Find the child with the smallest rank
+            child_pos = first
+            child = entries[first]
+            if arity == 2:
+                if first + 1 < n and entries[first + 1]._rank < child._rank:
+                    child_pos = first + 1
+                    child = entries[child_pos]
+            else:
+                for i in range(first + 1, first + arity if first + arity < n else n):
+                    if entries[i]._rank < child._rank:
+                        child_pos = i
+                        child = entries[i]
+            if not child._rank < rank:
+                break
+            entries[pos] = child
+            child._pos = pos
+            pos = child_pos
+            first = arity * pos + 1
+        entries[pos] = entry
+        entry._pos = pos
+
+    def _comes_before_parent(self, pos: int) -> bool:
+        """
+        Checks whether the entry at `pos` must move above its parent.
+
+        Args:
+            pos (int): The index of the entry.
+
+        Returns:
+            bool: True if the entry has a parent with a larger rank.
+        """
+        entries = self._entries
+        return pos > 0 and entries[pos]._rank < entries[(pos - 1) // self._arity]._rank
+
+    def _restore(self, pos: int):
+        """
+        Sifts the entry at `pos` up or down, after it was placed there or re-keyed.
+
+        Args:
+            pos (int): The index of the entry.
+        """
+        if self._comes_before_parent(pos):
+            self._sift_up(pos)
+        else:
+            self._sift_down(pos)
+
+    def insert_node(self, node: HeapEntry) -> HeapEntry:
+        """
+        Inserts an entry that is not in any heap.
+
+        Args:
+            node (HeapEntry): The entry to insert.
+
+        Returns:
+            HeapEntry: The inserted entry.
+
+        Raises:
+            ValueError: If the entry is already in a heap.
+        """
+        if node._pos != -1:
+            raise ValueError(f"{node} is already in a heap.")
+        node._rank = node.key if self._key is None else self._key(node.key)
+        self._entries.append(node)
+        self._sift_up(len(self._entries) - 1)
+        return node
+
+    def insert(self, key, value=None) -> HeapEntry:
+        """
+        Creates a new entry with the given key and value and inserts it into the heap.
+
+        Args:
+            key (Comparable): The key used to maintain heap ordering.
+            value (Any, optional): Optional data associated with the key. Defaults to None.
+
+        Returns:
+            HeapEntry: The handle of the new entry.
+        """
+        entry = HeapEntry(key, value)
+        if self._key is not None:
+            entry._rank = self._key(key)
+        entries = self._entries
+        entry._pos = len(entries)
+        entries.append(entry)
+        self._sift_up(entry._pos)
+        return entry
+
+    def update_key(self, node: HeapEntry, key):
+        """
+        Changes the key of an entry in the heap and restores the heap order in O(log n).
+
+        The entry keeps its handle, so references to it stay valid.
+
+        Args:
+            node (HeapEntry): The handle of an entry in the heap.
+            key (Comparable): The new key.
+
+        Raises:
+            KeyError: If the entry is not in this heap.
+        """
+        self._check_live(node)
+        node.key = key
+        node._rank = key if self._key is None else self._key(key)
+        self._restore(node._pos)
+
+    @classmethod
+    def from_iterable(cls, pairs, **kwargs):
+        """
+        Builds a heap from (key, value) pairs in O(n) time.
+
+        Args:
+            pairs (Iterable[tuple]): The (key, value) pairs to store.
+            **kwargs: The arity, key and compact_ratio options of the new heap.
+
+        Returns:
+            tuple[IndexedMinHeap, list[HeapEntry]]: The new heap and the handle of each
+                pair, in input order.
+        """
+        heap = cls(**kwargs)
+        entries = heap.heapify(pairs)
+        return heap, entries
+
+    def heapify(self, pairs):
+        """
+        Adds many (key, value) pairs to the heap at once.
+
+        The new entries are appended to the array, which is then sifted down bottom-up,
+        starting from the last entry with children. This costs O(n) for n entries in
+        total, instead of O(n log n) for repeated inserts.
+
+        Args:
+            pairs (Iterable[tuple]): The (key, value) pairs to add.
+
+        Returns:
+            list[HeapEntry]: The handle of each pair, in input order.
+        """
+        new_entries = [HeapEntry(key, value) for key, value in pairs]
+        if self._key is not None:
+            for entry in new_entries:
+                entry._rank = self._key(entry.key)
+        entries = self._entries
+        entries.extend(new_entries)
+        for pos, entry in enumerate(entries):
+            entry._pos = pos
+        # The last entry with children is the parent of the last entry
+        for pos in range((len(entries) - 2) // self._arity, -1, -1):
+            self._sift_down(pos)
+        return new_entries
+
+    def iter_sorted(self, limit: int = None):
+        """
+        Lazily yields the entries of the heap in heap order, without changing the heap.
+
+        A frontier heap of the same kind holds the positions of the entries whose parents
+        have been yielded, starting with the root. Its root is always the next entry in
+        heap order; once that entry is yielded its children join the frontier. The first
+        k entries therefore cost O(k log k), however large the heap is. Tombstones are
+        skipped. The heap must not be modified while the iteration is in progress.
+
+        Args:
+            limit (int, optional): The largest number of entries to yield. Defaults to
+                None, which yields every entry.
+
+        Returns:
+            Iterator[HeapEntry]: The entries, from the root's key onwards.
+
+        Raises:
+            ValueError: If `limit` is negative.
+        """
+        if limit is not None and limit < 0:
+            raise ValueError("limit must not be negative.")
+        return self._iter_sorted(len(self) if limit is None else limit)
+
+    def _iter_sorted(self, limit: int):
+        """
+        Yields the first `limit` live entries in heap order, for `iter_sorted()`.
+
+        Args:
+            limit (int): The number of entries to yield.
+
+        Yields:
+            HeapEntry: The entries, from the root's key onwards.
+        """
+        entries = self._entries
+        if not entries or limit == 0:
+            return
+        arity = self._arity
+        dead = self._dead
+        n = len(entries)
+        # The frontier compares the same ranks in the same direction as this heap
+        frontier = type(self)(arity)
+        frontier.insert(entries[0]._rank, 0)
+        while len(frontier) > 0:
+            pos = frontier.extract().value
+            first = arity * pos + 1
+            for child in range(first, first + arity if first + arity < n else n):
+                frontier.insert(entries[child]._rank, child)
+            entry = entries[pos]
+            if entry in dead:
+                continue
+            yield entry
+            limit -= 1
+            if limit == 0:
+                return
+
+    def extract(self) -> HeapEntry:
+        """
+        Removes and returns the root entry, the first in the heap order.
+
+        Returns:
+            HeapEntry: The removed entry.
+
+        Raises:
+            KeyError: If the heap is empty.
+        """
+        if self._dead:
+            self._discard_dead_roots()
+        if not self._entries:
+            raise KeyError("Heap is empty")
+        return self._pop_root()
+
+    def delete_node(self, node: HeapEntry) -> HeapEntry:
+        """
+        Removes an arbitrary entry from the heap.
+
+        The last entry takes its place and is sifted up or down as needed. In lazy mode
+        the entry is only marked as a tombstone, and compacts the heap if tombstones now
+        exceed `compact_ratio` of the array.
+
+        Args:
+            node (HeapEntry): The handle of the entry to remove.
+
+        Returns:
+            HeapEntry: The removed entry.
+
+        Raises:
+            KeyError: If the heap is empty or the entry is not in this heap.
+        """
+        entries = self._entries
+        if len(entries) == len(self._dead):
+            raise KeyError("Heap is empty.")
+        self._check_live(node)
+        if self._compact_ratio is not None:
+            dead = self._dead
+            dead.add(node)
+            if len(dead) > self._compact_ratio * len(entries):
+                self._compact()
+            return node
+        pos = node._pos
+        last = entries.pop()
+        if last is not node:
+            entries[pos] = last
+            last._pos = pos
+            self._restore(pos)
+        node._pos = -1
+        return node
+
+
+class IndexedMaxHeap(IndexedMinHeap):
+    """This class implements an IndexedMinHeap whose root is the entry with the largest key.
+
+    The order is reversed natively, by comparing ranks the other way round, so keys do
+    not need to be negated and can be of any comparable type.
+
+    Attributes:
+        root: Optional[HeapEntry] the entry with the largest key, or None if the heap is empty.
+    """
+
+    def _sift_up(self, pos: int):
+        """
+        Moves the entry at `pos` towards the root until its parent's rank is not smaller.
+
+        Args:
+            pos (int): The index of the entry.
+        """
+        entries = self._entries
+        arity = self._arity
+        entry = entries[pos]
+        rank = entry._rank
+        while pos > 0:
+            parent_pos = (pos - 1) // arity
+            parent = entries[parent_pos]
+            if not parent._rank < rank:
+                break
+            entries[pos] = parent
+            parent._pos = pos
+            pos = parent_pos
+        entries[pos] = entry
+        entry._pos = pos
+
+    def _sift_down(self, pos: int):
+        """
+        Moves the entry at `pos` towards the leaves until no child has a larger rank.
+
+        Args:
+            pos (int): The index of the entry.
+        """
+        entries = self._entries
+        arity = self._arity
+        n = len(entries)
+        entry = entries[pos]
+        rank = entry._rank
+        first = arity * pos + 1
+        while first < n:
+            # Find the child with the largest rank
+            child_pos = first
+            child = entries[first]
+            if arity == 2:
+                if first + 1 < n and child._rank < entries[first + 1]._rank:
+                    child_pos = first + 1
+                    child = entries[child_pos]
+            else:
+                for i in range(first + 1, first + arity if first + arity < n else n):
+                    if child._rank < entries[i]._rank:
+                        child_pos = i
+                        child = entries[i]
+            if not rank < child._rank:
+                break
+            entries[pos] = child
+            child._pos = pos
+            pos = child_pos
+            first = arity * pos + 1
+        entries[pos] = entry
+        entry._pos = pos
+
+    def _comes_before_parent(self, pos: int) -> bool:
+        """
+        Checks whether the entry at `pos` must move above its parent.
+
+        Args:
+            pos (int): The index of the entry.
+
+        Returns:
+            bool: True if the entry has a parent with a smaller rank.
+        """
+        entries = self._entries
+        return pos > 0 and entries[(pos - 1) // self._arity]._rank < entries[pos]._rank
@@ -0,0 +1,261 @@
+import asyncio
+from datetime import datetime
+from itertools import count
+from MarketServer import (FRAME_HEADER, OK, ADD_PRICE, GET_PRICE_DATA, LATEST, SNAPSHOT, BATCH,
+                          encode_request, decode_result, split_batch)
+
+# Maps the method names accepted by `MarketClient.batch()` to opcodes
+_OPCODES = {"add_price": ADD_PRICE, "get_price_data": GET_PRICE_DATA, "latest": LATEST, "snapshot": SNAPSHOT}
+
+
+class _Connection:
+    """
+    One persistent connection to a MarketServer.
+
+    Requests are written as soon as they are made, without waiting for earlier responses,
+    and a reader task resolves the future of each request when its response arrives.
+    """
+
+    def __init__(self, reader, writer):
+        """
+        Wraps an open connection and starts reading its responses.
+
+        Args:
+            reader (asyncio.StreamReader): The connection's reader.
+            writer (asyncio.StreamWriter): The connection's writer.
+        """
+        self._reader = reader
+        self._writer = writer
+        self._ids = count()
+        self._pending = {}  # Maps request IDs to futures awaiting a (status, payload)
+        self._task = asyncio.get_running_loop().create_task(self._read_responses())
+
+    async def request(self, op: int, payload: bytes):
+        """
+        Sends a request and waits for its response.
+
+        Args:
+            op (int): The opcode of the request.
+            payload (bytes): The request payload.
+
+        Returns:
+            tuple[int, bytes]: The status and payload of the response.
+        """
+        request_id = next(self._ids) & 0xFFFFFFFF
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            self._writer.write(FRAME_HEADER.pack(len(payload), request_id, op) + payload)
+            await self._writer.drain()
+        except ConnectionError:
+            # The request never reached the server, so no response will resolve it
+            self._pending.pop(request_id, None)
+            raise
+        return await future
+
+    async def _read_responses(self):
+        """
+        Resolves pending requests as their responses arrive, until the connection closes.
+        """
+        try:
+            while True:
+                header = await self._reader.readexactly(FRAME_HEADER.size)
+                length, request_id, status = FRAME_HEADER.unpack(header)
+                payload = await self._reader.readexactly(length)
+                future = self._pending.pop(request_id, None)
+                if future is not None and not future.done():
+                    future.set_result((status, payload))
+        except (asyncio.IncompleteReadError, ConnectionError) as e:
+            error = ConnectionError(f"Connection to the market server closed: {e}")
+        except asyncio.CancelledError:
+            error = ConnectionError("Connection to the market server closed.")
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self._pending.clear()
+
+    async def close(self):
+        """
+        Closes the connection, failing any requests still waiting for a response.
+        """
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+class MarketClient:
+    """
+    A class to query a MarketServer over a pool of persistent Unix-socket connections.
+
+    Each method mirrors the MarketTracker method of the same name and is a coroutine.
+    Requests are spread round-robin over the pool, and several requests can be in flight
+    on each connection at once, so concurrent callers (e.g. with `asyncio.gather`) are
+    pipelined rather than waiting for each round trip. `batch()` sends many requests in
+    a single frame.
+    """
+
+    def __init__(self, path: str, pool_size: int = 4):
+        """
+        Initializes a client for the server listening on `path`. Call `connect()` first.
+
+        Args:
+            path (str): The path of the server's Unix-domain socket.
+            pool_size (int): The number of connections to open. Defaults to 4.
+
+        Raises:
+            ValueError: If `pool_size` is less than 1.
+        """
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1.")
+        self.path = path
+        self.pool_size = pool_size
+        self._pool = []
+        self._next = 0
+
+    async def connect(self):
+        """
+        Opens the pool of connections.
+        """
+        for _ in range(self.pool_size - len(self._pool)):
+            reader, writer = await asyncio.open_unix_connection(self.path)
+            self._pool.append(_Connection(reader, writer))
+
+    async def close(self):
+        """
+        Closes every connection in the pool.
+        """
+        pool, self._pool = self._pool, []
+        for connection in pool:
+            await connection.close()
+
+    async def __aenter__(self):
+        """Connect the client for use in an async with statement.
+
+        Returns:
+            MarketClient: this client.
+        """
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc):
+        """Close the client at the end of an async with statement.
+
+        Args:
+            *exc: The exception details, if any.
+        """
+        await self.close()
+
+    async def _call(self, op: int, args):
+        """
+        Sends one request on the next connection of the pool and decodes its response.
+
+        Args:
+            op (int): The opcode of the request.
+            args (tuple): The arguments of the request.
+
+        Returns:
+            The decoded result.
+
+        Raises:
+            ConnectionError: If the client is not connected.
+            Exception: The KeyError, ValueError or RuntimeError reported by the server.
+        """
+        if not self._pool:
+            raise ConnectionError("The client is not connected.")
+        connection = self._pool[self._next]
+        self._next = (self._next + 1) % len(self._pool)
+        status, payload = await connection.request(op, encode_request(op, args))
+        if op == BATCH and status == OK:
+            return [decode_result(sub_op, sub_status, body)
+                    for (sub_op, _), (sub_status, body) in zip(args, split_batch(payload))]
+        result = decode_result(op, status, payload)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def add_price(self, name: str, time: datetime, price: float):
+        """
+        Adds a price for an asset at a specific time.
+
+        Args:
+            name (str): The name of the asset.
+            time (datetime): The timestamp of the price.
+            price (float): The price of the asset.
+
+        Raises:
+            KeyError: If the asset is not in the market.
+        """
+        await self._call(ADD_PRICE, (name, time, price))
+
+    async def get_price_data(self, name: str, start: datetime, end: datetime):
+        """
+        Retrieves the price data of an asset within the specified datetime range (inclusive).
+
+        Args:
+            name (str): The name of the asset.
+            start (datetime): The start of the time range (inclusive).
+            end (datetime): The end of the time range (inclusive).
+
+        Returns:
+            list[tuple[datetime, tuple[float, float, float, float]]]: The timestamp and the
+                (price, min, max, avg) of each price in the range.
+
+        Raises:
+            KeyError: If the asset is not in the market.
+        """
+        return await self._call(GET_PRICE_DATA, (name, start, end))
+
+    async def latest(self, name: str):
+        """
+        Retrieves the latest data point of an asset.
+
+        Args:
+            name (str): The name of the asset.
+
+        Returns:
+            tuple: The (time, (price, min, max, avg)) of the latest price, or None if the
+                asset has no prices.
+
+        Raises:
+            KeyError: If the asset is not in the market.
+        """
+        return await self._call(LATEST, (name,))
+
+    async def snapshot(self) -> dict:
+        """
+        Retrieves the latest data point of every asset with a price.
+
+        Returns:
+            dict: Maps asset names to their latest (time, (price, min, max, avg)).
+        """
+        return await self._call(SNAPSHOT, ())
+
+    async def batch(self, calls):
+        """
+        Sends several requests in a single frame, which the server runs in order.
+
+        Args:
+            calls (list[tuple[str, tuple]]): (method name, arguments) pairs, where the method
+                is "add_price", "get_price_data", "latest" or "snapshot".
+
+        Returns:
+            list: The result of each call, or the exception it raised (not raised here).
+
+        Raises:
+            ValueError: If a method name is unknown.
+        """
+        requests = []
+        for method, args in calls:
+            if method not in _OPCODES:
+                raise ValueError(f"Unknown method '{method}', expected one of {tuple(_OPCODES)}.")
+            requests.append((_OPCODES[method], tuple(args)))
+        if not requests:
+            return []
+        return await self._call(BATCH, requests)
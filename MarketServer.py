@@ -0,0 +1,452 @@
+import asyncio
+import errno
+import os
+import socket
+import stat
+import struct
+from datetime import datetime
+from PriceTracker import EPOCH, MICROSECOND
+
+# Every frame starts with a header holding the length of its payload, the ID that
+# matches a response to its request, and the opcode (requests) or status (responses).
+FRAME_HEADER = struct.Struct("<IIB")
+# Requests inside a BATCH payload carry an opcode and length, and their responses a
+# status and length, each followed by the payload.
+SUB_HEADER = struct.Struct("<BI")
+
+# Opcodes
+ADD_PRICE = 1
+GET_PRICE_DATA = 2
+LATEST = 3
+SNAPSHOT = 4
+BATCH = 5
+
+# Statuses
+OK = 0
+KEY_ERROR = 1
+VALUE_ERROR = 2
+ERROR = 3
+
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_ADD_PRICE = struct.Struct("<qd")
+_RANGE = struct.Struct("<qq")
+_POINT = struct.Struct("<qdddd")
+_ERRORS = {KeyError: KEY_ERROR, ValueError: VALUE_ERROR}
+
+
+def pack_str(s: str) -> bytes:
+    """
+    Encodes a string as its UTF-8 length and bytes.
+
+    Args:
+        s (str): The string to encode.
+
+    Returns:
+        bytes: The encoded string.
+    """
+    data = s.encode()
+    return _U16.pack(len(data)) + data
+
+
+def unpack_str(buf: bytes, offset: int):
+    """
+    Decodes a string encoded by `pack_str()`.
+
+    Args:
+        buf (bytes): The buffer holding the string.
+        offset (int): The position of the string in the buffer.
+
+    Returns:
+        tuple[str, int]: The string and the position just after it.
+    """
+    (n,) = _U16.unpack_from(buf, offset)
+    offset += _U16.size
+    return buf[offset:offset + n].decode(), offset + n
+
+
+def to_us(time: datetime) -> int:
+    """
+    Converts a naive datetime to microseconds since 1970-01-01.
+
+    Args:
+        time (datetime): The time to convert.
+
+    Returns:
+        int: The number of microseconds since the epoch.
+    """
+    return (time - EPOCH) // MICROSECOND
+
+
+def from_us(us: int) -> datetime:
+    """
+    Converts microseconds since 1970-01-01 to a naive datetime.
+
+    Args:
+        us (int): The number of microseconds since the epoch.
+
+    Returns:
+        datetime: The corresponding time.
+    """
+    return EPOCH + us * MICROSECOND
+
+
+def pack_point(point) -> bytes:
+    """
+    Encodes a (time, (price, min, max, avg)) data point.
+
+    Args:
+        point (tuple): The data point.
+
+    Returns:
+        bytes: The encoded data point.
+    """
+    time, values = point
+    return _POINT.pack(to_us(time), *values)
+
+
+def unpack_point(buf: bytes, offset: int):
+    """
+    Decodes a data point encoded by `pack_point()`.
+
+    Args:
+        buf (bytes): The buffer holding the data point.
+        offset (int): The position of the data point in the buffer.
+
+    Returns:
+        tuple[tuple, int]: The (time, (price, min, max, avg)) data point and the position
+            just after it.
+    """
+    us, *values = _POINT.unpack_from(buf, offset)
+    return (from_us(us), tuple(values)), offset + _POINT.size
+
+
+def encode_request(op: int, args) -> bytes:
+    """
+    Encodes the arguments of a request.
+
+    Args:
+        op (int): The opcode of the request.
+        args (tuple): The arguments of the matching MarketTracker method, or for BATCH a
+            list of (opcode, args) pairs.
+
+    Returns:
+        bytes: The request payload.
+
+    Raises:
+        ValueError: If the opcode is unknown.
+    """
+    if op == ADD_PRICE:
+        name, time, price = args
+        return pack_str(name) + _ADD_PRICE.pack(to_us(time), price)
+    if op == GET_PRICE_DATA:
+        name, start, end = args
+        return pack_str(name) + _RANGE.pack(to_us(start), to_us(end))
+    if op == LATEST:
+        (name,) = args
+        return pack_str(name)
+    if op == SNAPSHOT:
+        return b""
+    if op == BATCH:
+        parts = [_U32.pack(len(args))]
+        for sub_op, sub_args in args:
+            if sub_op == BATCH:
+                raise ValueError("Batches cannot be nested.")
+            payload = encode_request(sub_op, sub_args)
+            parts.append(SUB_HEADER.pack(sub_op, len(payload)) + payload)
+        return b"".join(parts)
+    raise ValueError(f"Unknown opcode {op}.")
+
+
+def decode_response(op: int, payload: bytes):
+    """
+    Decodes the payload of a successful response.
+
+    Args:
+        op (int): The opcode of the request.
+        payload (bytes): The response payload.
+
+    Returns:
+        The result of the matching MarketTracker method.
+
+    Raises:
+        ValueError: If the opcode is unknown or BATCH, whose entries are decoded one by one.
+    """
+    if op == ADD_PRICE:
+        return None
+    if op == GET_PRICE_DATA:
+        (n,) = _U32.unpack_from(payload)
+        offset = _U32.size
+        result = []
+        for _ in range(n):
+            point, offset = unpack_point(payload, offset)
+            result.append(point)
+        return result
+    if op == LATEST:
+        if not payload:
+            return None
+        return unpack_point(payload, 0)[0]
+    if op == SNAPSHOT:
+        (n,) = _U32.unpack_from(payload)
+        offset = _U32.size
+        result = {}
+        for _ in range(n):
+            name, offset = unpack_str(payload, offset)
+            result[name], offset = unpack_point(payload, offset)
+        return result
+    raise ValueError(f"Unknown opcode {op}.")
+
+
+def decode_result(op: int, status: int, payload: bytes):
+    """
+    Decodes a response, turning error statuses into exceptions.
+
+    Args:
+        op (int): The opcode of the request.
+        status (int): The status of the response.
+        payload (bytes): The response payload.
+
+    Returns:
+        The decoded result, or for an error status the exception (not raised).
+    """
+    if status == OK:
+        return decode_response(op, payload)
+    message = payload.decode()
+    if status == KEY_ERROR:
+        return KeyError(message)
+    if status == VALUE_ERROR:
+        return ValueError(message)
+    return RuntimeError(message)
+
+
+def split_batch(payload: bytes):
+    """
+    Splits a BATCH payload into its (opcode or status, payload) entries.
+
+    Args:
+        payload (bytes): The BATCH request or response payload.
+
+    Returns:
+        list[tuple[int, bytes]]: The entries of the batch.
+    """
+    (n,) = _U32.unpack_from(payload)
+    offset = _U32.size
+    entries = []
+    for _ in range(n):
+        code, length = SUB_HEADER.unpack_from(payload, offset)
+        offset += SUB_HEADER.size
+        entries.append((code, payload[offset:offset + length]))
+        offset += length
+    return entries
+
+
+def _remove_stale_socket(path: str):
+    """
+    Removes a socket file left behind by a server that is no longer running.
+
+    Args:
+        path (str): The path of the socket.
+
+    Raises:
+        OSError: With errno EADDRINUSE, if the path exists and is not a socket or a
+            server is listening on it.
+    """
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise OSError(errno.EADDRINUSE, "Path exists and is not a socket", path)
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        os.remove(path)
+        return
+    finally:
+        probe.close()
+    raise OSError(errno.EADDRINUSE, "A server is already listening on the socket", path)
+
+
+class MarketServer:
+    """
+    A class to serve a MarketTracker to other local processes over a Unix-domain socket.
+
+    Clients send frames of a compact binary protocol: a header with the payload length,
+    a request ID and an opcode (ADD_PRICE, GET_PRICE_DATA, LATEST, SNAPSHOT or BATCH),
+    followed by the payload. Requests on a connection are answered in order, and clients
+    may pipeline them: send many requests without waiting, then match the responses by
+    ID. A BATCH frame carries several requests and is answered with one frame holding
+    their responses. The tracker is only used from the event loop, so requests never
+    run concurrently.
+    """
+
+    def __init__(self, market, path: str):
+        """
+        Initializes a server for a market. Call `start()` to listen.
+
+        Args:
+            market (MarketTracker): The market to serve.
+            path (str): The path of the Unix-domain socket.
+        """
+        self.market = market
+        self.path = path
+        self._server = None
+        self._socket_id = None  # (device, inode) of the socket file this server created
+        self._writers = set()  # The writers of the open connections
+
+    async def start(self):
+        """
+        Starts listening on the socket, replacing a stale socket file.
+
+        A socket file is stale when no server accepts connections on it. Anything else
+        at the path is left alone.
+
+        Raises:
+            OSError: If the path exists and is not a socket, or another server is
+                listening on it.
+        """
+        _remove_stale_socket(self.path)
+        self._server = await asyncio.start_unix_server(self._handle, path=self.path)
+        st = os.stat(self.path)
+        self._socket_id = (st.st_dev, st.st_ino)
+
+    async def close(self):
+        """
+        Stops the server, closes the open connections and removes the socket file.
+
+        The socket file is only removed if this server created it, and it has not been
+        replaced since.
+        """
+        if self._server is not None:
+            self._server.close()
+            # Closing the server only stops accepting; the handlers of the open
+            # connections end when their reads hit the closed transports
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._socket_id is not None:
+            try:
+                st = os.lstat(self.path)
+                if (st.st_dev, st.st_ino) == self._socket_id:
+                    os.remove(self.path)
+            except FileNotFoundError:
+                pass
+            self._socket_id = None
+
+    async def __aenter__(self):
+        """Start the server for use in an async with statement.
+
+        Returns:
+            MarketServer: this server.
+        """
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        """Close the server at the end of an async with statement.
+
+        Args:
+            *exc: The exception details, if any.
+        """
+        await self.close()
+
+    async def _handle(self, reader, writer):
+        """
+        Answers the requests of one connection until the client disconnects.
+
+        Args:
+            reader (asyncio.StreamReader): The connection's reader.
+            writer (asyncio.StreamWriter): The connection's writer.
+        """
+        self._writers.add(writer)
+        try:
+            while True:
+                header = await reader.readexactly(FRAME_HEADER.size)
+                length, request_id, op = FRAME_HEADER.unpack(header)
+                payload = await reader.readexactly(length)
+                if op == BATCH:
+                    status, body = self._execute_batch(payload)
+                else:
+                    status, body = self._execute(op, payload)
+                writer.write(FRAME_HEADER.pack(len(body), request_id, status) + body)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    def _execute_batch(self, payload: bytes):
+        """
+        Runs the requests of a BATCH frame in order.
+
+        Args:
+            payload (bytes): The BATCH payload.
+
+        Returns:
+            tuple[int, bytes]: The status and the payload holding every response.
+        """
+        try:
+            entries = split_batch(payload)
+        except struct.error as e:
+            return ERROR, str(e).encode()
+        parts = [_U32.pack(len(entries))]
+        for op, sub_payload in entries:
+            if op == BATCH:
+                status, body = VALUE_ERROR, b"Batches cannot be nested."
+            else:
+                status, body = self._execute(op, sub_payload)
+            parts.append(SUB_HEADER.pack(status, len(body)) + body)
+        return OK, b"".join(parts)
+
+    def _execute(self, op: int, payload: bytes):
+        """
+        Runs a single request against the market.
+
+        Args:
+            op (int): The opcode of the request.
+            payload (bytes): The request payload.
+
+        Returns:
+            tuple[int, bytes]: The status and payload of the response.
+        """
+        try:
+            return OK, self._run(op, payload)
+        except Exception as e:
+            message = str(e.args[0]) if len(e.args) == 1 else str(e)
+            return _ERRORS.get(type(e), ERROR), message.encode()
+
+    def _run(self, op: int, payload: bytes) -> bytes:
+        """
+        Decodes a request, calls the market and encodes the result.
+
+        Args:
+            op (int): The opcode of the request.
+            payload (bytes): The request payload.
+
+        Returns:
+            bytes: The response payload.
+
+        Raises:
+            ValueError: If the opcode is unknown.
+        """
+        market = self.market
+        if op == SNAPSHOT:
+            snapshot = market.snapshot()
+            return _U32.pack(len(snapshot)) + b"".join(pack_str(name) + pack_point(point)
+                                                       for name, point in snapshot.items())
+        name, offset = unpack_str(payload, 0)
+        if op == ADD_PRICE:
+            us, price = _ADD_PRICE.unpack_from(payload, offset)
+            market.add_price(name, from_us(us), price)
+            return b""
+        if op == GET_PRICE_DATA:
+            start, end = _RANGE.unpack_from(payload, offset)
+            data = market.get_price_data(name, from_us(start), from_us(end))
+            return _U32.pack(len(data)) + b"".join(map(pack_point, data))
+        if op == LATEST:
+            point = market.latest(name)
+            return b"" if point is None else pack_point(point)
+        raise ValueError(f"Unknown opcode {op}.")
@@ -1,6 +1,38 @@
 from datetime import datetime, timedelta
-from collections import defaultdict
+from array import array
+from collections import OrderedDict
+from math import isnan, nan
+import os
+import shutil
+import tempfile
+import uuid
+import weakref
+from time import perf_counter
 from PriceTracker import PriceTracker  # Importing the PriceTracker class, assuming it's implemented
+from PairTracker import PairTracker
+from AlertEngine import AlertEngine
+from Basket import Basket
+from TrackerStats import TrackerStats, PHASES
+from TickFile import TickReader, TickWriter, select_range, to_datetimes
+from TopK import TopK
+from heapq import merge
+import numpy as np
+
+# Position of each field in the (price, min, max, avg) tuples stored by PriceTracker
+FIELDS = {"price": 0, "min": 1, "max": 2, "avg": 3}
+
+
+def _remove_spills(spill_dir: str, prefix: str):
+    """
+    Removes the spill files of one market from a shared spill directory.
+
+    Args:
+        spill_dir (str): The spill directory.
+        prefix (str): The prefix of the market's spill files.
+    """
+    for name in os.listdir(spill_dir):
+        if name.startswith(prefix):
+            os.remove(os.path.join(spill_dir, name))
 
 
 class MarketTracker:
@@ -11,20 +43,356 @@ class MarketTracker:
     It allows adding new assets, updating their prices, and retrieving price data for
     specific assets within a given time range.
 
+    Every asset name is interned to a small integer ID when it is added. Per-asset state
+    is kept in flat lists and arrays indexed by that ID, and an asset's `PriceTracker` is
+    only created when its first price arrives, so markets with many rarely traded assets
+    stay small. Hot loops can call `add_price_id()` with the ID to skip the name lookup.
+
+    A memory budget can be set with `max_resident`. The tracker then keeps at most that
+    many `PriceTracker` instances in memory and spills the least recently used ones to
+    disk in the binary form of `PriceTracker.to_bytes()`. A spilled tracker is reloaded
+    transparently the next time one of its prices is added or queried. The spill files
+    are removed by `close()`, or when the tracker is garbage collected, together with the
+    spill directory if the tracker created it.
+
     Attributes:
-        market_data (defaultdict): A dictionary that stores `PriceTracker` instances,
-                                   indexed by asset names. If an asset name doesn't exist,
-                                   a new `PriceTracker` is created automatically.
+        market_data (dict): A dictionary mapping the names of assets whose trackers are
+                            in memory to their `PriceTracker` instances.
     """
-    def __init__(self):
+    def __init__(self, max_resident: int = None, spill_dir: str = None):
         """
         Initializes a MarketTracker instance, which tracks multiple assets using individual PriceTracker instances.
 
+        Args:
+            max_resident (int, optional): The largest number of PriceTrackers kept in memory.
+                Defaults to None, which keeps every tracker in memory.
+            spill_dir (str, optional): The directory for spilled trackers. It can be shared
+                by several markets, as each names its files with a prefix of its own.
+                Defaults to a new temporary directory, created on the first spill.
+
         Attributes:
-            market_data (defaultdict): A dictionary mapping asset names to their corresponding PriceTracker objects.
+            market_data (dict): A dictionary mapping asset names to their corresponding PriceTracker objects.
+
+        Raises:
+            ValueError: If `max_resident` is less than 1.
+        """
+        if max_resident is not None and max_resident < 1:
+            raise ValueError("max_resident must be at least 1.")
+        self._asset_ids = {}  # Maps asset names to their integer IDs
+        self._names = []  # Asset names, indexed by ID
+        self._trackers = []  # PriceTracker of each asset, or None before its first price
+        self._last_price = array("d")  # Most recent price of each asset (NaN before the first)
+
+        self._pairs = {}  # Maps (first, second) asset names to their PairTracker
+        self._pairs_by_asset = {}  # Maps asset IDs to the PairTrackers they belong to
+        self._alerts = AlertEngine()  # Price alert rules, evaluated on every tick
+        self._baskets = {}  # Maps basket names to their Basket
+        self._baskets_by_asset = {}  # Maps asset IDs to the Baskets they are constituents of
+
+        # LRU cache of resident trackers, only used when a budget is set
+        self._max_resident = max_resident
+        self._spill_dir = spill_dir
+        self._spill_prefix = uuid.uuid4().hex + "-"  # Keeps markets sharing a spill_dir apart
+        self._spill_cleanup = None  # Finalizer removing the spill files, set on the first spill
+        self._lru = None if max_resident is None else OrderedDict()  # Asset IDs, least recent first
+        self._spilled = set()  # IDs of the assets whose tracker is on disk
+        self._spilled_latest = {}  # Latest data point of each spilled tracker, by asset ID
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._evictions = 0
+        self._reload_time = 0.0
+
+        self._stats = None  # TrackerStats of each asset, indexed by ID, while instrumentation is on
+
+    @property
+    def market_data(self):
+        """
+        dict: the resident `PriceTracker` of every asset that has prices, keyed by asset name.
+        """
+        return {self._names[i]: t for i, t in enumerate(self._trackers) if t is not None}
+
+    def asset_id(self, name: str) -> int:
+        """
+        Returns the integer ID of an asset.
+
+        Args:
+            name (str): The name of the asset.
+
+        Returns:
+            int: The ID assigned to the asset by `add_asset()`.
+
+        Raises:
+            KeyError: If the asset does not exist in the market.
+        """
+        asset_id = self._asset_ids.get(name)
+        if asset_id is None:
+            raise KeyError(f"Asset '{name}' not found in market.")
+        return asset_id
+
+    def asset_name(self, asset_id: int) -> str:
+        """
+        Returns the name of the asset with the given ID.
+
+        Args:
+            asset_id (int): The ID of the asset.
+
+        Returns:
+            str: The name of the asset.
+
+        Raises:
+            KeyError: If no asset has this ID.
+        """
+        if not 0 <= asset_id < len(self._names):
+            raise KeyError(f"Asset ID {asset_id} not found in market.")
+        return self._names[asset_id]
+
+    def _get_tracker(self, asset_id: int, create: bool = False):
+        """
+        Returns the PriceTracker of an asset, reloading it from disk if it was spilled.
+
+        When a memory budget is set, the tracker is marked as most recently used and
+        the least recently used trackers are spilled until the budget is met again.
+
+        Args:
+            asset_id (int): The ID of the asset.
+            create (bool): Whether to create the tracker if the asset has no prices yet.
+
+        Returns:
+            PriceTracker or None: The tracker, or None if the asset has no prices yet
+                and `create` is False.
+        """
+        tracker = self._trackers[asset_id]
+        if tracker is None:
+            if asset_id in self._spilled:
+                tracker = self._reload(asset_id)
+            elif create:
+                tracker = self._trackers[asset_id] = PriceTracker()
+            else:
+                return None
+            if self._stats is not None:
+                tracker.enable_stats(self._stats[asset_id])
+        elif self._lru is not None:
+            self._cache_hits += 1
+        if self._lru is not None:
+            self._lru[asset_id] = None
+            self._lru.move_to_end(asset_id)
+            while len(self._lru) > self._max_resident:
+                self._spill(self._lru.popitem(last=False)[0])
+        return tracker
+
+    def _spill_path(self, asset_id: int) -> str:
+        """
+        Returns the file used to store a spilled tracker, creating the spill directory if needed.
+
+        The first call registers the cleanup of the spill files, which runs on `close()` or
+        when the market is garbage collected.
+
+        Args:
+            asset_id (int): The ID of the asset.
+
+        Returns:
+            str: The path of the spill file.
+        """
+        if self._spill_cleanup is None:
+            if self._spill_dir is None:
+                self._spill_dir = tempfile.mkdtemp(prefix="market-tracker-")
+                self._spill_cleanup = weakref.finalize(self, shutil.rmtree, self._spill_dir,
+                                                       ignore_errors=True)
+            else:
+                self._spill_cleanup = weakref.finalize(self, _remove_spills, self._spill_dir,
+                                                       self._spill_prefix)
+        return os.path.join(self._spill_dir, f"{self._spill_prefix}{asset_id}.trk")
+
+    def _spill(self, asset_id: int):
+        """
+        Writes the tracker of an asset to disk and drops it from memory.
+
+        Args:
+            asset_id (int): The ID of the asset.
+        """
+        tracker = self._trackers[asset_id]
+        with open(self._spill_path(asset_id), "wb") as f:
+            f.write(tracker.to_bytes())
+        self._trackers[asset_id] = None
+        self._spilled.add(asset_id)
+        # A spilled tracker cannot change until it is reloaded, so its latest point stays valid
+        self._spilled_latest[asset_id] = tracker.latest()
+        self._evictions += 1
+
+    def _reload(self, asset_id: int) -> PriceTracker:
+        """
+        Loads the spilled tracker of an asset back into memory and removes its file.
+
+        Args:
+            asset_id (int): The ID of the asset.
+
+        Returns:
+            PriceTracker: The reloaded tracker.
+        """
+        start = perf_counter()
+        path = self._spill_path(asset_id)
+        with open(path, "rb") as f:
+            tracker = PriceTracker.from_bytes(f.read())
+        os.remove(path)
+        self._spilled.discard(asset_id)
+        del self._spilled_latest[asset_id]
+        self._trackers[asset_id] = tracker
+        self._cache_misses += 1
+        self._reload_time += perf_counter() - start
+        return tracker
+
+    def close(self):
+        """
+        Removes the spill files, and the spill directory if the market created it.
+
+        The trackers that were spilled are lost, so the market should not be used afterwards.
+        Closing a market that never spilled, or closing it twice, does nothing.
+        """
+        if self._spill_cleanup is not None:
+            self._spill_cleanup()
+
+    def __enter__(self):
+        """Return the market for use in a with statement.
+
+        Returns:
+            MarketTracker: this market.
+        """
+        return self
+
+    def __exit__(self, *exc):
+        """Close the market at the end of a with statement.
+
+        Args:
+            *exc: The exception details, if any.
+        """
+        self.close()
+
+    def cache_stats(self) -> dict:
+        """
+        Returns metrics about the resident tracker cache.
+
+        Hits and misses count accesses to trackers that already exist: a hit finds the
+        tracker in memory and a miss reloads it from disk. They are only counted when
+        a memory budget is set.
+
+        Returns:
+            dict: A dictionary with the keys "resident", "spilled", "hits", "misses",
+                "hit_rate", "evictions", "reload_time" (total seconds spent reloading)
+                and "mean_reload_time" (seconds per reload).
+        """
+        accesses = self._cache_hits + self._cache_misses
+        return {
+            "resident": sum(t is not None for t in self._trackers),
+            "spilled": len(self._spilled),
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "hit_rate": self._cache_hits / accesses if accesses else None,
+            "evictions": self._evictions,
+            "reload_time": self._reload_time,
+            "mean_reload_time": self._reload_time / self._cache_misses if self._cache_misses else None,
+        }
+
+    def enable_stats(self):
+        """
+        Starts recording per-asset counters and latency histograms for every price added.
+
+        Each tracker then times the phases of its `add_price()` (see `PriceTracker.enable_stats()`).
+        The statistics of an asset are kept by the market, so they survive the spilling of its
+        tracker. Enabling statistics that are already enabled has no effect.
+        """
+        if self._stats is not None:
+            return
+        self._stats = [TrackerStats() for _ in self._names]
+        for asset_id, tracker in enumerate(self._trackers):
+            if tracker is not None:
+                tracker.enable_stats(self._stats[asset_id])
+
+    def disable_stats(self):
         """
-        # Dictionary to store PriceTracker instances for each asset
-        self.market_data = defaultdict(PriceTracker)  # Default to a new PriceTracker if the asset doesn't exist
+        Stops recording statistics and discards those recorded so far.
+        """
+        for tracker in self._trackers:
+            if tracker is not None:
+                tracker.disable_stats()
+        self._stats = None
+
+    def stats(self) -> dict:
+        """
+        Returns the statistics recorded since `enable_stats()` was called.
+
+        Returns:
+            dict: The total "ticks" and "expired" counts, under "latency" a summary of
+                each phase of `PriceTracker.add_price()` over all assets, and under
+                "assets" the statistics of each asset with prices, keyed by name, as
+                returned by `PriceTracker.stats()`. The window and tree sizes of spilled
+                trackers are reported as None rather than reloading them.
+
+        Raises:
+            RuntimeError: If statistics are not enabled.
+        """
+        if self._stats is None:
+            raise RuntimeError("Statistics are not enabled, call enable_stats() first.")
+        total = TrackerStats()
+        assets = {}
+        for asset_id, stats in enumerate(self._stats):
+            total.merge(stats)
+            if isnan(self._last_price[asset_id]):
+                continue
+            tracker = self._trackers[asset_id]
+            if tracker is not None:
+                assets[self._names[asset_id]] = tracker.stats()
+            else:
+                assets[self._names[asset_id]] = {
+                    "ticks": stats.ticks,
+                    "expired": stats.expired,
+                    "window": None,
+                    "tree_size": None,
+                    "tree_height": None,
+                    "latency": {phase: stats.latency[phase].summary() for phase in PHASES},
+                }
+        return {
+            "ticks": total.ticks,
+            "expired": total.expired,
+            "latency": {phase: total.latency[phase].summary() for phase in PHASES},
+            "assets": assets,
+        }
+
+    def memory_usage(self) -> dict:
+        """
+        Estimates the memory used by the PriceTracker of every asset.
+
+        Spilled trackers are on disk and are not counted, nor reloaded.
+
+        Returns:
+            dict: Under "assets", the breakdown returned by `PriceTracker.memory_usage()`
+                for each resident tracker, keyed by asset name, and under "total" the sum
+                of each entry of the breakdown over all assets.
+        """
+        assets = {}
+        total = {}
+        for asset_id, tracker in enumerate(self._trackers):
+            if tracker is None:
+                continue
+            usage = assets[self._names[asset_id]] = tracker.memory_usage()
+            for structure, size in usage.items():
+                total[structure] = total.get(structure, 0) + size
+        return {"assets": assets, "total": total}
+
+    def last_price(self, name: str):
+        """
+        Returns the most recent price added for an asset.
+
+        Args:
+            name (str): The name of the asset.
+
+        Returns:
+            float or None: The last price, or None if the asset has no prices yet.
+
+        Raises:
+            KeyError: If the asset does not exist in the market.
+        """
+        price = self._last_price[self.asset_id(name)]
+        return None if isnan(price) else price
 
     def add_price(self, name: str, time: datetime, price: float):
         """
@@ -37,13 +405,285 @@ class MarketTracker:
 
         Raises:
             KeyError: If the asset has not been added to the market using `add_asset()`.
+            Exception: Whatever an alert callback raises. The price has already been
+                added by then, so the call must not be retried.
         """
-        if name not in self.market_data: #if the asset name is not found - key error is raised
-            raise KeyError(f"Asset '{name}' not found in market.")
+        try:
+            asset_id = self._asset_ids[name]
+        except KeyError: #if the asset name is not found - key error is raised
+            raise KeyError(f"Asset '{name}' not found in market.") from None
+        self._add(asset_id, name, time, price)
+        self._alerts.flush()
+
+    def add_price_id(self, asset_id: int, time: datetime, price: float):
+        """
+        Adds a new price entry for the asset with the given ID.
+
+        This is the same as `add_price()` but skips the name lookup.
+
+        Args:
+            asset_id (int): The ID returned by `add_asset()`.
+            time (datetime): The timestamp when the price was recorded.
+            price (float): The price of the asset at the given time.
+
+        Raises:
+            KeyError: If no asset has this ID.
+            Exception: Whatever an alert callback raises. The price has already been
+                added by then, so the call must not be retried.
+        """
+        if not 0 <= asset_id < len(self._names):
+            raise KeyError(f"Asset ID {asset_id} not found in market.")
+        self._add(asset_id, self._names[asset_id], time, price)
+        self._alerts.flush()
+
+    def add_prices(self, name: str, times, prices):
+        """
+        Adds a batch of price entries for a specific asset.
+
+        Alerts fired by the batch are delivered once, after all prices are added.
+
+        Args:
+            name (str): The name of the asset.
+            times (Iterable[datetime]): The timestamps of the prices, in increasing order.
+            prices (Iterable[float]): The prices, one for each timestamp.
+
+        Raises:
+            KeyError: If the asset has not been added to the market using `add_asset()`.
+            Exception: Whatever an alert callback raises. The whole batch has already
+                been added by then, so the call must not be retried.
+        """
+        asset_id = self.asset_id(name)
+        for time, price in zip(times, prices):
+            self._add(asset_id, name, time, price)
+        self._alerts.flush()
 
-        # Get the PriceTracker for the asset and add the price data
-        asset_tracker = self.market_data[name]
+    def _ingest(self, names, times, prices, add_assets: bool = False):
+        """
+        Adds a batch of prices for many assets, given as parallel lists.
+
+        The rows are grouped by asset so each tracker is fetched once per batch, which
+        keeps spilled trackers from being reloaded for every row. Pairs and baskets
+        depend on the order of ticks across assets, so while any are registered the
+        rows are added in the given order instead. Alerts are delivered once, at the end.
+
+        The rows of each asset must come after its last price and be in increasing time
+        order. This is checked before any row is added, since a repeated or earlier
+        timestamp would corrupt the asset's rolling window.
+
+        Args:
+            names (list[str]): The asset name of each row.
+            times (list[datetime]): The timestamp of each row.
+            prices (list[float]): The price of each row.
+            add_assets (bool): Whether to add unknown assets instead of raising KeyError.
+
+        Raises:
+            KeyError: If an asset does not exist and `add_assets` is False.
+            ValueError: If a row is not later than the previous price of its asset.
+        """
+        asset_ids = self._asset_ids
+        if add_assets:
+            ids = [asset_ids.get(name) for name in names]
+            for ix, asset_id in enumerate(ids):
+                if asset_id is None:
+                    ids[ix] = self.add_asset(names[ix])
+        else:
+            ids = [self.asset_id(name) for name in names]
+
+        last_times = {}  # The time of the previous price of each asset in the batch
+        for ix, asset_id in enumerate(ids):
+            if asset_id in last_times:
+                last = last_times[asset_id]
+            else:
+                point = self._latest(asset_id)
+                last = None if point is None else point[0]
+            if last is not None and not last < times[ix]:
+                raise ValueError(f"Price of '{names[ix]}' at {times[ix]} is not after "
+                                 f"its previous price at {last}.")
+            last_times[asset_id] = times[ix]
+
+        if self._pairs or self._baskets:
+            for ix, asset_id in enumerate(ids):
+                self._add(asset_id, names[ix], times[ix], prices[ix])
+        else:
+            rows = {}
+            for ix, asset_id in enumerate(ids):
+                rows.setdefault(asset_id, []).append(ix)
+            for asset_id, indices in rows.items():
+                name = self._names[asset_id]
+                for ix in indices:
+                    self._add(asset_id, name, times[ix], prices[ix])
+        self._alerts.flush()
+
+    def load_csv(self, path: str, time_format: str = None, delimiter: str = ",",
+                 header: bool = True, columns=(0, 1, 2), add_assets: bool = False,
+                 chunk_size: int = 1 << 20) -> int:
+        """
+        Streams prices from a CSV file into the market.
+
+        The file is read in chunks of about `chunk_size` bytes of whole lines, so memory
+        use does not depend on the size of the file. The timestamps of each chunk are
+        parsed in one vectorised NumPy call when they are in ISO 8601 format (the
+        default), or with `datetime.strptime` when a `time_format` is given, and each
+        chunk is then added in one batch. Rows must be in increasing time order for each
+        asset. If a row is invalid, the chunks before it have already been added.
+
+        Args:
+            path (str): The path of the CSV file.
+            time_format (str, optional): A `strptime` format for the timestamps. Defaults
+                to None, for ISO 8601 timestamps such as "2025-04-01 09:30:00".
+            delimiter (str): The column separator. Defaults to ",".
+            header (bool): Whether the first line is a header to skip. Defaults to True.
+            columns (tuple[int, int, int]): The positions of the (name, time, price)
+                columns. Defaults to (0, 1, 2).
+            add_assets (bool): Whether to add assets that are not yet in the market.
+                Defaults to False.
+            chunk_size (int): The approximate number of bytes read per chunk.
+
+        Returns:
+            int: The number of rows loaded.
+
+        Raises:
+            KeyError: If a row names an unknown asset and `add_assets` is False.
+            ValueError: If a row is missing columns, has an invalid time or price, or is
+                not later than the previous price of its asset.
+            Exception: Whatever an alert callback raises. The chunk that fired the alert
+                and the chunks before it have already been added, so reloading the
+                file raises ValueError on their rows.
+        """
+        name_col, time_col, price_col = columns
+        n_cols = max(columns) + 1
+        loaded = 0
+        with open(path, "r", newline="") as f:
+            if header:
+                f.readline()
+            while True:
+                lines = f.readlines(chunk_size)
+                if not lines:
+                    break
+                rows = [line.rstrip("\r\n").split(delimiter) for line in lines]
+                rows = [row for row in rows if row != [""]]
+                if not rows:
+                    continue
+                if min(map(len, rows)) < n_cols:
+                    raise ValueError(f"CSV rows need at least {n_cols} columns.")
+                cols = list(zip(*rows))
+                if time_format is None:
+                    times = np.array(cols[time_col], dtype="datetime64[us]").astype(object).tolist()
+                else:
+                    times = [datetime.strptime(t, time_format) for t in cols[time_col]]
+                prices = list(map(float, cols[price_col]))
+                self._ingest(cols[name_col], times, prices, add_assets)
+                loaded += len(rows)
+        return loaded
+
+    def load_ticks(self, path: str, start: datetime = None, end: datetime = None,
+                   add_assets: bool = False) -> int:
+        """
+        Loads prices from a binary tick file written by `TickWriter` or `save_ticks()`.
+
+        The file is memory-mapped, and only the index blocks that overlap [start, end]
+        are read. Each block is added in one batch. Rows must be in increasing time
+        order for each asset, and later than the asset's prices already in the market.
+        If a block breaks this, the blocks before it have already been added.
+
+        Args:
+            path (str): The path of the tick file.
+            start (datetime, optional): Only load ticks at or after this time.
+            end (datetime, optional): Only load ticks at or before this time.
+            add_assets (bool): Whether to add assets that are not yet in the market.
+                Defaults to False.
+
+        Returns:
+            int: The number of ticks loaded.
+
+        Raises:
+            KeyError: If a tick names an unknown asset and `add_assets` is False.
+            ValueError: If the file is not a tick file, or a tick is not later than the
+                previous price of its asset.
+            Exception: Whatever an alert callback raises. The block that fired the alert
+                and the blocks before it have already been added, so reloading the
+                file raises ValueError on their ticks.
+        """
+        reader = TickReader(path)
+        names = reader.names
+        loaded = 0
+        for block in reader.iter_blocks(start, end):
+            block = select_range(block, start, end)
+            if len(block) == 0:
+                continue
+            self._ingest([names[a] for a in block["asset"].tolist()], to_datetimes(block["time"]),
+                         block["price"].tolist(), add_assets)
+            loaded += len(block)
+        return loaded
+
+    def save_ticks(self, path: str, block_size: int = 4096) -> int:
+        """
+        Writes the prices of every asset to a binary tick file, in time order.
+
+        The file holds the market's whole history, so an existing file is replaced rather
+        than appended to: saving twice must not write every tick twice.
+
+        Args:
+            path (str): The path of the tick file.
+            block_size (int): The number of records per index block.
+
+        Returns:
+            int: The number of ticks written.
+        """
+        streams = []
+        for asset_id in range(len(self._names)):
+            tracker = self._get_tracker(asset_id)
+            if tracker is not None:
+                name = self._names[asset_id]
+                data = tracker.get_price_data(datetime.min, datetime.max)
+                streams.append([(time, name, values[0]) for time, values in data])
+        written = 0
+        with TickWriter(path, block_size, append=False) as writer:
+            batch = []
+            for tick in merge(*streams):
+                batch.append(tick)
+                if len(batch) == block_size:
+                    writer.append([t[1] for t in batch], [t[0] for t in batch], [t[2] for t in batch])
+                    written += len(batch)
+                    batch = []
+            if batch:
+                writer.append([t[1] for t in batch], [t[0] for t in batch], [t[2] for t in batch])
+                written += len(batch)
+        return written
+
+    def _add(self, asset_id: int, name: str, time: datetime, price: float):
+        """
+        Adds a price to an asset's tracker and updates everything that depends on it.
+
+        Alerts fired by the price are queued but not delivered, so that batch callers
+        can deliver the alerts of many prices at once.
+
+        Args:
+            asset_id (int): The ID of the asset.
+            name (str): The name of the asset.
+            time (datetime): The timestamp when the price was recorded.
+            price (float): The price of the asset at the given time.
+        """
+        # Get the PriceTracker for the asset, creating it on the first price
+        asset_tracker = self._trackers[asset_id]
+        if asset_tracker is None or self._lru is not None:
+            asset_tracker = self._get_tracker(asset_id, create=True)
+
+        watched = self._alerts.watches(asset_id)
+        previous = asset_tracker.latest() if watched else None
         asset_tracker.add_price(time, price)
+        self._last_price[asset_id] = price
+
+        pairs = self._pairs_by_asset.get(asset_id)
+        if pairs is not None:
+            for pair in pairs:
+                pair.update(name, time, price)
+        baskets = self._baskets_by_asset.get(asset_id)
+        if baskets is not None:
+            for basket in baskets:
+                basket.update(name, time, price)
+        if watched:
+            self._alerts.on_tick(asset_id, time, price, previous)
 
     def get_price_data(self, name: str, start: datetime, end: datetime):
         """
@@ -66,38 +706,451 @@ class MarketTracker:
         Raises:
             KeyError: If the asset does not exist in the market.
         """
-        if name not in self.market_data: #if the asset name is not found - KeyError raised
-            raise KeyError(f"Asset '{name}' not found in market.")
+        asset_id = self.asset_id(name) #if the asset name is not found - KeyError raised
 
         # Get the PriceTracker for the asset
-        asset_tracker = self.market_data[name]
+        asset_tracker = self._get_tracker(asset_id)
+        if asset_tracker is None:
+            return []
+
+        # The tracker stores the 10-day statistics of every data point alongside its price
+        return asset_tracker.get_price_data(start, end)
+
+    def latest(self, name: str):
+        """
+        Returns the most recent data point of an asset.
+
+        Args:
+            name (str): The name of the asset.
+
+        Returns:
+            tuple[datetime, tuple[float, float, float, float]] or None: The timestamp and
+                (price, 10-day min, 10-day max, 10-day average) of the last price added, or
+                None if the asset has no prices yet.
+
+        Raises:
+            KeyError: If the asset does not exist in the market.
+        """
+        return self._latest(self.asset_id(name))
+
+    def _latest(self, asset_id: int):
+        """
+        Returns the most recent data point of an asset without reloading a spilled tracker.
+
+        Args:
+            asset_id (int): The ID of the asset.
 
-        # Get the price data within the specified range
-        data_in_range = asset_tracker.get_price_data(start, end)
+        Returns:
+            tuple[datetime, tuple[float, float, float, float]] or None: The last data point,
+                or None if the asset has no prices yet.
+        """
+        tracker = self._trackers[asset_id]
+        if tracker is not None:
+            return tracker.latest()
+        return self._spilled_latest.get(asset_id)
+
+    def snapshot(self) -> dict:
+        """
+        Returns the most recent data point of every asset that has prices.
+
+        Spilled trackers are not reloaded: their latest data point is kept when they are spilled.
+
+        Returns:
+            dict: Maps asset names to the (time, (price, 10-day min, 10-day max, 10-day average))
+                of their last price.
+        """
+        result = {}
+        for asset_id, name in enumerate(self._names):
+            if isnan(self._last_price[asset_id]):
+                continue
+            result[name] = self._latest(asset_id)
+        return result
 
-        # List to store the result
-        result_list = []
+    def top_k(self, name: str, start: datetime, end: datetime, k: int, field: str = "price",
+              largest: bool = True):
+        """
+        Returns the K data points of an asset with the largest value of a field in a time range.
 
-        for time, price in data_in_range:
-            # Calculate the 10-day statistics for the current price
-            ten_day_min = self.calculate_min(data_in_range, time)
-            ten_day_max = self.calculate_max(data_in_range, time)
-            ten_day_avg = self.calculate_avg(data_in_range, time)
+        The range is streamed from the asset's tree into a `TopK`, so this takes O(n log K)
+        time for n data points in the range and O(K) memory, instead of building and
+        sorting the whole range.
 
-            # Append the result as a tuple
-            result_list.append((time, (price, ten_day_min, ten_day_max, ten_day_avg)))
+        Args:
+            name (str): The name of the asset.
+            start (datetime): The start of the time range (inclusive).
+            end (datetime): The end of the time range (inclusive).
+            k (int): The number of data points to return.
+            field (str): One of "price", "min", "max" or "avg". Defaults to "price".
+            largest (bool): Whether to return the largest values, or else the smallest.
+                Defaults to True.
 
-        return result_list
+        Returns:
+            list[tuple[datetime, tuple[float, float, float, float]]]: Up to K data points,
+                best first. Data points with equal values are in time order.
 
-    def add_asset(self, name: str):
+        Raises:
+            KeyError: If the asset does not exist in the market.
+            ValueError: If `field` is unknown or `k` is negative.
+        """
+        if field not in FIELDS:
+            raise ValueError(f"Unknown field '{field}', expected one of {list(FIELDS)}.")
+        ix = FIELDS[field]
+        top = TopK(k, key=lambda point: point[1][ix], largest=largest)
+        tracker = self._get_tracker(self.asset_id(name))
+        if tracker is not None:
+            top.extend(tracker.iter_price_data(start, end))
+        return top.items()
+
+    def get_price_data_many(self, requests):
         """
-        Adds a new asset to the market and initializes its PriceTracker.
+        Retrieves the price statistics for many (asset, time range) requests at once.
+
+        Requests are grouped by asset, so each asset's tracker is looked up (and
+        reloaded, if it was spilled) only once. The requests are answered in this
+        process: a range query costs about as much as copying its result, so shipping
+        trackers or their slices to worker processes costs more than it saves.
+
+        Args:
+            requests (list[tuple[str, datetime, datetime]]): The (name, start, end) of each request.
+
+        Returns:
+            list[list[tuple[datetime, tuple[float, float, float, float]]]]: The result of
+                `get_price_data()` for each request, in request order.
+
+        Raises:
+            KeyError: If any of the assets does not exist in the market.
+        """
+        # Group the request indices by asset, checking every name up front
+        by_asset = {}
+        for ix, (name, start, end) in enumerate(requests):
+            by_asset.setdefault(self.asset_id(name), []).append(ix)
+
+        results = [[] for _ in requests]
+        for asset_id, indices in by_asset.items():
+            tracker = self._get_tracker(asset_id)
+            if tracker is None:
+                continue
+            for ix in indices:
+                _, start, end = requests[ix]
+                results[ix] = tracker.get_price_data(start, end)
+        return results
+
+    def get_matrix(self, names, start: datetime, end: datetime, field: str = "price",
+                   resolution: timedelta = timedelta(days=1)):
+        """
+        Returns one field of several assets aligned on a common time grid.
+
+        The grid runs from `start` to `end` (inclusive) in steps of `resolution`. Each
+        grid point holds the most recent value recorded at or before that time
+        (forward-fill), so values from before `start` carry into the first grid points.
+        Grid points before an asset's first recorded price are NaN. Rows are filled
+        straight from each asset's tree with slice assignment, so no per-asset list
+        of tuples is built.
+
+        Args:
+            names (list[str]): The asset names, one row per name in the given order.
+            start (datetime): The first grid point.
+            end (datetime): The last time the grid may reach (inclusive).
+            field (str): One of "price", "min", "max" or "avg". Defaults to "price".
+            resolution (timedelta): The spacing between grid points. Defaults to one day.
+
+        Returns:
+            numpy.ndarray: A float array of shape (len(names), number of grid points).
+
+        Raises:
+            KeyError: If any of the assets does not exist in the market.
+            ValueError: If `field` is unknown, `resolution` is not positive or `start`
+                is after `end`.
+        """
+        if field not in FIELDS:
+            raise ValueError(f"Unknown field '{field}', expected one of {list(FIELDS)}.")
+        if resolution <= timedelta(0):
+            raise ValueError("Resolution must be a positive timedelta.")
+        if start > end:
+            raise ValueError("Start must not be after end.")
+        ix = FIELDS[field]
+        n_points = (end - start) // resolution + 1
+
+        matrix = np.full((len(names), n_points), np.nan)
+        for row_ix, name in enumerate(names):
+            tracker = self._get_tracker(self.asset_id(name))
+            if tracker is None:
+                continue
+            row = matrix[row_ix]
+
+            # Seed the row with the last value known at the start of the grid
+            seed = tracker.price_at(start)
+            value = np.nan if seed is None else seed[1][ix]
+            next_col = 0
+            for time, data in tracker.iter_price_data(start, end):
+                # The first grid point at or after this data point
+                q, r = divmod(time - start, resolution)
+                col = q + (r > timedelta(0))
+                row[next_col:col] = value
+                value = data[ix]
+                next_col = col
+            row[next_col:] = value
+
+        return matrix
+
+    def add_asset(self, name: str) -> int:
+        """
+        Adds a new asset to the market and assigns it an integer ID.
+
+        The asset's PriceTracker is created when its first price is added. Adding an
+        asset that already exists returns its existing ID.
 
         Args:
             name (str): The name of the asset to be added.
+
+        Returns:
+            int: The ID of the asset, for use with `add_price_id()`.
+        """
+        asset_id = self._asset_ids.get(name)
+        if asset_id is None:
+            asset_id = len(self._names)
+            self._asset_ids[name] = asset_id
+            self._names.append(name)
+            self._trackers.append(None)
+            self._last_price.append(nan)
+            if self._stats is not None:
+                self._stats.append(TrackerStats())
+        return asset_id
+
+    def register_pair(self, first: str, second: str, window: timedelta = timedelta(days=10)):
+        """
+        Starts tracking the rolling covariance and correlation of returns between two assets.
+
+        Only prices added after registration contribute to the statistics. Registering
+        a pair that is already tracked (in either order) has no effect.
+
+        Args:
+            first (str): The name of the first asset.
+            second (str): The name of the second asset.
+            window (timedelta): The length of the rolling window. Defaults to 10 days.
+
+        Raises:
+            KeyError: If either asset does not exist in the market.
+            ValueError: If both names are the same.
+        """
+        ids = (self.asset_id(first), self.asset_id(second))
+        if (first, second) in self._pairs or (second, first) in self._pairs:
+            return
+        pair = PairTracker(first, second, window)
+        self._pairs[(first, second)] = pair
+        for asset_id in ids:
+            self._pairs_by_asset.setdefault(asset_id, []).append(pair)
+
+    def _get_pair(self, first: str, second: str) -> PairTracker:
+        """
+        Returns the PairTracker registered for two assets, in either order.
+
+        Args:
+            first (str): The name of one asset of the pair.
+            second (str): The name of the other asset of the pair.
+
+        Returns:
+            PairTracker: The tracker of the pair.
+
+        Raises:
+            KeyError: If the pair has not been registered with `register_pair()`.
+        """
+        pair = self._pairs.get((first, second))
+        if pair is None:
+            pair = self._pairs.get((second, first))
+        if pair is None:
+            raise KeyError(f"Pair ('{first}', '{second}') is not registered.")
+        return pair
+
+    def covariance(self, first: str, second: str):
+        """
+        Returns the rolling covariance of returns between two registered assets.
+
+        Args:
+            first (str): The name of one asset of the pair.
+            second (str): The name of the other asset of the pair.
+
+        Returns:
+            float or None: The sample covariance, or None if fewer than two aligned
+                returns are in the window.
+
+        Raises:
+            KeyError: If the pair has not been registered with `register_pair()`.
+        """
+        return self._get_pair(first, second).covariance()
+
+    def correlation(self, first: str, second: str):
+        """
+        Returns the rolling correlation of returns between two registered assets.
+
+        Args:
+            first (str): The name of one asset of the pair.
+            second (str): The name of the other asset of the pair.
+
+        Returns:
+            float or None: The correlation, or None if fewer than two aligned returns
+                are in the window or either asset's returns have no variance.
+
+        Raises:
+            KeyError: If the pair has not been registered with `register_pair()`.
+        """
+        return self._get_pair(first, second).correlation()
+
+    def add_alert(self, name: str, kind: str, callback, level: float = None) -> int:
+        """
+        Registers a price alert rule on an asset.
+
+        An "above" rule fires when a price moves from below `level` to `level` or higher,
+        and a "below" rule fires when a price moves from above `level` to `level` or lower.
+        A "new_high" rule fires when a price exceeds the 10-day maximum as of the previous
+        price, and a "new_low" rule when it falls below the 10-day minimum. Callbacks are
+        called once per `add_price()` with the list of their `Alert`s fired by it.
+
+        Args:
+            name (str): The name of the asset.
+            kind (str): One of "above", "below", "new_high" or "new_low".
+            callback (callable): Called with a list of `Alert` tuples when the rule fires.
+            level (float, optional): The price level of "above" and "below" rules.
+
+        Returns:
+            int: The ID of the rule, for use with `remove_alert()`.
+
+        Raises:
+            KeyError: If the asset does not exist in the market.
+            ValueError: If `kind` is unknown or a level rule has no level.
+        """
+        return self._alerts.add_rule(self.asset_id(name), name, kind, level, callback)
+
+    def remove_alert(self, rule_id: int):
+        """
+        Removes a price alert rule.
+
+        Args:
+            rule_id (int): The ID returned by `add_alert()`.
+
+        Raises:
+            KeyError: If no rule has this ID.
+        """
+        self._alerts.remove_rule(rule_id)
+
+    def add_basket(self, basket: str, weights: dict):
+        """
+        Registers a weighted basket of assets whose value is maintained on every tick.
+
+        The basket's value is the weighted sum of the latest prices of its constituents.
+        It is available once every constituent has a price, and each constituent tick
+        then updates it in O(1) and records it in the basket's own time series.
+
+        Args:
+            basket (str): The name of the basket.
+            weights (dict[str, float]): Maps each constituent asset name to its weight.
+
+        Raises:
+            KeyError: If any constituent does not exist in the market.
+            ValueError: If a basket with this name already exists or `weights` is empty.
+        """
+        if basket in self._baskets:
+            raise ValueError(f"Basket '{basket}' already exists.")
+        ids = [self.asset_id(name) for name in weights]
+        new_basket = Basket(basket, weights)
+        new_basket.seed({self._names[i]: self._last_price[i] for i in ids
+                         if not isnan(self._last_price[i])})
+        self._baskets[basket] = new_basket
+        for asset_id in ids:
+            self._baskets_by_asset.setdefault(asset_id, []).append(new_basket)
+
+    def _get_basket(self, basket: str) -> Basket:
+        """
+        Returns a registered basket.
+
+        Args:
+            basket (str): The name of the basket.
+
+        Returns:
+            Basket: The basket.
+
+        Raises:
+            KeyError: If the basket has not been registered with `add_basket()`.
+        """
+        if basket not in self._baskets:
+            raise KeyError(f"Basket '{basket}' not found in market.")
+        return self._baskets[basket]
+
+    def basket_value(self, basket: str):
+        """
+        Returns the current value of a basket.
+
+        Args:
+            basket (str): The name of the basket.
+
+        Returns:
+            float or None: The weighted sum of the latest constituent prices, or None if
+                some constituent has no price yet.
+
+        Raises:
+            KeyError: If the basket has not been registered with `add_basket()`.
+        """
+        return self._get_basket(basket).value
+
+    def get_basket_data(self, basket: str, start: datetime, end: datetime):
+        """
+        Retrieves the recorded values of a basket within the given time range.
+
+        Args:
+            basket (str): The name of the basket.
+            start (datetime): The start time of the desired range (inclusive).
+            end (datetime): The end time of the desired range (inclusive).
+
+        Returns:
+            list[tuple[datetime, tuple[float, float, float, float]]]: The timestamp and the
+                (value, 10-day min, 10-day max, 10-day average) of each recorded value.
+
+        Raises:
+            KeyError: If the basket has not been registered with `add_basket()`.
+        """
+        return self._get_basket(basket).get_price_data(start, end)
+
+    def price_stats(self, name: str, start: datetime, end: datetime):
+        """
+        Returns the minimum, maximum and average price of an asset over any time range.
+
+        The range is answered in O(log n) from the subtree aggregates of the asset's
+        AVL tree, without scanning its data points.
+
+        Args:
+            name (str): The name of the asset.
+            start (datetime): The start of the time range (inclusive).
+            end (datetime): The end of the time range (inclusive).
+
+        Returns:
+            tuple[float, float, float] or None: The (min, max, average) price, or None if
+                the asset has no prices in the range.
+
+        Raises:
+            KeyError: If the asset does not exist in the market.
+        """
+        tracker = self._get_tracker(self.asset_id(name))
+        return None if tracker is None else tracker.price_stats(start, end)
+
+    def window_stats(self, name: str, time: datetime):
+        """
+        Returns the minimum, maximum and average price of an asset in the 10 days up to `time`.
+
+        This answers by name what `calculate_min()`, `calculate_max()` and `calculate_avg()`
+        compute by scanning a list, in O(log n) from the asset's AVL tree.
+
+        Args:
+            name (str): The name of the asset.
+            time (datetime): The end of the 10-day window (inclusive).
+
+        Returns:
+            tuple[float, float, float] or None: The (min, max, average) price, or None if
+                the asset has no prices in the window.
+
+        Raises:
+            KeyError: If the asset does not exist in the market.
         """
-        if name not in self.market_data:
-            self.market_data[name] = PriceTracker()
+        return self.price_stats(name, time - timedelta(days=10), time)
 
     def calculate_min(self, data, time):
         """
@@ -0,0 +1,87 @@
+import sys
+import tracemalloc
+
+# Number of instances allocated to measure the size of a class
+_SAMPLE = 10000
+
+# Range of the ints that CPython preallocates and shares
+_SMALL_INT_MIN = -5
+_SMALL_INT_MAX = 256
+
+_instance_sizes = {}  # Maps classes to their measured instance sizes in bytes
+
+
+def instance_size(cls) -> float:
+    """
+    Returns the number of bytes allocated for an instance of a class, such as a tree node.
+
+    `sys.getsizeof` does not see the attribute storage of ordinary instances, and reading
+    `__dict__` to measure it makes Python allocate a real dict. Instead, the size is
+    measured once per class with tracemalloc, by allocating instances with no arguments,
+    and then cached.
+
+    Args:
+        cls (type): A class whose constructor can be called without arguments.
+
+    Returns:
+        float: The mean number of bytes per instance.
+    """
+    size = _instance_sizes.get(cls)
+    if size is None:
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            sample = [cls() for _ in range(_SAMPLE)]
+            allocated = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            if started:
+                tracemalloc.stop()
+        size = _instance_sizes[cls] = (allocated - sys.getsizeof(sample)) / _SAMPLE
+    return size
+
+
+class SizeCounter:
+    """
+    A class to add up the sizes of objects, counting objects shared between structures once.
+
+    Attributes:
+        total (int): The number of bytes counted so far.
+    """
+
+    def __init__(self):
+        """
+        Initializes a counter that has seen no objects.
+        """
+        self._seen = set()
+        self.total = 0
+
+    def add(self, obj) -> int:
+        """
+        Counts an object, unless it was already counted or is a small int shared by the interpreter.
+
+        Args:
+            obj: The object, whose size is given by `sys.getsizeof`.
+
+        Returns:
+            int: The number of bytes added to the total.
+        """
+        if id(obj) in self._seen or (type(obj) is int and _SMALL_INT_MIN <= obj <= _SMALL_INT_MAX):
+            return 0
+        self._seen.add(id(obj))
+        size = sys.getsizeof(obj)
+        self.total += size
+        return size
+
+    def add_all(self, objs) -> int:
+        """
+        Counts several objects, skipping those already counted.
+
+        Args:
+            objs (Iterable): The objects.
+
+        Returns:
+            int: The number of bytes added to the total.
+        """
+        return sum(map(self.add, objs))
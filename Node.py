@@ -2,6 +2,9 @@ from abc import ABC, abstractmethod
 
 
 class Node(ABC):
+    # Subclasses declare their own __slots__; this keeps instances free of a __dict__
+    __slots__ = ()
+
     @abstractmethod
     def __init__(self, key):
         """
@@ -0,0 +1,144 @@
+from collections import deque
+from datetime import datetime, timedelta
+from math import sqrt
+
+
+class PairTracker:
+    """
+    A class to track the rolling covariance and correlation of returns between two assets.
+
+    Ticks of the two assets rarely arrive at the same times, so returns are aligned by
+    refresh-time sampling: a sample is taken as soon as both assets have ticked since the
+    previous sample, and each asset's return is measured from its price at the previous
+    sample. A return from a price that is not positive is undefined, so no sample is taken
+    when the previous sample has one; the pair is re-anchored at the current prices
+    instead. The samples from the last `window` are kept in a queue, together with running
+    sums of the returns, their squares and their cross product, so every tick updates the
+    statistics in amortised O(1) time and queries never scan the history.
+
+    Attributes:
+        first (str): The name of the first asset of the pair.
+        second (str): The name of the second asset of the pair.
+        window (timedelta): The length of the rolling window.
+    """
+
+    def __init__(self, first: str, second: str, window: timedelta = timedelta(days=10)):
+        """
+        Initializes an empty PairTracker for the given assets.
+
+        Args:
+            first (str): The name of the first asset.
+            second (str): The name of the second asset.
+            window (timedelta): The length of the rolling window. Defaults to 10 days.
+
+        Raises:
+            ValueError: If both names are the same or the window is not positive.
+        """
+        if first == second:
+            raise ValueError("A pair needs two different assets.")
+        if window <= timedelta(0):
+            raise ValueError("Window must be a positive timedelta.")
+        self.first = first
+        self.second = second
+        self.window = window
+
+        self._last = {first: None, second: None}  # Latest price of each asset
+        self._fresh = {first: False, second: False}  # Ticked since the last sample?
+        self._anchor = None  # Prices of (first, second) at the previous sample
+        self._samples = deque()  # (time, first return, second return) in the window
+
+        # Running co-moments of the samples in the window
+        self._n = 0
+        self._sum_a = 0.0
+        self._sum_b = 0.0
+        self._sum_aa = 0.0
+        self._sum_bb = 0.0
+        self._sum_ab = 0.0
+
+    def __len__(self):
+        """Return the number of aligned return samples in the window.
+
+        Returns:
+            int: the number of samples.
+        """
+        return self._n
+
+    def update(self, name: str, time: datetime, price: float):
+        """
+        Records a tick of one of the two assets and updates the rolling co-moments.
+
+        Args:
+            name (str): The asset that ticked, either `first` or `second`.
+            time (datetime): The timestamp of the tick.
+            price (float): The price of the asset at the given time.
+
+        Raises:
+            KeyError: If `name` is not one of the two assets of the pair.
+        """
+        if name not in self._last:
+            raise KeyError(f"Asset '{name}' is not part of this pair.")
+        self._last[name] = price
+        self._fresh[name] = True
+
+        # Take a sample once both assets have refreshed
+        if self._fresh[self.first] and self._fresh[self.second]:
+            pa, pb = self._last[self.first], self._last[self.second]
+            anchor = self._anchor
+            if anchor is not None and anchor[0] > 0.0 and anchor[1] > 0.0:
+                ra = pa / anchor[0] - 1.0
+                rb = pb / anchor[1] - 1.0
+                self._samples.append((time, ra, rb))
+                self._n += 1
+                self._sum_a += ra
+                self._sum_b += rb
+                self._sum_aa += ra * ra
+                self._sum_bb += rb * rb
+                self._sum_ab += ra * rb
+            self._anchor = (pa, pb)
+            self._fresh[self.first] = self._fresh[self.second] = False
+
+        # Drop the samples that have left the window
+        cutoff = time - self.window
+        while self._samples and self._samples[0][0] < cutoff:
+            _, ra, rb = self._samples.popleft()
+            self._n -= 1
+            self._sum_a -= ra
+            self._sum_b -= rb
+            self._sum_aa -= ra * ra
+            self._sum_bb -= rb * rb
+            self._sum_ab -= ra * rb
+        if self._n == 0:
+            # Reset the sums so rounding errors cannot build up
+            self._sum_a = self._sum_b = 0.0
+            self._sum_aa = self._sum_bb = self._sum_ab = 0.0
+
+    def covariance(self):
+        """
+        Returns the sample covariance of the aligned returns in the window.
+
+        Returns:
+            float or None: The covariance, or None if fewer than two samples are available.
+        """
+        n = self._n
+        if n < 2:
+            return None
+        return (self._sum_ab - self._sum_a * self._sum_b / n) / (n - 1)
+
+    def correlation(self):
+        """
+        Returns the Pearson correlation of the aligned returns in the window.
+
+        Returns:
+            float or None: The correlation, or None if fewer than two samples are available
+                or the returns of either asset have no variance.
+        """
+        n = self._n
+        if n < 2:
+            return None
+        var_a = n * self._sum_aa - self._sum_a * self._sum_a
+        var_b = n * self._sum_bb - self._sum_b * self._sum_b
+        if var_a <= 0.0 or var_b <= 0.0:
+            return None
+        corr = (n * self._sum_ab - self._sum_a * self._sum_b) / sqrt(var_a * var_b)
+        # Clamp rounding errors back into the valid range
+        return max(-1.0, min(1.0, corr))
@@ -0,0 +1,291 @@
+class PairingNode:
+    """
+    A handle to an element of a PairingHeap.
+
+    Attributes:
+        key (Comparable): The key used to order the heap.
+        value (Any): The data stored with the key.
+    """
+
+    __slots__ = ("key", "value", "_child", "_next", "_prev")
+
+    def __init__(self, key=None, value=None):
+        """
+        Initializes a node that is not in any heap.
+
+        Args:
+            key (Comparable, optional): The key used to order the heap.
+            value (Any, optional): The data stored with the key.
+        """
+        self.key = key
+        self.value = value
+        self._child = None  # The first of the node's children
+        self._next = None  # The next sibling
+        self._prev = None  # The previous sibling, or the parent of a first child
+
+    def __repr__(self):
+        """
+        Returns a string representation of the node, showing its key and value.
+
+        Returns:
+            str: String representation of the PairingNode.
+        """
+        return f"PairingNode(key={self.key}, value={self.value})"
+
+
+def _link(a: PairingNode, b: PairingNode) -> PairingNode:
+    """
+    Links two heap-ordered trees, making the root with the larger key a child of the other.
+
+    Args:
+        a (PairingNode): The root of the first tree, with no siblings.
+        b (PairingNode): The root of the second tree, with no siblings.
+
+    Returns:
+        PairingNode: The root of the linked tree. On equal keys this is `a`.
+    """
+    if b.key < a.key:
+        a, b = b, a
+    first = a._child
+    b._next = first
+    if first is not None:
+        first._prev = b
+    b._prev = a
+    a._child = b
+    return a
+
+
+def _merge_pairs(first: PairingNode) -> PairingNode:
+    """
+    Links a list of siblings into one tree by the two-pass pairing rule.
+
+    The siblings are linked in pairs from left to right, and the pairs are then linked
+    from right to left. This pairing is what gives extract its O(log n) amortized cost.
+
+    Args:
+        first (PairingNode): The first sibling.
+
+    Returns:
+        PairingNode: The root of the resulting tree.
+    """
+    pairs = []
+    node = first
+    while node is not None:
+        a = node
+        b = a._next
+        if b is None:
+            a._prev = None
+            pairs.append(a)
+            break
+        node = b._next
+        a._prev = a._next = b._prev = b._next = None
+        pairs.append(_link(a, b))
+    root = pairs.pop()
+    while pairs:
+        root = _link(pairs.pop(), root)
+    return root
+
+
+class PairingHeap:
+    """This class implements a meldable min-heap as a pairing heap.
+
+    The heap has the same interface as the linked `MinHeap`: `insert` returns a handle
+    (a PairingNode) that can later be passed to `delete_node` or `update_key`, and `root`
+    is the node with the smallest key. In addition, `meld` moves every node of another
+    heap into this one in O(1), by linking the two roots, so shards or merged asset
+    histories do not have to be reinserted one by one.
+
+    Each node keeps a list of child trees. Inserting, melding and decreasing a key link
+    two trees in O(1); extracting the root pairs up its children, which costs O(log n)
+    amortized.
+
+    Attributes:
+        root: Optional[PairingNode] the node with the smallest key, or None if the heap is empty.
+    """
+
+    def __init__(self):
+        """Creates a new, empty heap"""
+        self.root: PairingNode = None
+        self._size = 0
+
+    def __len__(self):
+        """Return the number of nodes stored in the heap.
+
+        Returns:
+            int: the number of nodes in the heap.
+        """
+        return self._size
+
+    def _cut(self, node: PairingNode):
+        """
+        Detaches a node that is not the root, with its subtree, from its parent.
+
+        Args:
+            node (PairingNode): The node to detach.
+        """
+        prev = node._prev
+        if prev._child is node:
+            prev._child = node._next
+        else:
+            prev._next = node._next
+        if node._next is not None:
+            node._next._prev = prev
+        node._prev = node._next = None
+
+    def _check_in_heap(self, node: PairingNode):
+        """
+        Checks that a node is in a heap: either the root, or linked to a parent or sibling.
+
+        Args:
+            node (PairingNode): The node.
+
+        Raises:
+            KeyError: If the heap is empty or the node is not in a heap.
+        """
+        if self.root is None:
+            raise KeyError("Heap is empty.")
+        if node is not self.root and node._prev is None:
+            raise KeyError(f"{node} is not in the heap.")
+
+    def insert_node(self, node: PairingNode) -> PairingNode:
+        """
+        Inserts a node that is not in any heap.
+
+        Args:
+            node (PairingNode): The node to insert.
+
+        Returns:
+            PairingNode: The inserted node.
+
+        Raises:
+            ValueError: If the node is already in a heap.
+        """
+        if node._prev is not None or node._child is not None or node is self.root:
+            raise ValueError(f"{node} is already in a heap.")
+        self.root = node if self.root is None else _link(self.root, node)
+        self._size += 1
+        return node
+
+    def insert(self, key, value=None) -> PairingNode:
+        """
+        Creates a new node with the given key and value and inserts it into the heap.
+
+        Args:
+            key (Comparable): The key used to maintain heap ordering.
+            value (Any, optional): Optional data associated with the key. Defaults to None.
+
+        Returns:
+            PairingNode: The handle of the new node.
+        """
+        node = PairingNode(key, value)
+        self.root = node if self.root is None else _link(self.root, node)
+        self._size += 1
+        return node
+
+    @classmethod
+    def from_iterable(cls, pairs):
+        """
+        Builds a heap from (key, value) pairs in O(n) time.
+
+        Args:
+            pairs (Iterable[tuple]): The (key, value) pairs to store.
+
+        Returns:
+            tuple[PairingHeap, list[PairingNode]]: The new heap and the node of each pair,
+                in input order.
+        """
+        heap = cls()
+        nodes = [heap.insert(key, value) for key, value in pairs]
+        return heap, nodes
+
+    def meld(self, other: 'PairingHeap'):
+        """
+        Moves every node of another heap into this one in O(1).
+
+        The handles of the other heap's nodes stay valid, and now refer to nodes of this
+        heap. The other heap is left empty.
+
+        Args:
+            other (PairingHeap): The heap to meld into this one.
+
+        Raises:
+            ValueError: If `other` is this heap.
+        """
+        if other is self:
+            raise ValueError("Cannot meld a heap with itself.")
+        if other.root is not None:
+            self.root = other.root if self.root is None else _link(self.root, other.root)
+            self._size += other._size
+            other.root = None
+            other._size = 0
+
+    def extract(self) -> PairingNode:
+        """
+        Removes and returns the root node, the node with the smallest key.
+
+        Returns:
+            PairingNode: The removed node.
+
+        Raises:
+            KeyError: If the heap is empty.
+        """
+        root = self.root
+        if root is None:
+            raise KeyError("Heap is empty")
+        child = root._child
+        root._child = None
+        self.root = None if child is None else _merge_pairs(child)
+        self._size -= 1
+        return root
+
+    def delete_node(self, node: PairingNode) -> PairingNode:
+        """
+        Removes an arbitrary node from the heap.
+
+        The node is cut from its parent, and its children are paired up into a tree that
+        is linked back to the root, in O(log n) amortized time.
+
+        Args:
+            node (PairingNode): The handle of the node to remove.
+
+        Returns:
+            PairingNode: The removed node.
+
+        Raises:
+            KeyError: If the heap is empty or the node is not in a heap.
+        """
+        self._check_in_heap(node)
+        if node is self.root:
+            return self.extract()
+        self._cut(node)
+        child = node._child
+        if child is not None:
+            node._child = None
+            self.root = _link(self.root, _merge_pairs(child))
+        self._size -= 1
+        return node
+
+    def update_key(self, node: PairingNode, key):
+        """
+        Changes the key of a node in the heap and restores the heap order.
+
+        Decreasing a key cuts the node's subtree and links it to the root in O(1);
+        increasing it removes and reinserts the node. The node keeps its handle.
+
+        Args:
+            node (PairingNode): A node in the heap.
+            key (Comparable): The new key.
+
+        Raises:
+            KeyError: If the node is not in a heap.
+        """
+        self._check_in_heap(node)
+        if key < node.key:
+            node.key = key
+            if node is not self.root:
+                self._cut(node)
+                self.root = _link(self.root, node)
+        else:
+            self.delete_node(node)
+            node.key = key
+            self.insert_node(node)
@@ -1,11 +1,68 @@
-from AVLTree import AVLTree
+from AggregateAVLTree import AggregateAVLTree
+from operator import itemgetter
 from TreeNode import TreeNode
 # assuming TreeNode is correctly imported
-from Heap import MinHeap
+from IndexedHeap import IndexedMinHeap, IndexedMaxHeap
 from datetime  import datetime, timedelta
-from BST import range_query
+from array import array
+import struct
+from time import perf_counter_ns
+from BST import floor_item
 from TreePrinter import print_tree
-  # Importing the range_query function
+from TrackerStats import TrackerStats
+from MemoryUsage import SizeCounter, instance_size
+
+# Binary layout written by PriceTracker.to_bytes: a header with a magic string,
+# a format version, the number of data points and the running sum of the prices
+# in the window, followed by the timestamps as int64 microseconds since EPOCH and
+# then the (price, min, max, avg) float64s.
+_HEADER = struct.Struct("<4sBQd")
+_MAGIC = b"PTRK"
+_VERSION = 1
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+# Arity of the window heaps. In benchmarks/bench_heaps.py, 4- and 8-ary heaps were
+# slightly faster than binary ones on the sliding-window workload.
+WINDOW_HEAP_ARITY = 4
+
+# Fraction of tombstones at which the window heaps are compacted. Expired prices are
+# deleted lazily, which was faster in benchmarks/bench_heaps.py when many prices leave
+# the window at once, e.g. on the first tick after a gap in the feed.
+WINDOW_HEAP_COMPACT_RATIO = 0.5
+
+# The price of a (price, 10-day min, 10-day max, 10-day average) tuple, which the
+# AVL tree aggregates
+_PRICE = itemgetter(0)
+
+
+def unpack_points(data: bytes):
+    """
+    Decodes the data points of a tracker serialized by `PriceTracker.to_bytes()`.
+
+    Args:
+        data (bytes): The serialized tracker.
+
+    Returns:
+        tuple[array, array, float]: The timestamps as microseconds since EPOCH, the
+            flattened (price, min, max, avg) values with four entries per timestamp, and
+            the running sum of the prices in the rolling window.
+
+    Raises:
+        ValueError: If `data` is not a serialized PriceTracker.
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("Data is too short to be a serialized PriceTracker.")
+    magic, version, count, price_sum = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("Data is not a serialized PriceTracker.")
+    if len(data) != _HEADER.size + 40 * count:
+        raise ValueError("Serialized PriceTracker has the wrong length.")
+    times = array("q")
+    times.frombytes(data[_HEADER.size:_HEADER.size + 8 * count])
+    values = array("d")
+    values.frombytes(data[_HEADER.size + 8 * count:])
+    return times, values, price_sum
 
 
 class PriceTracker:
@@ -13,13 +70,14 @@ class PriceTracker:
         A class to track asset prices over time and manage 10-day minimum price calculations.
 
         This class stores price data for a given asset, maintains an AVL tree to store all prices
-        recorded, and uses a MinHeap to track the 10-day minimum price for each new data point.
+        recorded, and uses an IndexedMinHeap to track the 10-day minimum price for each new data point.
         The class also provides functionality to retrieve price data within a specified time range.
 
         Attributes:
-            price_data (dict): A dictionary mapping timestamps to TreeNode objects in the MinHeap.
-            time_data (AVLTree): An AVL tree containing all price data recorded so far.
-            price_heap (MinHeap): A MinHeap used to track prices for the 10 days preceding the most recent data point.
+            price_data (dict): A dictionary mapping timestamps to HeapEntry handles in the heaps.
+            time_data (AggregateAVLTree): An AVL tree containing all price data recorded so far,
+                with the count, sum, min and max of the prices in every subtree.
+            price_heap (IndexedMinHeap): A min-heap used to track prices for the 10 days preceding the most recent data point.
             last_time (datetime): Tracks the most recent time a price was added.
 
         Methods:
@@ -35,21 +93,22 @@ class PriceTracker:
         A class to track and manage price data over time using multiple data structures.
 
         Attributes:
-            price_data (dict): Maps timestamps or data identifiers to corresponding TreeNode objects
-                             stored in the MinHeap.
-            time_data (AVLTree): An AVL tree that stores all historical price data, ordered by time.
-            price_heap (MinHeap): A min-heap that stores prices for the 10 most recent data points
+            price_data (dict): Maps timestamps or data identifiers to corresponding HeapEntry handles
+                             stored in the heaps.
+            time_data (AggregateAVLTree): An AVL tree that stores all historical price data, ordered by time.
+            price_heap (IndexedMinHeap): A min-heap that stores prices for the 10 most recent data points
                                 prior to the latest one.
             last_time (Any): Tracks the timestamp or identifier of the most recently added data point.
         """
-        self._price_data = {}  # Dictionary to map price data points to TreeNode objects in MinHeap
-        self._time_data = AVLTree()  # AVL tree containing all price data so far.
-        self._price_heap = MinHeap()
-        self._max_heap = MinHeap()# MinHeap containing prices for the 10 days before most recent data point
+        self._price_data = {}  # Dictionary to map price data points to their entries in the heaps
+        self._time_data = AggregateAVLTree(_PRICE)  # AVL tree containing all price data so far.
+        self._price_heap = IndexedMinHeap(WINDOW_HEAP_ARITY, compact_ratio=WINDOW_HEAP_COMPACT_RATIO)
+        self._max_heap = IndexedMaxHeap(WINDOW_HEAP_ARITY, compact_ratio=WINDOW_HEAP_COMPACT_RATIO)# Heaps containing prices for the 10 days before most recent data point
         self._last_time = None  # To track the last added time
 
         self._price_sum = 0.0
         self._price_count = 0
+        self._stats = None  # TrackerStats, while statistics are enabled
 
     def add_price(self, time: datetime, price: float):
         """
@@ -64,20 +123,35 @@ class PriceTracker:
         Raises:
             TypeError: If `time` is not a datetime object or `price` is not a float.
         """
+        if self._stats is not None:
+            self._timed_add_price(time, price)
+            return
         if self._last_time is not None:
-            # 1. Compute the start time for the 10-day window.
-
-            start_time = self._last_time - timedelta(days=10)
-            end_time = time - timedelta(days=10) - timedelta.resolution
-
-            # 2. Query the AVLTree to get a list of times that are older than the start_time
-            # but within the 10-day window for the current price (range query).
-            old_prices = range_query(self._time_data, start_time, end_time)
-        else:
-            old_prices = []
-            # 3. For each time in old_prices, do the following:
-        for price_time in old_prices:
-            timestamp = price_time[0]
+            self._expire(time)
+        self._push(time, price)
+        self._record(time, price)
+
+    def _expire(self, time: datetime) -> int:
+        """
+        Removes the prices that leave the 10-day window when a price arrives at `time`.
+
+        Args:
+            time (datetime): The timestamp of the new price.
+
+        Returns:
+            int: The number of prices removed.
+        """
+        # 1. Compute the start time for the 10-day window.
+        start_time = self._last_time - timedelta(days=10)
+        end_time = time - timedelta(days=10) - timedelta.resolution
+
+        # 2. Scan the AVLTree for the times that are older than the start_time
+        # but within the 10-day window for the current price (range scan).
+        expired = 0
+
+        # 3. For each time in the scan, do the following:
+        for timestamp, _ in self._scan(start_time, end_time):
+            expired += 1
             min_node, max_node, old_price = self._price_data.get(timestamp)
 
             self._price_heap.delete_node(min_node)
@@ -87,26 +161,148 @@ class PriceTracker:
             self._price_count -= 1  #Update count
 
             del self._price_data[timestamp]
+        return expired
+
+    def _push(self, time: datetime, price: float):
+        """
+        Adds a new price to the 10-day window.
 
-            # Insert into min-heap
+        Args:
+            time (datetime): The timestamp of the price.
+            price (float): The price.
+        """
+        # Insert into min-heap
         min_node = self._price_heap.insert(price, price)
 
-        # Insert into max-heap (as negative key)
-        max_node = self._max_heap.insert(-price, price)
+        # Insert into max-heap
+        max_node = self._max_heap.insert(price, price)
 
         self._price_data[time] = (min_node, max_node, price)
 
         self._price_sum += price  #Update sum
         self._price_count += 1  #Update count
 
+    def _record(self, time: datetime, price: float):
+        """
+        Stores a price with the current 10-day minimum, maximum and average in the AVL tree.
+
+        Args:
+            time (datetime): The timestamp of the price.
+            price (float): The price.
+        """
         ten_day_min = self._price_heap.root.value
-        ten_day_max = self._max_heap.root.value  # max value is stored as positive
+        ten_day_max = self._max_heap.root.value
         ten_day_avg = self._price_sum / self._price_count if self._price_count else price
 
         #New format: (price, min, max, avg)
         self._time_data.insert(time, (price, ten_day_min, ten_day_max, ten_day_avg))
         self._last_time = time
 
+    def correct_price(self, time: datetime, price: float):
+        """
+        Replaces the price recorded at `time`, for example after a corrected print.
+
+        The tick must still be in the 10-day window of the latest price. Its heap entries
+        are re-keyed in place and the running sum adjusted, so the window's minimum,
+        maximum and average are repaired in O(log w) for a window of w prices. The
+        latest data point's 10-day statistics are updated from the window. The corrected
+        data point gets the new price and, if it is not the latest, statistics recomputed
+        over its own 10-day window from the AVL tree's range aggregates in O(log n). The
+        data points in between keep the statistics they were recorded with.
+
+        Args:
+            time (datetime): The timestamp of the tick to correct.
+            price (float): The corrected price.
+
+        Raises:
+            KeyError: If no price in the 10-day window was recorded at `time`.
+        """
+        entry = self._price_data.get(time)
+        if entry is None:
+            raise KeyError(f"No price recorded at {time} in the 10-day window.")
+        min_node, max_node, old_price = entry
+        min_node.value = price
+        self._price_heap.update_key(min_node, price)
+        max_node.value = price
+        self._max_heap.update_key(max_node, price)
+        self._price_data[time] = (min_node, max_node, price)
+        self._price_sum += price - old_price
+
+        # Inserting at an existing time replaces the value and refreshes the tree's aggregates
+        tree = self._time_data
+        tree.insert(time, (price,) + tree.get_value(time)[1:])
+        if time != self._last_time:
+            agg = tree.aggregate(time - timedelta(days=10), time)
+            tree.insert(time, (price, agg.min, agg.max, agg.total / agg.count))
+        tree.insert(self._last_time, (tree.get_value(self._last_time)[0], self._price_heap.root.value,
+                                      self._max_heap.root.value, self._price_sum / self._price_count))
+
+    def _timed_add_price(self, time: datetime, price: float):
+        """
+        Adds a price like `add_price()`, recording the time spent in each phase.
+
+        Args:
+            time (datetime): The timestamp of the price data point.
+            price (float): The price of the asset at the given time.
+        """
+        stats = self._stats
+        latency = stats.latency
+        t0 = perf_counter_ns()
+        if self._last_time is not None:
+            stats.expired += self._expire(time)
+        t1 = perf_counter_ns()
+        self._push(time, price)
+        t2 = perf_counter_ns()
+        self._record(time, price)
+        t3 = perf_counter_ns()
+        latency["expire"].record(t1 - t0)
+        latency["heap"].record(t2 - t1)
+        latency["tree"].record(t3 - t2)
+        stats.ticks += 1
+
+    def enable_stats(self, stats: TrackerStats = None) -> TrackerStats:
+        """
+        Starts recording counters and per-phase latency histograms for `add_price()`.
+
+        While statistics are disabled, `add_price()` only pays for one attribute check.
+
+        Args:
+            stats (TrackerStats, optional): The statistics to add to. Defaults to None,
+                which starts from empty statistics.
+
+        Returns:
+            TrackerStats: The statistics being recorded.
+        """
+        self._stats = TrackerStats() if stats is None else stats
+        return self._stats
+
+    def disable_stats(self):
+        """
+        Stops recording statistics.
+        """
+        self._stats = None
+
+    def stats(self) -> dict:
+        """
+        Returns the recorded statistics together with the current sizes of the structures.
+
+        Returns:
+            dict: The "ticks" and "expired" counts, the "window" size (the number of
+                prices in each heap), the "tree_size" and "tree_height" of the AVL tree,
+                and under "latency" a summary of each phase of `add_price()` as returned
+                by `LatencyHistogram.summary()`. The counts and latencies are None while
+                statistics are disabled.
+        """
+        stats = self._stats
+        return {
+            "ticks": None if stats is None else stats.ticks,
+            "expired": None if stats is None else stats.expired,
+            "window": len(self._price_heap),
+            "tree_size": len(self._time_data),
+            "tree_height": 0 if self._time_data.root is None else self._time_data.height,
+            "latency": None if stats is None else {phase: h.summary() for phase, h in stats.latency.items()},
+        }
+
     def get_price_data(self, start: datetime, end: datetime):
         """
         Retrieves all price data (price and 10-day minimum) stored in the AVL tree
@@ -125,8 +321,228 @@ class PriceTracker:
             ValueError: If `start` is after `end`.
         """
 
-        return range_query(self._time_data,start, end)
+        return list(self._scan(start, end))
+
+    def iter_price_data(self, start: datetime, end: datetime):
+        """
+        Returns a lazy iterator over the price data stored within the specified datetime
+        range (inclusive), in time order, without building an intermediate list.
+
+        Args:
+            start (datetime): The start of the time range (inclusive).
+            end (datetime): The end of the time range (inclusive).
 
+        Returns:
+            Iterator[tuple[datetime, tuple[float, float, float, float]]]: The timestamp and
+                (price, 10-day min, 10-day max, 10-day average) of each data point.
+        """
+        return self._scan(start, end)
+
+    def _scan(self, start: datetime, end: datetime):
+        """
+        Returns an iterator over the data points in [start, end], read with an AVLCursor.
 
+        The cursor seeks to `start` in O(log n) and then steps through the tree along
+        parent links, so a scan of k points costs O(log n + k) with no recursion.
 
+        Args:
+            start (datetime): The start of the time range (inclusive).
+            end (datetime): The end of the time range (inclusive).
+
+        Returns:
+            Iterator[tuple[datetime, tuple[float, float, float, float]]]: The data points,
+                in time order.
+        """
+        cursor = self._time_data.cursor()
+        cursor.seek(start)
+        return cursor.iter_to(end)
+
+    def price_at(self, time: datetime):
+        """
+        Returns the most recent data point recorded at or before the given time.
+
+        Args:
+            time (datetime): The reference time.
+
+        Returns:
+            tuple[datetime, tuple[float, float, float, float]] or None: The timestamp and
+                (price, 10-day min, 10-day max, 10-day average) of the data point, or None
+                if no price was recorded at or before `time`.
+        """
+        return floor_item(self._time_data, time)
+
+    def latest(self):
+        """
+        Returns the most recently added data point.
+
+        Returns:
+            tuple[datetime, tuple[float, float, float, float]] or None: The timestamp and
+                (price, 10-day min, 10-day max, 10-day average) of the last price added,
+                or None if no price has been added yet.
+        """
+        if self._last_time is None:
+            return None
+        return (self._last_time, self._time_data.get_value(self._last_time))
+
+    def price_stats(self, start: datetime, end: datetime):
+        """
+        Returns the minimum, maximum and average of the prices recorded in a time range.
+
+        The range can be any interval, not just the 10-day window. It is answered from the
+        aggregates kept in the AVL tree's subtrees in O(log n), without visiting its points.
+
+        Args:
+            start (datetime): The start of the time range (inclusive).
+            end (datetime): The end of the time range (inclusive).
+
+        Returns:
+            tuple[float, float, float] or None: The (min, max, average) price, or None if no
+                price was recorded in the range.
+        """
+        agg = self._time_data.aggregate(start, end)
+        if agg.count == 0:
+            return None
+        return (agg.min, agg.max, agg.total / agg.count)
+
+    def lowest_prices(self, n: int) -> list:
+        """
+        Returns the lowest prices in the 10-day window of the latest price.
+
+        The window's min-heap is read in key order with `iter_sorted()`, which costs
+        O(n log n) and leaves the heap as it is.
+
+        Args:
+            n (int): The number of prices to return.
+
+        Returns:
+            list[float]: Up to n prices, from the lowest up.
+
+        Raises:
+            ValueError: If `n` is negative.
+        """
+        return [entry.value for entry in self._price_heap.iter_sorted(n)]
+
+    def highest_prices(self, n: int) -> list:
+        """
+        Returns the highest prices in the 10-day window of the latest price.
+
+        Args:
+            n (int): The number of prices to return.
+
+        Returns:
+            list[float]: Up to n prices, from the highest down.
+
+        Raises:
+            ValueError: If `n` is negative.
+        """
+        return [entry.value for entry in self._max_heap.iter_sorted(n)]
+
+    def memory_usage(self) -> dict:
+        """
+        Estimates the bytes used by each of the tracker's data structures.
+
+        Objects shared between structures, such as a timestamp that is both an AVL tree key
+        and a `_price_data` key, are counted once, in the first structure listed. This walks
+        every stored object, so it takes time linear in the number of data points.
+
+        Returns:
+            dict: The bytes used by the "time_tree" (AVL nodes, timestamps and value
+                tuples), "price_data" (the dict and its tuples), "min_heap" and "max_heap"
+                (the heap arrays, tombstone sets and entries, with their keys, ranks and
+                positions), and their "total".
+        """
+        counter = SizeCounter()
+        usage = {}
+
+        size = 0
+        stack = [] if self._time_data.root is None else [self._time_data.root]
+        while stack:
+            node = stack.pop()
+            size += instance_size(type(node)) + counter.add(node._key)
+            size += counter.add(node._value) + counter.add_all(node._value)
+            size += counter.add(node._sum) + counter.add(node._count)  # Min and max are prices
+            if node._left is not None:
+                stack.append(node._left)
+            if node._right is not None:
+                stack.append(node._right)
+        usage["time_tree"] = size
+
+        size = counter.add(self._price_data)
+        for entry in self._price_data.values():
+            size += counter.add(entry) + counter.add(entry[2])
+        usage["price_data"] = size
+
+        for name, heap in (("min_heap", self._price_heap), ("max_heap", self._max_heap)):
+            size = counter.add(heap._entries) + counter.add(heap._dead)
+            for node in heap._entries:  # Including tombstones of expired prices
+                size += instance_size(type(node)) + counter.add(node.key) + counter.add(node.value)
+                size += counter.add(node._rank) + counter.add(node._pos)
+            usage[name] = size
+
+        usage["total"] = sum(usage.values())
+        return usage
+
+    def to_bytes(self) -> bytes:
+        """
+        Serializes all recorded data points into a compact binary form.
+
+        Each data point takes 40 bytes: its timestamp as microseconds since 1970-01-01
+        and its (price, 10-day min, 10-day max, 10-day average) as float64 values.
+        Timestamps are expected to be naive datetimes.
+
+        Returns:
+            bytes: The serialized tracker, which can be restored with `from_bytes()`.
+        """
+        times = array("q")
+        values = array("d")
+        for time, data in self._scan(datetime.min, datetime.max):
+            times.append((time - EPOCH) // MICROSECOND)
+            values.extend(data)
+        header = _HEADER.pack(_MAGIC, _VERSION, len(times), self._price_sum)
+        return header + times.tobytes() + values.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'PriceTracker':
+        """
+        Restores a PriceTracker from the output of `to_bytes()`.
+
+        The recorded data points are loaded as they were, and the rolling window is
+        rebuilt from the points of the last 10 days, so further prices can be added
+        exactly as if the tracker had never been serialized.
+
+        Args:
+            data (bytes): The serialized tracker.
+
+        Returns:
+            PriceTracker: The restored tracker.
+
+        Raises:
+            ValueError: If `data` is not a serialized PriceTracker.
+        """
+        times, values, price_sum = unpack_points(data)
 
+        tracker = cls()
+        if not times:
+            return tracker
+        last_time = EPOCH + times[-1] * MICROSECOND
+        window_start = last_time - timedelta(days=10)
+        points = [(EPOCH + us * MICROSECOND, tuple(values[4 * i:4 * i + 4]))
+                  for i, us in enumerate(times)]
+        # The points are in time order, so the tree is built balanced in O(n)
+        tracker._time_data = AggregateAVLTree.from_sorted(points, measure=_PRICE)
+        window_times, window_prices = [], []
+        for time, point in points:
+            if time >= window_start:
+                # This point is still in the rolling window of the last price
+                window_times.append(time)
+                window_prices.append(point[0])
+        # Build both heaps bottom-up in O(w) rather than inserting the prices one by one
+        min_nodes = tracker._price_heap.heapify(zip(window_prices, window_prices))
+        max_nodes = tracker._max_heap.heapify(zip(window_prices, window_prices))
+        tracker._price_data = dict(zip(window_times, zip(min_nodes, max_nodes, window_prices)))
+        tracker._price_count = len(window_prices)
+        # Keep the running sum exactly as it was, rounding included, so that the
+        # averages after a restore match those of the original tracker
+        tracker._price_sum = price_sum
+        tracker._last_time = last_time
+        return tracker
@@ -0,0 +1,124 @@
+from collections import namedtuple
+from datetime import datetime
+from time import perf_counter, perf_counter_ns, sleep
+from Heap import MinHeap
+from TickFile import TickReader, select_range, to_datetimes
+from TrackerStats import LatencyHistogram
+
+# Summary of a replay: the number of ticks, the wall-clock seconds taken, the sustained
+# rate, and the `LatencyHistogram.summary()` of the add_price latencies in nanoseconds
+ReplayReport = namedtuple("ReplayReport", ["ticks", "elapsed", "ticks_per_second", "latency"])
+
+
+def iter_tick_file(path: str, start: datetime = None, end: datetime = None):
+    """
+    Yields the ticks of a binary tick file as (time, name, price) tuples, in file order.
+
+    Only the index blocks that overlap [start, end] are read.
+
+    Args:
+        path (str): The path of a file written by `TickWriter`.
+        start (datetime, optional): Skip ticks before this time.
+        end (datetime, optional): Skip ticks after this time.
+
+    Yields:
+        tuple[datetime, str, float]: The time, asset name and price of each tick.
+    """
+    reader = TickReader(path)
+    names = reader.names
+    for block in reader.iter_blocks(start, end):
+        block = select_range(block, start, end)
+        yield from zip(to_datetimes(block["time"]), [names[a] for a in block["asset"].tolist()],
+                       block["price"].tolist())
+
+
+class ReplayEngine:
+    """
+    A class to replay several time-ordered tick streams through a MarketTracker.
+
+    The streams, for example one per asset file, are merged into a single stream in global
+    time order with a k-way merge: a MinHeap holds the next tick of every stream, so each
+    tick costs O(log k) for k streams. Ticks with equal times are replayed in the order of
+    their streams. The replay can run as fast as possible, or paced to a multiple of the
+    recorded time, and reports its sustained rate and the latency of each `add_price`.
+    The latencies are recorded in a `LatencyHistogram`, so memory does not grow with the
+    number of ticks.
+    """
+
+    def __init__(self, market, streams, add_assets: bool = True):
+        """
+        Initializes a replay of the given streams into a market.
+
+        Args:
+            market (MarketTracker): The market that receives the ticks.
+            streams (list[Iterable[tuple[datetime, str, float]]]): The streams to merge. Each
+                yields (time, name, price) tuples in increasing time order.
+            add_assets (bool): Whether to add assets that are not yet in the market.
+                Defaults to True.
+        """
+        self.market = market
+        self._streams = list(streams)
+        self._add_assets = add_assets
+
+    def merged(self):
+        """
+        Yields the ticks of all streams in global time order.
+
+        Yields:
+            tuple[datetime, str, float]: The time, asset name and price of each tick.
+        """
+        heap = MinHeap()
+        for ix, stream in enumerate(self._streams):
+            it = iter(stream)
+            tick = next(it, None)
+            if tick is not None:
+                heap.insert((tick[0], ix), (tick, it))
+        while len(heap) > 0:
+            node = heap.extract()
+            tick, it = node.value
+            yield tick
+            nxt = next(it, None)
+            if nxt is not None:
+                # The key keeps the stream index to break ties between equal times
+                heap.insert((nxt[0], node.key[1]), (nxt, it))
+
+    def run(self, speed: float = None) -> ReplayReport:
+        """
+        Replays every tick into the market.
+
+        Args:
+            speed (float, optional): How many seconds of recorded time to replay per second
+                of wall-clock time, for example 60 to replay an hour per minute. Defaults to
+                None, which replays as fast as possible.
+
+        Returns:
+            ReplayReport: The number of ticks, elapsed seconds, ticks per second and the
+                summary of the add_price latencies, as returned by `LatencyHistogram.summary()`.
+
+        Raises:
+            ValueError: If `speed` is not positive.
+        """
+        if speed is not None and speed <= 0:
+            raise ValueError("Speed must be positive.")
+        market = self.market
+        latencies = LatencyHistogram()
+        first_time = None
+        start = perf_counter()
+        for time, name, price in self.merged():
+            if speed is not None:
+                # Wait until the wall clock catches up with the recorded time
+                if first_time is None:
+                    first_time = time
+                delay = start + (time - first_time).total_seconds() / speed - perf_counter()
+                if delay > 0:
+                    sleep(delay)
+            if self._add_assets:
+                market.add_asset(name)
+            t0 = perf_counter_ns()
+            market.add_price(name, time, price)
+            latencies.record(perf_counter_ns() - t0)
+        elapsed = perf_counter() - start
+        return ReplayReport(latencies.count, elapsed,
+                            latencies.count / elapsed if elapsed > 0 else 0.0,
+                            latencies.summary())
+
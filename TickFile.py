@@ -0,0 +1,324 @@
+import json
+import os
+import struct
+from datetime import datetime, timedelta
+import numpy as np
+
+# Every tick is a fixed-width 24 byte record
+TICK_DTYPE = np.dtype([("asset", "<i8"), ("time", "<i8"), ("price", "<f8")])
+
+# The data file starts with a header holding a magic string, the format version and
+# the number of records per index block, followed directly by the records. The record
+# count, the asset names and the block index live in a JSON sidecar file next to it.
+_HEADER = struct.Struct("<8sII")
+_MAGIC = b"TICKFILE"
+_VERSION = 1
+HEADER_SIZE = _HEADER.size
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def to_ns(time: datetime) -> int:
+    """
+    Converts a naive datetime to nanoseconds since 1970-01-01.
+
+    Args:
+        time (datetime): The time to convert.
+
+    Returns:
+        int: The number of nanoseconds since the epoch.
+    """
+    return (time - EPOCH) // timedelta(microseconds=1) * 1000
+
+
+def to_datetimes(times):
+    """
+    Converts an array of nanosecond timestamps to a list of datetimes.
+
+    Timestamps are truncated to whole microseconds, the resolution of datetime.
+
+    Args:
+        times (numpy.ndarray): int64 nanoseconds since 1970-01-01.
+
+    Returns:
+        list[datetime]: The converted timestamps.
+    """
+    return (times // 1000).astype("datetime64[us]").astype(object).tolist()
+
+
+def _index_path(path: str) -> str:
+    """
+    Returns the path of the index sidecar of a tick file.
+
+    Args:
+        path (str): The path of the tick file.
+
+    Returns:
+        str: The path of its index.
+    """
+    return path + ".idx"
+
+
+class TickWriter:
+    """
+    A class to write ticks to a binary tick file.
+
+    The data file holds one fixed-width record per tick, so it can be memory-mapped and
+    read without parsing. Every `block_size` records form a block, and the index stores
+    the earliest and latest timestamp of each block, so readers can skip the blocks that
+    lie outside a time range. Opening an existing file appends to it, unless `append`
+    is False.
+
+    Asset names are stored once in the index, and each record refers to its asset by
+    position in that list.
+    """
+
+    def __init__(self, path: str, block_size: int = 4096, append: bool = True):
+        """
+        Opens a tick file for appending, creating it if it does not exist.
+
+        Args:
+            path (str): The path of the tick file.
+            block_size (int): The number of records per index block, used when the file is
+                created. Defaults to 4096.
+            append (bool): Whether to append to an existing file, or else replace it with
+                an empty one. Defaults to True.
+
+        Raises:
+            ValueError: If the file exists but is not a tick file, or `block_size` is not positive.
+        """
+        self.path = path
+        if append and os.path.exists(path):
+            reader = TickReader(path)
+            self.block_size = reader.block_size
+            self._names = list(reader.names)
+            self._blocks = reader.blocks.tolist()
+            self._count = len(reader)
+            del reader
+            # A writer that appended without closing may have left records past the
+            # indexed count; drop them so new records follow the indexed ones
+            os.truncate(path, HEADER_SIZE + self._count * TICK_DTYPE.itemsize)
+        else:
+            if block_size < 1:
+                raise ValueError("block_size must be positive.")
+            self.block_size = block_size
+            self._names = []
+            self._blocks = []
+            self._count = 0
+            with open(path, "wb") as f:
+                f.write(_HEADER.pack(_MAGIC, _VERSION, block_size))
+            self._write_index()
+        self._ids = {name: i for i, name in enumerate(self._names)}
+        self._file = open(path, "ab")
+
+    def __len__(self):
+        """Return the number of records in the file.
+
+        Returns:
+            int: the number of records.
+        """
+        return self._count
+
+    def __enter__(self):
+        """Return the writer for use in a with statement.
+
+        Returns:
+            TickWriter: this writer.
+        """
+        return self
+
+    def __exit__(self, *exc):
+        """Close the writer at the end of a with statement.
+
+        Args:
+            *exc: The exception details, if any.
+        """
+        self.close()
+
+    def append(self, names, times, prices):
+        """
+        Appends ticks to the end of the file.
+
+        Args:
+            names (list[str]): The asset name of each tick.
+            times (list[datetime]): The timestamp of each tick.
+            prices (list[float]): The price of each tick.
+
+        Raises:
+            ValueError: If the lists have different lengths.
+        """
+        if not len(names) == len(times) == len(prices):
+            raise ValueError("names, times and prices must have the same length.")
+        assets = []
+        for name in names:
+            asset = self._ids.get(name)
+            if asset is None:
+                asset = self._ids[name] = len(self._names)
+                self._names.append(name)
+            assets.append(asset)
+        records = np.empty(len(names), dtype=TICK_DTYPE)
+        records["asset"] = assets
+        records["time"] = [to_ns(t) for t in times]
+        records["price"] = prices
+        self.append_records(records)
+
+    def append_records(self, records):
+        """
+        Appends ticks that are already in the record format of the file.
+
+        Args:
+            records (numpy.ndarray): An array with dtype TICK_DTYPE whose asset fields are
+                positions in the file's list of names.
+        """
+        if len(records) == 0:
+            return
+        self._file.write(np.ascontiguousarray(records, dtype=TICK_DTYPE).tobytes())
+        # Extend the index, starting with the last block if it was not yet full
+        times = records["time"]
+        pos = 0
+        offset = self._count % self.block_size
+        if offset:
+            pos = min(self.block_size - offset, len(times))
+            lo, hi = self._blocks[-1]
+            self._blocks[-1] = [min(lo, int(times[:pos].min())), max(hi, int(times[:pos].max()))]
+        for i in range(pos, len(times), self.block_size):
+            block = times[i:i + self.block_size]
+            self._blocks.append([int(block.min()), int(block.max())])
+        self._count += len(records)
+
+    def flush(self):
+        """
+        Writes all appended ticks and the index to disk.
+        """
+        self._file.flush()
+        self._write_index()
+
+    def close(self):
+        """
+        Flushes the writer and closes the file.
+        """
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def _write_index(self):
+        """
+        Rewrites the index sidecar with the current names and block ranges.
+        """
+        tmp = _index_path(self.path) + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"count": self._count, "names": self._names, "blocks": self._blocks}, f)
+        os.replace(tmp, _index_path(self.path))
+
+
+class TickReader:
+    """
+    A class to read a binary tick file written by TickWriter without copying it.
+
+    The records are memory-mapped and exposed as a NumPy structured array with fields
+    "asset", "time" (int64 nanoseconds since 1970-01-01) and "price".
+
+    Attributes:
+        records (numpy.ndarray): A read-only view of all records in the file.
+        names (list[str]): The asset names that the records' asset fields refer to.
+        blocks (numpy.ndarray): The (earliest, latest) timestamp of each block of records.
+        block_size (int): The number of records per block.
+    """
+
+    def __init__(self, path: str):
+        """
+        Opens a tick file for reading.
+
+        Args:
+            path (str): The path of the tick file.
+
+        Raises:
+            ValueError: If the file is not a tick file.
+        """
+        with open(path, "rb") as f:
+            header = f.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE:
+            raise ValueError(f"{path} is not a tick file.")
+        magic, version, self.block_size = _HEADER.unpack(header)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{path} is not a tick file.")
+        with open(_index_path(path)) as f:
+            index = json.load(f)
+        self.names = index["names"]
+        self.blocks = np.array(index["blocks"], dtype=np.int64).reshape(-1, 2)
+
+        # Only map the records covered by the index, in case a writer is mid-append
+        count = index["count"]
+        if count == 0:
+            self.records = np.empty(0, dtype=TICK_DTYPE)
+        else:
+            self.records = np.memmap(path, dtype=TICK_DTYPE, mode="r", offset=HEADER_SIZE, shape=(count,))
+
+    def __len__(self):
+        """Return the number of records in the file.
+
+        Returns:
+            int: the number of records.
+        """
+        return len(self.records)
+
+    def iter_blocks(self, start: datetime = None, end: datetime = None):
+        """
+        Yields the blocks of records whose time range overlaps [start, end].
+
+        Each block is a view into the mapped file. Blocks that only partly overlap the
+        range are yielded whole, so callers should still filter by time.
+
+        Args:
+            start (datetime, optional): The start of the time range (inclusive).
+            end (datetime, optional): The end of the time range (inclusive).
+
+        Yields:
+            numpy.ndarray: The records of one overlapping block.
+        """
+        lo = None if start is None else to_ns(start)
+        hi = None if end is None else to_ns(end)
+        for i, (first, last) in enumerate(self.blocks):
+            if (lo is not None and last < lo) or (hi is not None and first > hi):
+                continue
+            yield self.records[i * self.block_size:(i + 1) * self.block_size]
+
+    def read(self, start: datetime = None, end: datetime = None):
+        """
+        Returns the records with timestamps in [start, end], skipping irrelevant blocks.
+
+        Without a range this returns the memory-mapped records themselves.
+
+        Args:
+            start (datetime, optional): The start of the time range (inclusive).
+            end (datetime, optional): The end of the time range (inclusive).
+
+        Returns:
+            numpy.ndarray: The matching records, in file order.
+        """
+        if start is None and end is None:
+            return self.records
+        parts = [select_range(block, start, end) for block in self.iter_blocks(start, end)]
+        if not parts:
+            return np.empty(0, dtype=TICK_DTYPE)
+        return np.concatenate(parts)
+
+
+def select_range(records, start: datetime = None, end: datetime = None):
+    """
+    Selects the records with timestamps in [start, end].
+
+    Args:
+        records (numpy.ndarray): Records with dtype TICK_DTYPE.
+        start (datetime, optional): The start of the time range (inclusive).
+        end (datetime, optional): The end of the time range (inclusive).
+
+    Returns:
+        numpy.ndarray: The selected records, in their original order.
+    """
+    mask = np.ones(len(records), dtype=bool)
+    if start is not None:
+        mask &= records["time"] >= to_ns(start)
+    if end is not None:
+        mask &= records["time"] <= to_ns(end)
+    return records if mask.all() else records[mask]
@@ -0,0 +1,114 @@
+from IndexedHeap import IndexedMinHeap, IndexedMaxHeap
+
+
+class TopK:
+    """
+    A class to keep the K largest (or smallest) items of a stream, in O(K) memory.
+
+    The kept items sit in a heap ordered the opposite way, so its root is the worst item
+    kept: the smallest of the K largest. Each new item is compared with the root and, if
+    it is better, replaces it in O(log K). A stream of n items therefore costs O(n log K)
+    time, and items that are not better than the root cost one comparison. Among items
+    with equal keys, the ones that arrived first are kept: the heap ranks each item by its
+    key and its arrival number, so the latest of the worst kept items is at the root.
+
+    For example, the top-K movers of a market can be found by pushing (name, change)
+    pairs with `key=lambda pair: abs(pair[1])`.
+    """
+
+    def __init__(self, k: int, key=None, largest: bool = True):
+        """
+        Initializes an empty top-K.
+
+        Args:
+            k (int): The number of items to keep.
+            key (callable, optional): A function of one argument that maps each item to
+                the value that is compared. Defaults to None, which compares the items.
+            largest (bool): Whether to keep the largest items, or else the smallest.
+                Defaults to True.
+
+        Raises:
+            ValueError: If `k` is negative.
+        """
+        if k < 0:
+            raise ValueError("k must not be negative.")
+        # The heap keeps the worst kept item at its root
+        self._heap = IndexedMinHeap() if largest else IndexedMaxHeap()
+        self._k = k
+        self._key = key
+        self._largest = largest
+        self._seq = 0  # Arrival number of the next item, to order ties
+        # Ties rank later arrivals as worse: lower in a min-heap, higher in a max-heap
+        self._tie = -1 if largest else 1
+
+    def __len__(self):
+        """Return the number of items kept.
+
+        Returns:
+            int: the number of items, at most K.
+        """
+        return len(self._heap)
+
+    def push(self, item) -> bool:
+        """
+        Offers one item.
+
+        Args:
+            item (Any): The item.
+
+        Returns:
+            bool: Whether the item is now among the kept items.
+        """
+        return self.extend((item,)) == 1
+
+    def extend(self, items) -> int:
+        """
+        Offers every item of an iterable, consuming it lazily.
+
+        Args:
+            items (Iterable): The items.
+
+        Returns:
+            int: The number of items that entered the kept items.
+        """
+        heap, k, key, largest, tie = self._heap, self._k, self._key, self._largest, self._tie
+        seq = self._seq
+        accepted = 0
+        it = iter(items)
+        # Fill the heap up to K items
+        while len(heap) < k:
+            item = next(it, it)
+            if item is it:
+                self._seq = seq
+                return accepted
+            heap.insert((item if key is None else key(item), tie * seq), item)
+            seq += 1
+            accepted += 1
+        if k == 0:
+            return accepted
+        # Then only items better than the worst kept one get in
+        root = heap.root
+        worst = root.key[0]
+        for item in it:
+            rank = item if key is None else key(item)
+            # An equal key arrived later than every kept item, so it never gets in
+            if worst < rank if largest else rank < worst:
+                root.value = item
+                heap.update_key(root, (rank, tie * seq))
+                root = heap.root
+                worst = root.key[0]
+                accepted += 1
+            seq += 1
+        self._seq = seq
+        return accepted
+
+    def items(self) -> list:
+        """
+        Returns the kept items, best first.
+
+        Returns:
+            list: The kept items, from the largest key down (or from the smallest up when
+                keeping the smallest), with ties in arrival order.
+        """
+        entries = sorted(self._heap._entries, key=lambda entry: entry.key, reverse=self._largest)
+        return [entry.value for entry in entries]
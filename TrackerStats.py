@@ -0,0 +1,186 @@
+from array import array
+from math import ceil
+
+# Number of bits of each value kept by a LatencyHistogram bucket. With 4 bits every
+# power of two is split into 16 buckets, so a bucket is at most 1/16 (6.25%) wide.
+SUB_BUCKET_BITS = 4
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+# The phases of PriceTracker.add_price that are timed separately: expiring old prices
+# from the rolling window, inserting the new price into the min and max heaps, and
+# recording the data point in the AVL tree
+PHASES = ("expire", "heap", "tree")
+
+
+def _bucket_index(value: int) -> int:
+    """
+    Returns the histogram bucket that holds a value.
+
+    Values below 2 * 16 get a bucket each. Larger values keep their 5 highest bits, and the
+    buckets of each power of two follow those of the previous one.
+
+    Args:
+        value (int): A non-negative value.
+
+    Returns:
+        int: The index of the bucket.
+    """
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    if shift <= 0:
+        return value
+    return (shift << SUB_BUCKET_BITS) + (value >> shift)
+
+
+def _bucket_upper(index: int) -> int:
+    """
+    Returns the largest value held by a histogram bucket.
+
+    Args:
+        index (int): The index of the bucket.
+
+    Returns:
+        int: The largest value that `_bucket_index()` maps to this bucket.
+    """
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    if shift <= 0:
+        return index
+    mantissa = index - (shift << SUB_BUCKET_BITS)
+    return ((mantissa + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """
+    A class to record latencies in logarithmic buckets, in the style of HdrHistogram.
+
+    Each power of two is split into 16 equal buckets, so recording is O(1), memory grows
+    only with the logarithm of the largest value, and percentiles are reported with at
+    most 6.25% relative error. The count, sum, minimum and maximum are exact.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty histogram.
+        """
+        self._counts = array("q")
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def __len__(self):
+        """Return the number of recorded values.
+
+        Returns:
+            int: the number of values.
+        """
+        return self.count
+
+    def record(self, value: int):
+        """
+        Records one value, e.g. a latency in nanoseconds.
+
+        Args:
+            value (int): The non-negative value to record.
+        """
+        index = _bucket_index(value)
+        counts = self._counts
+        if index >= len(counts):
+            counts.extend([0] * (index + 1 - len(counts)))
+        counts[index] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other: 'LatencyHistogram'):
+        """
+        Adds the values recorded by another histogram to this one.
+
+        Args:
+            other (LatencyHistogram): The histogram to merge.
+        """
+        if other.count == 0:
+            return
+        counts = self._counts
+        if len(other._counts) > len(counts):
+            counts.extend([0] * (len(other._counts) - len(counts)))
+        for index, n in enumerate(other._counts):
+            counts[index] += n
+        self.count += other.count
+        self.total += other.total
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def percentile(self, p: float) -> int:
+        """
+        Returns the value at a percentile by the nearest-rank method.
+
+        The value is the upper bound of the bucket holding that rank, capped at the maximum.
+
+        Args:
+            p (float): The percentile, between 0 and 100.
+
+        Returns:
+            int: The value at the percentile, or None if nothing was recorded.
+        """
+        if self.count == 0:
+            return None
+        # Round before taking the ceiling so float error cannot push the rank up by one
+        rank = max(1, ceil(round(p * self.count / 100, 6)))
+        seen = 0
+        for index, n in enumerate(self._counts):
+            seen += n
+            if seen >= rank:
+                return min(_bucket_upper(index), self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        """
+        Summarizes the recorded values.
+
+        Returns:
+            dict: The "count", "mean", "min", "max" and the "p50", "p90", "p99" and
+                "p99.9" percentiles. All but the count are None if nothing was recorded.
+        """
+        result = {"count": self.count,
+                  "mean": self.total / self.count if self.count else None,
+                  "min": self.min,
+                  "max": self.max}
+        for p in PERCENTILES:
+            result[f"p{p:g}"] = self.percentile(p)
+        return result
+
+
+class TrackerStats:
+    """
+    A class to hold the counters and latency histograms of an instrumented PriceTracker.
+
+    Attributes:
+        ticks (int): The number of prices added.
+        expired (int): The number of prices that left the rolling window.
+        latency (dict[str, LatencyHistogram]): The nanoseconds spent in each phase of
+            `PriceTracker.add_price`, keyed by the names in PHASES.
+    """
+
+    def __init__(self):
+        """
+        Initializes empty statistics.
+        """
+        self.ticks = 0
+        self.expired = 0
+        self.latency = {phase: LatencyHistogram() for phase in PHASES}
+
+    def merge(self, other: 'TrackerStats'):
+        """
+        Adds the counters and histograms of another TrackerStats to this one.
+
+        Args:
+            other (TrackerStats): The statistics to merge.
+        """
+        self.ticks += other.ticks
+        self.expired += other.expired
+        for phase, histogram in other.latency.items():
+            self.latency[phase].merge(histogram)
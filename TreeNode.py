@@ -12,6 +12,8 @@ class TreeNode(Node):
         parent (TreeNode): Reference to the parent node.
     """
 
+    __slots__ = ("_key", "_value", "_left", "_right", "_parent")
+
     def __init__(self, key=None, value =None ):
         """
         Initializes a TreeNode with optional key and value, and no children or parent.
@@ -157,6 +159,31 @@ class TreeNode(Node):
             return 1+self._parent.depth
 
 
+    def _set_left(self, node):
+        """
+        Links a left child without the checks of the `left` setter, for heap algorithms.
+
+        The caller is responsible for `node` being a TreeNode or None, and for
+        unlinking it from any previous parent and the previous left child from self.
+
+        Args:
+            node (TreeNode): The new left child node.
+        """
+        self._left = node
+        if node is not None:
+            node._parent = self
+
+    def _set_right(self, node):
+        """
+        Links a right child without the checks of the `right` setter, for heap algorithms.
+
+        Args:
+            node (TreeNode): The new right child node.
+        """
+        self._right = node
+        if node is not None:
+            node._parent = self
+
     def remove_leaf(self, n):
         """
         Removes a node from the tree if it is a leaf and a direct child of the current node.
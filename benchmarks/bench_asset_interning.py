@@ -0,0 +1,64 @@
+"""Measures per-asset memory and per-tick dispatch cost of MarketTracker.
+
+The dispatch benchmark replaces PriceTracker.add_price with a no-op, so the
+numbers only cover the work MarketTracker itself does for each tick.
+
+Run from the repository root:
+    python benchmarks/bench_asset_interning.py
+"""
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import PriceTracker
+from MarketTracker import MarketTracker
+
+N_ASSETS = 100_000
+N_TICKS = 1_000_000
+
+
+def bench_memory():
+    names = [f"ASSET{i:06d}" for i in range(N_ASSETS)]
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    mt = MarketTracker()
+    for name in names:
+        mt.add_asset(name)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"memory per registered asset: {(after - before) / N_ASSETS:8.1f} bytes")
+
+
+def bench_dispatch():
+    PriceTracker.PriceTracker.add_price = lambda self, time, price: None
+    mt = MarketTracker()
+    names = [f"ASSET{i:06d}" for i in range(N_ASSETS)]
+    ids = [mt.add_asset(name) for name in names]
+    t = datetime(2025, 1, 1)
+    order = [i * 37 % N_ASSETS for i in range(N_TICKS)]
+    by_name = [names[i] for i in order]
+    by_id = [ids[i] for i in order]
+    # Give every asset its first price up front so the timings exclude tracker creation
+    for name in names:
+        mt.add_price(name, t, 1.0)
+
+    start = time.perf_counter()
+    for name in by_name:
+        mt.add_price(name, t, 1.0)
+    per_name = (time.perf_counter() - start) / N_TICKS * 1e9
+
+    start = time.perf_counter()
+    for asset_id in by_id:
+        mt.add_price_id(asset_id, t, 1.0)
+    per_id = (time.perf_counter() - start) / N_TICKS * 1e9
+    print(f"dispatch per tick, add_price:    {per_name:8.1f} ns")
+    print(f"dispatch per tick, add_price_id: {per_id:8.1f} ns")
+
+
+if __name__ == "__main__":
+    bench_memory()
+    bench_dispatch()
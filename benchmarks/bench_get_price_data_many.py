@@ -0,0 +1,59 @@
+"""Compares sequential get_price_data calls with get_price_data_many.
+
+get_price_data_many groups the requests by asset, so each tracker is looked up
+once, and answers them in this process.
+
+Run from the repository root:
+    python benchmarks/bench_get_price_data_many.py
+"""
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from MarketTracker import MarketTracker
+
+N_ASSETS = 1000
+N_POINTS = 200
+N_REQUESTS = 4000
+
+
+def build_market():
+    random.seed(1)
+    mt = MarketTracker()
+    for i in range(N_ASSETS):
+        asset_id = mt.add_asset(f"ASSET{i:04d}")
+        t = datetime(2025, 1, 1)
+        for j in range(N_POINTS):
+            t += timedelta(hours=random.uniform(0, 6))
+            mt.add_price_id(asset_id, t, random.uniform(1, 100))
+    return mt
+
+
+def make_requests():
+    random.seed(2)
+    requests = []
+    for i in range(N_REQUESTS):
+        start = datetime(2025, 1, 1) + timedelta(hours=random.uniform(0, 600))
+        requests.append((f"ASSET{random.randrange(N_ASSETS):04d}", start, start + timedelta(days=10)))
+    return requests
+
+
+def timed(f):
+    start = time.perf_counter()
+    result = f()
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    mt = build_market()
+    requests = make_requests()
+    print(f"{N_ASSETS} assets x {N_POINTS} points, {N_REQUESTS} requests")
+    base, expected = timed(lambda: [mt.get_price_data(*r) for r in requests])
+    print(f"sequential get_price_data loop: {base:7.3f} s")
+    elapsed, result = timed(lambda: mt.get_price_data_many(requests))
+    assert result == expected
+    print(f"get_price_data_many:            {elapsed:7.3f} s  ({base / elapsed:4.2f}x)")
@@ -0,0 +1,171 @@
+"""Compares the linked MinHeap, the array-backed IndexedMinHeap, PairingHeap and heapq.
+
+These workloads are timed:
+  * push/pop: N inserts followed by N extracts.
+  * sliding window: the PriceTracker pattern, where every tick inserts one
+    element and deletes the element inserted W ticks earlier by its handle.
+    heapq has no handles, so it is not part of this workload.
+  * arity: the sliding window on a min-heap and a max-heap together, as in
+    PriceTracker, for d-ary IndexedMinHeap/IndexedMaxHeap with d = 2, 4, 8
+    and for windows of 10 days of 30-minute and 1-minute ticks.
+  * lazy deletion: the min+max window with eager deletion and with tombstones
+    (compact_ratio), with expiries spread over every tick and in bursts, as
+    when a feed resumes after a gap and many old ticks leave the window at once.
+  * k-way merge: merging K sorted streams, as ReplayEngine does, by extracting
+    the smallest head and inserting the next element of its stream.
+  * meld: combining K shard heaps into one, by reinserting every element or,
+    for PairingHeap, with `meld`.
+
+Run from the repository root:
+    python benchmarks/bench_heaps.py
+"""
+import heapq
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from Heap import MinHeap
+from IndexedHeap import IndexedMinHeap, IndexedMaxHeap
+from PairingHeap import PairingHeap
+
+N = 100_000
+WINDOW = 480  # 10 days of 30-minute ticks
+SHARDS = 40
+
+
+def best_of(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def push_pop(make_heap, keys):
+    def run():
+        heap = make_heap()
+        for k in keys:
+            heap.insert(k, k)
+        for _ in keys:
+            heap.extract()
+    return run
+
+
+def push_pop_heapq(keys):
+    def run():
+        heap = []
+        for k in keys:
+            heapq.heappush(heap, (k, k))
+        for _ in keys:
+            heapq.heappop(heap)
+    return run
+
+
+def sliding_window(make_heap, keys):
+    def run():
+        heap = make_heap()
+        handles = []
+        for i, k in enumerate(keys):
+            if i >= WINDOW:
+                heap.delete_node(handles[i - WINDOW])
+            handles.append(heap.insert(k, k))
+            heap.root.value
+    return run
+
+
+def min_max_window(arity, keys, window, burst=1, compact_ratio=None):
+    def run():
+        lo = IndexedMinHeap(arity, compact_ratio=compact_ratio)
+        hi = IndexedMaxHeap(arity, compact_ratio=compact_ratio)
+        handles = []
+        oldest = 0
+        for i, k in enumerate(keys):
+            # Every `burst` ticks, expire everything older than the window
+            if i % burst == 0:
+                while oldest < i - window:
+                    a, b = handles[oldest]
+                    lo.delete_node(a)
+                    hi.delete_node(b)
+                    oldest += 1
+            handles.append((lo.insert(k, k), hi.insert(k, k)))
+            lo.root.value, hi.root.value
+    return run
+
+
+def k_way_merge(make_heap, streams):
+    def run():
+        heap = make_heap()
+        for ix, stream in enumerate(streams):
+            it = iter(stream)
+            heap.insert((next(it), ix), it)
+        while len(heap) > 0:
+            node = heap.extract()
+            nxt = next(node.value, None)
+            if nxt is not None:
+                heap.insert((nxt, node.key[1]), node.value)
+    return run
+
+
+def combine_shards(make_heap, shards, meld):
+    def run():
+        heaps = []
+        for shard in shards:
+            heap = make_heap()
+            for k in shard:
+                heap.insert(k, k)
+            heaps.append(heap)
+        start = time.perf_counter()
+        combined = heaps[0]
+        for heap in heaps[1:]:
+            if meld:
+                combined.meld(heap)
+            else:
+                while len(heap) > 0:
+                    node = heap.extract()
+                    combined.insert(node.key, node.value)
+        return time.perf_counter() - start
+    return run
+
+
+def main():
+    random.seed(0)
+    keys = [random.uniform(1, 100) for _ in range(N)]
+    print(f"push/pop, {N} elements (ns per insert+extract)")
+    for name, fn in (("MinHeap", push_pop(MinHeap, keys)),
+                     ("IndexedMinHeap", push_pop(IndexedMinHeap, keys)),
+                     ("heapq", push_pop_heapq(keys))):
+        print(f"  {name:16s} {best_of(fn) / N * 1e9:10.0f}")
+    print(f"sliding window, {N} ticks, window {WINDOW} (ns per tick)")
+    for name, fn in (("MinHeap", sliding_window(MinHeap, keys)),
+                     ("IndexedMinHeap", sliding_window(IndexedMinHeap, keys))):
+        print(f"  {name:16s} {best_of(fn) / N * 1e9:10.0f}")
+    for window in (WINDOW, 14_400):
+        print(f"min+max sliding window, {N} ticks, window {window} (ns per tick)")
+        for arity in (2, 4, 8):
+            print(f"  d={arity:<14d} {best_of(min_max_window(arity, keys, window)) / N * 1e9:10.0f}")
+    for burst in (1, 100):
+        print(f"lazy deletion, {N} ticks, window {WINDOW}, expiry every {burst} ticks (ns per tick)")
+        for ratio in (None, 0.25, 0.5):
+            fn = min_max_window(4, keys, WINDOW, burst, ratio)
+            print(f"  ratio={str(ratio):10s} {best_of(fn) / N * 1e9:10.0f}")
+    streams = [sorted(keys[i::SHARDS]) for i in range(SHARDS)]
+    print(f"k-way merge, {N} elements in {SHARDS} streams (ns per element)")
+    for name, make_heap in (("MinHeap", MinHeap), ("IndexedMinHeap", IndexedMinHeap),
+                            ("PairingHeap", PairingHeap)):
+        print(f"  {name:16s} {best_of(k_way_merge(make_heap, streams)) / N * 1e9:10.0f}")
+    shards = [keys[i::SHARDS] for i in range(SHARDS)]
+    print(f"combine {SHARDS} shard heaps of {N // SHARDS} elements (ms, excluding building the shards)")
+    for name, make_heap, meld in (("MinHeap", MinHeap, False),
+                                  ("IndexedMinHeap", IndexedMinHeap, False),
+                                  ("PairingHeap", PairingHeap, False),
+                                  ("PairingHeap.meld", PairingHeap, True)):
+        fn = combine_shards(make_heap, shards, meld)
+        print(f"  {name:16s} {min(fn() for _ in range(3)) * 1e3:10.3f}")
+
+
+if __name__ == "__main__":
+    main()
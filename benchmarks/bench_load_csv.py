@@ -0,0 +1,51 @@
+"""Measures MarketTracker.load_csv throughput.
+
+The parse-only run replaces the ingestion step with a no-op, to separate the
+cost of reading and parsing the file from the cost of PriceTracker.add_price.
+
+Run from the repository root:
+    python benchmarks/bench_load_csv.py
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from MarketTracker import MarketTracker
+
+N_ROWS = 1_000_000
+N_ASSETS = 1000
+
+
+def write_file(path):
+    random.seed(1)
+    t = datetime(2025, 1, 1)
+    with open(path, "w") as f:
+        f.write("name,time,price\n")
+        for i in range(N_ROWS):
+            t += timedelta(milliseconds=random.randint(1, 2000))
+            f.write(f"ASSET{random.randrange(N_ASSETS):04d},{t:%Y-%m-%d %H:%M:%S.%f},"
+                    f"{random.uniform(1, 100):.4f}\n")
+
+
+def run(path, parse_only):
+    mt = MarketTracker()
+    if parse_only:
+        mt._ingest = lambda names, times, prices, add_assets: None
+    start = time.perf_counter()
+    rows = mt.load_csv(path, add_assets=True)
+    elapsed = time.perf_counter() - start
+    label = "parse only" if parse_only else "parse + ingest"
+    print(f"{label:15s}: {rows / elapsed:12,.0f} rows/s ({elapsed:.2f} s)")
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "prices.csv")
+        write_file(path)
+        run(path, parse_only=True)
+        run(path, parse_only=False)
@@ -0,0 +1,83 @@
+"""Measures the memory per node and the throughput of the linked trees and heaps.
+
+For TreeNode (used by MinHeap) and AVLNode (used by AVLTree and PriceTracker):
+  * bytes per node: measured with tracemalloc, as in MemoryUsage.instance_size,
+    for a node with no key or value.
+  * AVLTree ops/s: N inserts of increasing keys (the PriceTracker pattern, which
+    rotates at every other insert), N inserts of random keys, then N deletes.
+  * MinHeap ops/s: N inserts followed by N extracts, which swap nodes with their
+    parents at every level.
+
+Run from the repository root:
+    python benchmarks/bench_nodes.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from AVLTree import AVLTree, AVLNode
+from Heap import MinHeap
+from MemoryUsage import instance_size
+from TreeNode import TreeNode
+
+N = 50_000
+
+
+def best_of(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def avl_inserts(keys):
+    def run():
+        tree = AVLTree()
+        for k in keys:
+            tree.insert(k, k)
+    return run
+
+
+def avl_deletes(keys):
+    def run():
+        tree = AVLTree()
+        for k in keys:
+            tree.insert(k, k)
+        start = time.perf_counter()
+        for k in keys:
+            tree.delete(k)
+        return time.perf_counter() - start
+    return run
+
+
+def heap_push_pop(keys):
+    def run():
+        heap = MinHeap()
+        for k in keys:
+            heap.insert(k, k)
+        for _ in keys:
+            heap.extract()
+    return run
+
+
+def main():
+    random.seed(0)
+    random_keys = random.sample(range(10 * N), N)
+    print("bytes per node")
+    for cls in (TreeNode, AVLNode):
+        print(f"  {cls.__name__:24s} {instance_size(cls):10.1f}")
+    print(f"ops/s, {N} keys")
+    print(f"  {'AVLTree increasing insert':24s} {N / best_of(avl_inserts(range(N))):10.0f}")
+    print(f"  {'AVLTree random insert':24s} {N / best_of(avl_inserts(random_keys)):10.0f}")
+    deletes = avl_deletes(random_keys)
+    print(f"  {'AVLTree random delete':24s} {N / min(deletes() for _ in range(3)):10.0f}")
+    print(f"  {'MinHeap insert+extract':24s} {2 * N / best_of(heap_push_pop(random_keys)):10.0f}")
+
+
+if __name__ == "__main__":
+    main()
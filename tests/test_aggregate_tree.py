@@ -0,0 +1,84 @@
+import pytest
+import random
+from AggregateAVLTree import AggregateAVLTree, EMPTY
+from MarketTracker import MarketTracker
+from PriceTracker import PriceTracker
+from datetime import datetime, timedelta
+from test_slotted_nodes import check_avl
+
+START = datetime(2025, 4, 1)
+
+def check_aggregates(node):
+    if node is None:
+        return []
+    weights = check_aggregates(node._left) + [node._weight] + check_aggregates(node._right)
+    assert node._count == len(weights)
+    assert node._sum == pytest.approx(sum(weights))
+    assert node._min == min(weights) and node._max == max(weights)
+    return weights
+
+def brute(items, low, high):
+    ws = [w for k, w in items.items() if low <= k <= high]
+    return (len(ws), sum(ws), min(ws, default=None), max(ws, default=None))
+
+def test_aggregates_survive_inserts_deletes_and_updates():
+    random.seed(1)
+    tree, items = AggregateAVLTree(), {}
+    for _ in range(600):
+        k = random.randrange(400)
+        if k in items and random.random() < 0.4:
+            tree.delete(k)
+            del items[k]
+        else:
+            items[k] = random.randint(-50, 50)
+            tree.insert(k, items[k])
+    check_avl(tree.root)
+    check_aggregates(tree.root)
+    for _ in range(200):
+        low, high = sorted(random.sample(range(-5, 405), 2))
+        agg = tree.aggregate(low, high)
+        count, total, lo, hi = brute(items, low, high)
+        assert (agg.count, agg.total, agg.min, agg.max) == (count, total, lo, hi)
+    assert tree.aggregate(500, 600) == EMPTY
+
+def test_measure_and_bulk_load():
+    items = [(k, (float(k % 17), "x")) for k in range(300)]
+    tree = AggregateAVLTree.from_sorted(items[:100], measure=lambda v: v[0])
+    tree.extend_sorted(items[100:])
+    check_avl(tree.root)
+    check_aggregates(tree.root)
+    agg = tree.aggregate(50, 249)
+    assert agg.count == 200 and agg.total == sum(k % 17 for k in range(50, 250))
+    assert (agg.min, agg.max) == (0.0, 16.0)
+
+def test_price_stats_any_interval():
+    random.seed(2)
+    pt = PriceTracker()
+    points = [(START + timedelta(hours=3 * i), random.uniform(1, 100)) for i in range(800)]
+    for t, p in points:
+        pt.add_price(t, p)
+    pt.correct_price(points[-3][0], 500.0)
+    points[-3] = (points[-3][0], 500.0)
+    for _ in range(30):
+        a, b = sorted(random.sample(range(800), 2))
+        prices = [p for _, p in points[a:b + 1]]
+        low, high, avg = pt.price_stats(points[a][0], points[b][0])
+        assert (low, high) == (min(prices), max(prices)) and avg == pytest.approx(sum(prices) / len(prices))
+    assert pt.price_stats(START - timedelta(days=2), START - timedelta(days=1)) is None
+    restored = PriceTracker.from_bytes(pt.to_bytes())
+    assert restored.price_stats(START, points[-1][0]) == pytest.approx(pt.price_stats(START, points[-1][0]))
+
+def test_market_window_stats():
+    mt = MarketTracker()
+    mt.add_asset("A")
+    data = [(float(10 + i % 9), START + timedelta(days=i)) for i in range(40)]
+    for price, t in data:
+        mt.add_price("A", t, price)
+    now = START + timedelta(days=30, hours=12)
+    lo, hi, avg = mt.window_stats("A", now)
+    assert (lo, hi) == (mt.calculate_min(data, now), mt.calculate_max(data, now))
+    assert avg == pytest.approx(mt.calculate_avg(data, now))
+    assert mt.window_stats("A", START - timedelta(days=20)) is None
+    assert mt.price_stats("A", START, START + timedelta(days=8)) == (10.0, 18.0, 14.0)
+    with pytest.raises(KeyError):
+        mt.window_stats("Z", now)
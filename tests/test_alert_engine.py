@@ -0,0 +1,127 @@
+import pytest
+from MarketTracker import MarketTracker
+from AlertEngine import AlertEngine
+from datetime import datetime, timedelta
+import random
+
+class Recorder:
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, alerts):
+        self.batches.append(alerts)
+
+    @property
+    def alerts(self):
+        return [a for batch in self.batches for a in batch]
+
+@pytest.fixture
+def market():
+    mt = MarketTracker()
+    mt.add_asset("A")
+    mt.add_asset("B")
+    return mt
+
+def feed(mt, name, prices, start=datetime(2025, 4, 1)):
+    for i, p in enumerate(prices):
+        mt.add_price(name, start + timedelta(hours=i), p)
+
+def test_cross_above_and_below(market):
+    rec = Recorder()
+    up = market.add_alert("A", "above", rec, level=10.0)
+    down = market.add_alert("A", "below", rec, level=8.0)
+    feed(market, "A", [9.0, 10.0, 11.0, 10.0, 9.5, 12.0, 7.0, 8.0, 8.0])
+    fired = [(a.rule_id, a.price) for a in rec.alerts]
+    assert fired == [(up, 10.0), (up, 12.0), (down, 7.0)]
+
+def test_level_equal_to_old_price_does_not_fire(market):
+    rec = Recorder()
+    market.add_alert("A", "above", rec, level=10.0)
+    feed(market, "A", [10.0, 11.0])
+    assert rec.alerts == []
+
+def test_first_price_never_fires(market):
+    rec = Recorder()
+    market.add_alert("A", "above", rec, level=1.0)
+    market.add_alert("A", "new_high", rec)
+    feed(market, "A", [5.0])
+    assert rec.alerts == []
+
+def test_batches_per_callback(market):
+    rec1, rec2 = Recorder(), Recorder()
+    for level in [1.5, 2.5, 3.5]:
+        market.add_alert("A", "above", rec1, level=level)
+    market.add_alert("A", "above", rec2, level=2.0)
+    market.add_alert("B", "above", rec2, level=2.0)
+    feed(market, "A", [1.0, 4.0])
+    feed(market, "B", [1.0, 4.0])
+    assert [[a.level for a in b] for b in rec1.batches] == [[1.5, 2.5, 3.5]]
+    assert [[a.name for a in b] for b in rec2.batches] == [["A"], ["B"]]
+
+class UnhashableRecorder(Recorder):
+    __hash__ = None
+
+def test_failing_callback_does_not_drop_other_batches(market):
+    rec = UnhashableRecorder()
+
+    def fail(alerts):
+        raise RuntimeError("callback failed")
+
+    market.add_alert("A", "above", fail, level=2.0)
+    market.add_alert("A", "above", rec, level=3.0)
+    market.add_alert("A", "above", rec, level=3.5)
+    feed(market, "A", [1.0])
+    with pytest.raises(RuntimeError, match="callback failed"):
+        feed(market, "A", [4.0], start=datetime(2025, 4, 2))
+    assert [[a.level for a in b] for b in rec.batches] == [[3.0, 3.5]]
+    assert market.latest("A")[1][0] == 4.0
+
+def test_breakouts(market):
+    rec = Recorder()
+    high = market.add_alert("A", "new_high", rec)
+    low = market.add_alert("A", "new_low", rec)
+    feed(market, "A", [5.0, 6.0, 6.0, 4.0, 5.5, 7.0])
+    assert [(a.rule_id, a.price) for a in rec.alerts] == [(high, 6.0), (low, 4.0), (high, 7.0)]
+    assert all(a.level is None for a in rec.alerts)
+
+def test_remove_alert(market):
+    rec = Recorder()
+    r1 = market.add_alert("A", "above", rec, level=2.0)
+    r2 = market.add_alert("A", "above", rec, level=2.0)
+    market.remove_alert(r1)
+    feed(market, "A", [1.0, 3.0])
+    assert [a.rule_id for a in rec.alerts] == [r2]
+    market.remove_alert(r2)
+    assert len(market._alerts) == 0
+    assert not market._alerts.watches(market.asset_id("A"))
+    with pytest.raises(KeyError):
+        market.remove_alert(r2)
+
+def test_invalid_rules(market):
+    with pytest.raises(ValueError):
+        market.add_alert("A", "sideways", print, level=1.0)
+    with pytest.raises(ValueError):
+        market.add_alert("A", "above", print)
+    with pytest.raises(KeyError):
+        market.add_alert("C", "above", print, level=1.0)
+
+def test_matches_brute_force():
+    random.seed(8)
+    engine = AlertEngine()
+    rec = Recorder()
+    levels = {}
+    for i in range(500):
+        kind = random.choice(["above", "below"])
+        level = round(random.uniform(0, 100), 1)
+        levels[engine.add_rule(0, "X", kind, level, rec)] = (kind, level)
+    prices = [random.uniform(0, 100) for i in range(300)]
+    expected = []
+    for i in range(1, len(prices)):
+        old, new = prices[i-1], prices[i]
+        engine.on_tick(0, datetime(2025, 4, 1), new, (None, (old, 0.0, 1000.0, 0.0)))
+        expected += sorted(r for r, (kind, level) in levels.items()
+                           if (kind == "above" and old < level <= new)
+                           or (kind == "below" and new <= level < old))
+    engine.flush()
+    assert sorted(a.rule_id for a in rec.alerts) == sorted(expected)
+    assert len(rec.alerts) == len(expected)
@@ -0,0 +1,46 @@
+import pytest
+import random
+from AVLTree import AVLTree
+from BST import range_query
+from test_slotted_nodes import check_avl
+
+@pytest.mark.parametrize("n", [0, 1, 2, 7, 100, 1023])
+def test_from_sorted(n):
+    items = [(k, str(k)) for k in range(0, 3 * n, 3)]
+    tree = AVLTree.from_sorted(iter(items))
+    assert len(tree) == n
+    check_avl(tree.root)
+    if n:
+        assert tree.height == n.bit_length()  # Perfectly balanced
+    assert range_query(tree, -1, 3 * n) == items
+    tree.insert(1, "one")
+    check_avl(tree.root)
+
+def test_from_sorted_rejects_unsorted():
+    with pytest.raises(ValueError):
+        AVLTree.from_sorted([(1, None), (3, None), (2, None)])
+    with pytest.raises(ValueError):
+        AVLTree.from_sorted([(1, None), (1, None)])
+
+@pytest.mark.parametrize("sizes", [(0, 5), (5, 0), (1, 1), (1000, 1), (1000, 3), (3, 1000),
+                                   (64, 63), (100, 40), (40, 100)])
+def test_extend_sorted(sizes):
+    n, k = sizes
+    tree = AVLTree.from_sorted((i, i) for i in range(n))
+    tree.extend_sorted((i, i) for i in range(n, n + k))
+    assert len(tree) == n + k
+    check_avl(tree.root)
+    assert [key for key, _ in range_query(tree, 0, n + k)] == list(range(n + k))
+
+def test_extend_sorted_in_batches():
+    random.seed(3)
+    tree, keys = AVLTree(), []
+    for _ in range(60):
+        batch = list(range(len(keys), len(keys) + random.randint(0, 40)))
+        tree.extend_sorted((k, -k) for k in batch)
+        keys.extend(batch)
+        check_avl(tree.root)
+    assert range_query(tree, 0, len(keys)) == [(k, -k) for k in keys]
+    with pytest.raises(ValueError):
+        tree.extend_sorted([(len(keys) - 1, None)])
+    assert len(tree) == len(keys)
@@ -0,0 +1,53 @@
+import random
+from AVLTree import AVLTree
+from BST import range_query
+
+def make_tree(keys):
+    tree = AVLTree()
+    for k in keys:
+        tree.insert(k, str(k))
+    return tree
+
+def test_walk_both_ways():
+    random.seed(1)
+    keys = random.sample(range(0, 2000, 2), 300)
+    tree = make_tree(keys)
+    cursor = tree.cursor()
+    assert cursor.peek() is None and cursor.next() is None and cursor.prev() is None
+    assert cursor.seek_first()
+    forward = [cursor.peek()]
+    while (item := cursor.next()) is not None:
+        forward.append(item)
+    assert forward == [(k, str(k)) for k in sorted(keys)]
+    assert cursor.peek() is None
+    assert cursor.seek_last()
+    backward = [cursor.peek()]
+    while (item := cursor.prev()) is not None:
+        backward.append(item)
+    assert backward == forward[::-1]
+
+def test_seek_bounds():
+    tree = make_tree(range(0, 100, 10))
+    cursor = tree.cursor()
+    assert cursor.seek(35) and cursor.peek() == (40, "40")
+    assert cursor.seek(40) and cursor.peek() == (40, "40")
+    assert cursor.prev() == (30, "30")
+    assert not cursor.seek(91) and cursor.peek() is None
+    assert cursor.seek_floor(35) and cursor.peek() == (30, "30")
+    assert cursor.next() == (40, "40")
+    assert not cursor.seek_floor(-1)
+    empty = AVLTree().cursor()
+    assert not empty.seek(0) and not empty.seek_first() and not empty.seek_last()
+
+def test_iter_to_matches_range_query():
+    random.seed(2)
+    keys = random.sample(range(1000), 400)
+    tree = make_tree(keys)
+    cursor = tree.cursor()
+    for _ in range(50):
+        low, high = sorted(random.sample(range(-10, 1010), 2))
+        cursor.seek(low)
+        assert list(cursor.iter_to(high)) == range_query(tree, low, high)
+        # The cursor stops on the first key past the range
+        after = [k for k in sorted(keys) if k > high]
+        assert cursor.peek() == (None if not after else (after[0], str(after[0])))
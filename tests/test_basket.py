@@ -0,0 +1,80 @@
+import pytest
+from MarketTracker import MarketTracker
+from Basket import Basket
+import Basket as basket_module
+from datetime import datetime, timedelta
+import random
+
+WEIGHTS = {"A": 0.5, "B": 2.0, "C": 1.0}
+
+@pytest.fixture
+def market():
+    mt = MarketTracker()
+    for name in ["A", "B", "C", "D"]:
+        mt.add_asset(name)
+    return mt
+
+def test_value_available_once_complete(market):
+    market.add_basket("IDX", WEIGHTS)
+    t = datetime(2025, 4, 1)
+    market.add_price("A", t, 10.0)
+    market.add_price("B", t + timedelta(hours=1), 1.0)
+    assert market.basket_value("IDX") is None
+    market.add_price("C", t + timedelta(hours=2), 3.0)
+    assert market.basket_value("IDX") == pytest.approx(10.0)
+    market.add_price("B", t + timedelta(hours=3), 2.0)
+    assert market.basket_value("IDX") == pytest.approx(12.0)
+    data = market.get_basket_data("IDX", t, t + timedelta(days=1))
+    assert [(time, dp[0]) for (time, dp) in data] == [(t + timedelta(hours=2), pytest.approx(10.0)),
+                                                     (t + timedelta(hours=3), pytest.approx(12.0))]
+    assert data[-1][1][1:3] == (pytest.approx(10.0), pytest.approx(12.0))
+
+def test_seeded_from_existing_prices(market):
+    t = datetime(2025, 4, 1)
+    for name, p in [("A", 2.0), ("B", 3.0), ("C", 4.0)]:
+        market.add_price(name, t, p)
+    market.add_basket("IDX", WEIGHTS)
+    assert market.basket_value("IDX") == pytest.approx(11.0)
+    assert market.get_basket_data("IDX", t, t + timedelta(days=1)) == []
+
+def test_matches_full_recompute(market, monkeypatch):
+    monkeypatch.setattr(basket_module, "RESYNC_EVERY", 50)
+    market.add_basket("IDX", WEIGHTS)
+    random.seed(6)
+    last = {}
+    t = datetime(2025, 4, 1)
+    for i in range(1000):
+        name = random.choice(["A", "B", "C", "D"])
+        t += timedelta(minutes=random.randint(0, 30))
+        p = random.uniform(1, 100)
+        market.add_price(name, t, p)
+        last[name] = p
+        if all(n in last for n in WEIGHTS):
+            expected = sum(w * last[n] for n, w in WEIGHTS.items())
+            assert market.basket_value("IDX") == pytest.approx(expected, rel=1e-12)
+
+def test_same_timestamp_replaces_recorded_value(market):
+    market.add_basket("IDX", {"A": 1.0, "B": 1.0})
+    t = datetime(2025, 4, 1)
+    market.add_price("A", t, 1.0)
+    market.add_price("B", t, 1.0)
+    market.add_price("A", t, 2.0)
+    assert market.basket_value("IDX") == 3.0
+    assert market.get_basket_data("IDX", t, t) == [(t, (3.0, 3.0, 3.0, 3.0))]
+    market.add_price("B", t + timedelta(hours=1), 0.5)
+    market.add_price("A", t + timedelta(hours=1), 4.0)
+    assert market.get_basket_data("IDX", t, t + timedelta(hours=1))[-1] == \
+        (t + timedelta(hours=1), (4.5, 3.0, 4.5, 3.75))
+
+def test_errors(market):
+    market.add_basket("IDX", WEIGHTS)
+    with pytest.raises(ValueError):
+        market.add_basket("IDX", WEIGHTS)
+    with pytest.raises(ValueError):
+        market.add_basket("EMPTY", {})
+    with pytest.raises(KeyError):
+        market.add_basket("BAD", {"A": 1.0, "Z": 1.0})
+    with pytest.raises(KeyError):
+        market.basket_value("NOPE")
+    with pytest.raises(KeyError):
+        Basket("X", {"A": 1.0}).update("B", datetime(2025, 4, 1), 1.0)
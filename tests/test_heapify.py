@@ -0,0 +1,43 @@
+import pytest
+import random
+from Heap import MinHeap
+from test_lab_8 import check_heap
+
+@pytest.mark.parametrize("existing", [0, 1, 2, 25])
+def test_heapify_linked(existing):
+    random.seed(existing)
+    h = MinHeap()
+    for _ in range(existing):
+        h.insert(random.randint(0, 50))
+    pairs = [(random.randint(0, 50), i) for i in range(100)]
+    nodes = h.heapify(pairs)
+    check_heap(h)
+    assert [(n.key, n.value) for n in nodes] == pairs
+    assert len(h) == existing + 100
+    for n in nodes[::4]:
+        h.delete_node(n)
+    check_heap(h)
+    keys = [h.extract().key for _ in range(len(h))]
+    assert keys == sorted(keys)
+
+def test_heapify_small():
+    h, nodes = MinHeap.from_iterable([])
+    assert h.root is None and nodes == []
+    h, nodes = MinHeap.from_iterable([(2, "b")])
+    assert h.root is nodes[0]
+    h, nodes = MinHeap.from_iterable([(2, "b"), (1, "a")])
+    check_heap(h)
+    assert h.root is nodes[1]
+
+def test_iter_sorted_is_non_destructive():
+    random.seed(12)
+    keys = [random.randint(0, 40) for _ in range(200)]
+    heap, nodes = MinHeap.from_iterable((k, i) for i, k in enumerate(keys))
+    first = heap.iter_sorted(15)
+    assert [n.key for n in first] == sorted(keys)[:15]
+    assert [n.key for n in heap.iter_sorted()] == sorted(keys)
+    check_heap(heap)
+    assert len(heap) == 200 and [heap.extract().key for _ in range(200)] == sorted(keys)
+    assert list(heap.iter_sorted()) == []
+    with pytest.raises(ValueError):
+        heap.iter_sorted(-1)
@@ -0,0 +1,216 @@
+import pytest
+import random
+from IndexedHeap import IndexedMinHeap, IndexedMaxHeap, HeapEntry
+from PriceTracker import PriceTracker
+from datetime import datetime, timedelta
+
+def check_heap(heap):
+    entries = heap._entries
+    for pos, entry in enumerate(entries):
+        assert entry._pos == pos
+        if pos:
+            assert not entry.key < entries[(pos - 1) // 2].key
+
+def test_insert_extract_sorted():
+    random.seed(1)
+    keys = [random.randint(0, 1000) for _ in range(500)]
+    heap = IndexedMinHeap()
+    assert heap.root is None
+    for k in keys:
+        heap.insert(k, str(k))
+    check_heap(heap)
+    assert len(heap) == 500
+    out = [heap.extract() for _ in range(500)]
+    assert [e.key for e in out] == sorted(keys)
+    assert all(e.value == str(e.key) for e in out)
+    assert len(heap) == 0 and heap.root is None
+    with pytest.raises(KeyError):
+        heap.extract()
+
+def test_delete_by_handle():
+    random.seed(2)
+    heap = IndexedMinHeap()
+    handles = [heap.insert(random.random()) for _ in range(300)]
+    random.shuffle(handles)
+    for i, h in enumerate(handles[:200]):
+        assert heap.delete_node(h) is h
+        if i % 20 == 0:
+            check_heap(heap)
+    check_heap(heap)
+    assert sorted(e.key for e in heap._entries) == sorted(h.key for h in handles[200:])
+    with pytest.raises(KeyError):
+        heap.delete_node(handles[0])  # Already deleted
+
+def test_sliding_window_matches_min():
+    random.seed(3)
+    heap = IndexedMinHeap()
+    window = []
+    for _ in range(2000):
+        window.append(heap.insert(random.uniform(0, 10)))
+        if len(window) > 50:
+            heap.delete_node(window.pop(0))
+        assert heap.root.key == min(e.key for e in window)
+
+def test_insert_node():
+    heap, other = IndexedMinHeap(), IndexedMinHeap()
+    entry = HeapEntry(3, "c")
+    assert heap.insert_node(entry) is entry
+    heap.insert(1)
+    with pytest.raises(ValueError):
+        other.insert_node(entry)
+    other.insert(0)
+    with pytest.raises(KeyError):
+        other.delete_node(entry)
+    heap.delete_node(entry)
+    other.insert_node(entry)
+    assert other.root.key == 0
+
+@pytest.mark.parametrize("existing", [0, 1, 37])
+def test_heapify(existing):
+    random.seed(existing)
+    heap = IndexedMinHeap()
+    for _ in range(existing):
+        heap.insert(random.randint(0, 50))
+    pairs = [(random.randint(0, 50), i) for i in range(200)]
+    handles = heap.heapify(pairs)
+    check_heap(heap)
+    assert [(h.key, h.value) for h in handles] == pairs
+    assert len(heap) == existing + 200
+    for h in handles[::3]:
+        heap.delete_node(h)
+    check_heap(heap)
+    assert heap.heapify([]) == []
+
+def test_from_iterable():
+    heap, handles = IndexedMinHeap.from_iterable((k, -k) for k in [5, 3, 9, 1])
+    assert [h.value for h in handles] == [-5, -3, -9, -1]
+    assert [heap.extract().key for _ in range(4)] == [1, 3, 5, 9]
+
+def check_order(heap, before):
+    entries = heap._entries
+    for pos, entry in enumerate(entries):
+        assert entry._pos == pos
+        if pos:
+            assert not before(entry._rank, entries[(pos - 1) // heap._arity]._rank)
+
+@pytest.mark.parametrize("arity", [2, 4, 8])
+def test_arity(arity):
+    random.seed(arity)
+    heap = IndexedMinHeap(arity)
+    handles = [heap.insert(random.randint(0, 1000)) for _ in range(400)]
+    for h in random.sample(handles, 100):
+        heap.delete_node(h)
+        handles.remove(h)
+    for h in random.sample(handles, 50):
+        heap.update_key(h, random.randint(-100, 1100))
+    check_order(heap, lambda a, b: a < b)
+    heap.heapify((k, None) for k in range(50))
+    check_order(heap, lambda a, b: a < b)
+    keys = [heap.extract().key for _ in range(len(heap))]
+    assert keys == sorted(keys)
+
+@pytest.mark.parametrize("arity", [2, 4, 8])
+def test_max_heap(arity):
+    random.seed(10 + arity)
+    heap = IndexedMaxHeap(arity)
+    window = []
+    for i in range(1000):
+        window.append(heap.insert(random.uniform(0, 10), i))
+        if len(window) > 60:
+            heap.delete_node(window.pop(random.randrange(len(window))))
+        if i % 7 == 0:
+            heap.update_key(window[0], random.uniform(0, 10))
+        assert heap.root.key == max(e.key for e in window)
+    check_order(heap, lambda a, b: a > b)
+
+def test_key_function():
+    words = ["pear", "fig", "banana", "kiwi", "apple"]
+    heap, handles = IndexedMinHeap.from_iterable(((w, i) for i, w in enumerate(words)), key=len)
+    assert heap.root.key == "fig"
+    heap.update_key(handles[0], "watermelon")
+    assert [heap.extract().key for _ in range(5)] == ["fig", "kiwi", "apple", "banana", "watermelon"]
+    heap = IndexedMaxHeap(key=lambda t: t[1])
+    for pair in [("a", 3), ("b", 9), ("c", 1)]:
+        heap.insert(pair)
+    assert heap.extract().key == ("b", 9)
+    assert heap.insert_node(HeapEntry(("d", 5))).key == ("d", 5)
+    assert heap.root.key == ("d", 5)
+
+def test_invalid_arity():
+    with pytest.raises(ValueError):
+        IndexedMinHeap(3)
+
+@pytest.mark.parametrize("heap_cls, best", [(IndexedMinHeap, min), (IndexedMaxHeap, max)])
+def test_lazy_deletion(heap_cls, best):
+    random.seed(20)
+    heap = heap_cls(4, compact_ratio=0.5)
+    window = []
+    for i in range(3000):
+        window.append(heap.insert(random.uniform(0, 10), i))
+        if i % 100 == 99:  # A burst of expiries
+            for _ in range(60):
+                heap.delete_node(window.pop(0))
+        assert len(heap) == len(window)
+        assert heap.root.key == best(e.key for e in window)
+        assert len(heap._dead) <= 0.5 * len(heap._entries)
+    assert not set(window) & heap._dead
+    keys = [heap.extract().key for _ in range(len(heap))]
+    assert keys == sorted((e.key for e in window), reverse=best is max)
+    assert heap.root is None and not heap._dead
+
+def test_lazy_tombstones():
+    heap = IndexedMinHeap(compact_ratio=0.6)
+    handles = [heap.insert(k) for k in range(10)]
+    for h in handles[4:8]:
+        heap.delete_node(h)
+    assert len(heap) == 6 and len(heap._entries) == 10  # Deleted in O(1), still stored
+    with pytest.raises(KeyError):
+        heap.delete_node(handles[5])
+    with pytest.raises(KeyError):
+        heap.update_key(handles[5], -1)
+    heap.delete_node(handles[0])
+    assert heap.root is handles[1]  # The tombstoned root was discarded when it surfaced
+    assert handles[0]._pos == -1 and len(heap._entries) == 9
+    heap.update_key(handles[9], 0)
+    heap.delete_node(handles[1])
+    heap.delete_node(handles[2])  # 6 tombstones in 9 entries: compacted
+    assert heap._entries == [handles[9], handles[3], handles[8]] and not heap._dead
+    check_heap(heap)
+    for h in (handles[9], handles[3], handles[8]):
+        heap.delete_node(h)
+    with pytest.raises(KeyError):
+        heap.delete_node(handles[3])
+    assert len(heap) == 0 and heap.root is None
+
+def test_invalid_compact_ratio():
+    for ratio in (0, 1, 1.5):
+        with pytest.raises(ValueError):
+            IndexedMinHeap(compact_ratio=ratio)
+
+@pytest.mark.parametrize("heap_cls, arity", [(IndexedMinHeap, 2), (IndexedMinHeap, 8), (IndexedMaxHeap, 4)])
+def test_iter_sorted(heap_cls, arity):
+    random.seed(30 + arity)
+    heap = heap_cls(arity, compact_ratio=0.9)
+    handles = [heap.insert(random.randint(0, 100), i) for i in range(300)]
+    for h in handles[::4]:
+        heap.delete_node(h)  # Tombstones are skipped
+    before = list(heap._entries)
+    live = sorted((h.key for h in handles if h not in handles[::4]), reverse=heap_cls is IndexedMaxHeap)
+    assert [e.key for e in heap.iter_sorted()] == live
+    assert [e.key for e in heap.iter_sorted(10)] == live[:10]
+    assert list(heap.iter_sorted(0)) == [] and list(IndexedMinHeap().iter_sorted()) == []
+    assert heap._entries == before and len(heap._dead) == 75  # Untouched
+    with pytest.raises(ValueError):
+        heap.iter_sorted(-1)
+
+def test_window_lowest_and_highest_prices():
+    random.seed(40)
+    pt = PriceTracker()
+    start = datetime(2025, 4, 1)
+    prices = [float(random.randint(1, 500)) for _ in range(100)]
+    for i, p in enumerate(prices):
+        pt.add_price(start + timedelta(days=i), p)
+    window = prices[-11:]  # The last 11 daily prices
+    assert pt.lowest_prices(3) == sorted(window)[:3]
+    assert pt.highest_prices(20) == sorted(window, reverse=True)
+    assert pt.get_price_data(start, start + timedelta(days=99))[-1][1][1] == min(window)
@@ -0,0 +1,101 @@
+import pytest
+from MarketTracker import MarketTracker
+from datetime import datetime, timedelta
+import random
+
+def make_rows(num, names, seed):
+    random.seed(seed)
+    cur = datetime(2025, 4, 1)
+    rows = []
+    for i in range(num):
+        cur += timedelta(minutes=random.uniform(0, 90))
+        rows.append((random.choice(names), cur.replace(microsecond=0), round(random.uniform(1, 50), 4)))
+    return rows
+
+def write_csv(path, rows, fmt="%Y-%m-%d %H:%M:%S", header=True, sep=","):
+    with open(path, "w") as f:
+        if header:
+            f.write(f"name{sep}time{sep}price\n")
+        for (name, t, p) in rows:
+            f.write(f"{name}{sep}{t.strftime(fmt)}{sep}{p}\n")
+
+def assert_same_data(mt, expected, names):
+    start, end = datetime(2025, 1, 1), datetime(2026, 1, 1)
+    for name in names:
+        assert mt.get_price_data(name, start, end) == expected.get_price_data(name, start, end)
+
+@pytest.mark.parametrize("chunk_size", [64, 1000, 1 << 20])
+def test_load_matches_add_price(tmp_path, chunk_size):
+    names = ["A", "B", "C"]
+    rows = make_rows(500, names, 1)
+    write_csv(tmp_path / "prices.csv", rows)
+    mt, expected = MarketTracker(), MarketTracker()
+    for name in names:
+        mt.add_asset(name)
+        expected.add_asset(name)
+    for row in rows:
+        expected.add_price(*row)
+    assert mt.load_csv(str(tmp_path / "prices.csv"), chunk_size=chunk_size) == 500
+    assert_same_data(mt, expected, names)
+
+def test_custom_format_and_columns(tmp_path):
+    rows = make_rows(50, ["A"], 2)
+    path = tmp_path / "prices.csv"
+    with open(path, "w") as f:
+        for (name, t, p) in rows:
+            f.write(f"{p};{t.strftime('%d/%m/%Y %H:%M')};{name}\r\n")
+        f.write("\n")
+    mt = MarketTracker()
+    assert mt.load_csv(str(path), time_format="%d/%m/%Y %H:%M", delimiter=";", header=False,
+                       columns=(2, 1, 0), add_assets=True) == 50
+    data = mt.get_price_data("A", datetime(2025, 1, 1), datetime(2026, 1, 1))
+    assert [(t, dp[0]) for (t, dp) in data] == [(t.replace(second=0), p) for (_, t, p) in rows]
+
+def test_pairs_see_rows_in_order(tmp_path):
+    rows = make_rows(300, ["A", "B"], 3)
+    write_csv(tmp_path / "prices.csv", rows)
+    mt, expected = MarketTracker(), MarketTracker()
+    for m in (mt, expected):
+        m.add_asset("A")
+        m.add_asset("B")
+        m.register_pair("A", "B")
+    for row in rows:
+        expected.add_price(*row)
+    mt.load_csv(str(tmp_path / "prices.csv"), chunk_size=500)
+    assert mt.covariance("A", "B") == expected.covariance("A", "B")
+
+def test_alerts_delivered_per_chunk(tmp_path):
+    rows = [("A", datetime(2025, 4, 1, h), float(h % 2)) for h in range(10)]
+    write_csv(tmp_path / "prices.csv", rows)
+    mt = MarketTracker()
+    mt.add_asset("A")
+    batches = []
+    mt.add_alert("A", "above", batches.append, level=0.5)
+    mt.load_csv(str(tmp_path / "prices.csv"))
+    assert len(batches) == 1
+    assert len(batches[0]) == 5
+
+def test_errors(tmp_path):
+    write_csv(tmp_path / "prices.csv", make_rows(10, ["A", "Z"], 4))
+    mt = MarketTracker()
+    mt.add_asset("A")
+    with pytest.raises(KeyError):
+        mt.load_csv(str(tmp_path / "prices.csv"))
+    with open(tmp_path / "bad.csv", "w") as f:
+        f.write("name,time,price\nA,2025-04-01 00:00:00\n")
+    with pytest.raises(ValueError):
+        mt.load_csv(str(tmp_path / "bad.csv"))
+    with open(tmp_path / "bad_time.csv", "w") as f:
+        f.write("name,time,price\nA,yesterday,1.0\n")
+    with pytest.raises(ValueError):
+        mt.load_csv(str(tmp_path / "bad_time.csv"))
+
+def test_add_prices():
+    mt, expected = MarketTracker(), MarketTracker()
+    rows = make_rows(100, ["A"], 5)
+    for m in (mt, expected):
+        m.add_asset("A")
+    for row in rows:
+        expected.add_price(*row)
+    mt.add_prices("A", [t for (_, t, _) in rows], [p for (_, _, p) in rows])
+    assert_same_data(mt, expected, ["A"])
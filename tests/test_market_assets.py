@@ -0,0 +1,47 @@
+import pytest
+from MarketTracker import MarketTracker
+from datetime import datetime, timedelta
+
+@pytest.fixture
+def market():
+    mt = MarketTracker()
+    for name in ["A", "B", "C"]:
+        mt.add_asset(name)
+    return mt
+
+def test_asset_ids(market):
+    assert [market.asset_id(n) for n in ["A", "B", "C"]] == [0, 1, 2]
+    assert market.add_asset("B") == 1
+    assert market.add_asset("D") == 3
+    assert market.asset_name(3) == "D"
+    with pytest.raises(KeyError):
+        market.asset_id("E")
+    with pytest.raises(KeyError):
+        market.asset_name(4)
+
+def test_trackers_created_on_first_price(market):
+    assert market.market_data == {}
+    market.add_price("B", datetime(2025, 4, 1), 2.0)
+    assert list(market.market_data) == ["B"]
+    assert market.get_price_data("A", datetime(2025, 4, 1), datetime(2025, 4, 2)) == []
+
+def test_add_price_id_matches_add_price(market):
+    t = datetime(2025, 4, 1)
+    a, b = market.asset_id("A"), market.asset_id("B")
+    for i in range(50):
+        market.add_price("A", t + timedelta(hours=7 * i), 1.0 + i % 5)
+        market.add_price_id(b, t + timedelta(hours=7 * i), 1.0 + i % 5)
+    da = market.market_data["A"].get_price_data(t, t + timedelta(days=30))
+    db = market.market_data["B"].get_price_data(t, t + timedelta(days=30))
+    assert da == db
+    assert market.last_price("A") == market.last_price("B") == 5.0
+    assert market.last_price("C") is None
+
+def test_unknown_ids(market):
+    t = datetime(2025, 4, 1)
+    with pytest.raises(KeyError):
+        market.add_price("Z", t, 1.0)
+    with pytest.raises(KeyError):
+        market.add_price_id(3, t, 1.0)
+    with pytest.raises(KeyError):
+        market.add_price_id(-1, t, 1.0)
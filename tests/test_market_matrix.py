@@ -0,0 +1,90 @@
+import pytest
+import numpy as np
+from MarketTracker import MarketTracker
+from BST import range_iter, range_query, floor_item
+from AVLTree import AVLTree
+from datetime import datetime, timedelta
+import random
+
+@pytest.fixture
+def market():
+    mt = MarketTracker()
+    mt.add_asset("A")
+    mt.add_asset("B")
+    mt.add_price("A", datetime(2025, 4, 1, 12), 1.0)
+    mt.add_price("A", datetime(2025, 4, 3), 3.0)
+    mt.add_price("A", datetime(2025, 4, 5, 6), 5.0)
+    mt.add_price("B", datetime(2025, 4, 2), 20.0)
+    mt.add_price("B", datetime(2025, 4, 4), 40.0)
+    return mt
+
+def test_range_iter_matches_range_query():
+    random.seed(5)
+    t = AVLTree()
+    for k in random.sample(range(1000), 300):
+        t.insert(k, str(k))
+    for (low, high) in [(-5, 2000), (100, 200), (500, 500), (999, 5000), (3, 1)]:
+        assert list(range_iter(t, low, high)) == range_query(t, low, high)
+
+def test_floor_item():
+    t = AVLTree()
+    for k in [10, 20, 30]:
+        t.insert(k, k)
+    assert floor_item(t, 5) is None
+    assert floor_item(t, 10) == (10, 10)
+    assert floor_item(t, 25) == (20, 20)
+    assert floor_item(t, 99) == (30, 30)
+
+def test_matrix_forward_fill(market):
+    m = market.get_matrix(["A", "B"], datetime(2025, 4, 1), datetime(2025, 4, 6))
+    assert m.shape == (2, 6)
+    expected_a = [np.nan, 1.0, 3.0, 3.0, 3.0, 5.0]
+    expected_b = [np.nan, 20.0, 20.0, 40.0, 40.0, 40.0]
+    np.testing.assert_array_equal(m[0], expected_a)
+    np.testing.assert_array_equal(m[1], expected_b)
+
+def test_matrix_seeds_from_before_start(market):
+    m = market.get_matrix(["B", "A"], datetime(2025, 4, 3), datetime(2025, 4, 4, 12),
+                          resolution=timedelta(hours=12))
+    np.testing.assert_array_equal(m[0], [20.0, 20.0, 40.0, 40.0])
+    np.testing.assert_array_equal(m[1], [3.0, 3.0, 3.0, 3.0])
+
+def test_matrix_fields(market):
+    m = market.get_matrix(["A"], datetime(2025, 4, 6), datetime(2025, 4, 6), field="max")
+    assert m[0, 0] == 5.0
+    m = market.get_matrix(["A"], datetime(2025, 4, 6), datetime(2025, 4, 6), field="avg")
+    assert m[0, 0] == pytest.approx(3.0)
+
+def test_matrix_matches_get_price_data():
+    random.seed(3)
+    mt = MarketTracker()
+    names = ["X", "Y", "Z"]
+    for name in names:
+        mt.add_asset(name)
+        cur = datetime(2025, 4, 1)
+        for i in range(200):
+            cur += timedelta(hours=random.uniform(0, 10))
+            mt.add_price(name, cur, random.uniform(1, 10))
+    start, end, res = datetime(2025, 4, 2), datetime(2025, 4, 30), timedelta(hours=7)
+    m = mt.get_matrix(names, start, end, field="min", resolution=res)
+    for row, name in enumerate(names):
+        data = mt.market_data[name].get_price_data(datetime(2025, 1, 1), end)
+        t = start
+        col = 0
+        while t <= end:
+            known = [dp[1] for (time, dp) in data if time <= t]
+            assert m[row, col] == known[-1]
+            t += res
+            col += 1
+        assert col == m.shape[1]
+
+def test_matrix_errors(market):
+    with pytest.raises(KeyError):
+        market.get_matrix(["A", "C"], datetime(2025, 4, 1), datetime(2025, 4, 2))
+    with pytest.raises(ValueError):
+        market.get_matrix(["A"], datetime(2025, 4, 1), datetime(2025, 4, 2), field="open")
+    with pytest.raises(ValueError):
+        market.get_matrix(["A"], datetime(2025, 4, 1), datetime(2025, 4, 2),
+                          resolution=timedelta(0))
+    with pytest.raises(ValueError):
+        market.get_matrix(["A"], datetime(2025, 4, 2), datetime(2025, 4, 1))
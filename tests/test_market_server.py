@@ -0,0 +1,139 @@
+import asyncio
+import os
+import socket
+import pytest
+from MarketTracker import MarketTracker
+from MarketServer import MarketServer
+from MarketClient import MarketClient
+from datetime import datetime, timedelta
+
+START = datetime(2025, 4, 1)
+
+def make_market():
+    mt = MarketTracker()
+    for name in ("A", "B"):
+        mt.add_asset(name)
+    for i in range(20):
+        mt.add_price("A", START + timedelta(hours=i), 10 + i % 7)
+    mt.add_price("B", START, 3.5)
+    return mt
+
+def serve(tmp_path, market, client_fn, pool_size=2):
+    async def main():
+        path = str(tmp_path / "market.sock")
+        async with MarketServer(market, path):
+            async with MarketClient(path, pool_size=pool_size) as client:
+                return await client_fn(client)
+    return asyncio.run(main())
+
+def test_queries_match_tracker(tmp_path):
+    mt = make_market()
+    end = START + timedelta(days=1)
+
+    async def queries(client):
+        return (await client.get_price_data("A", START, end), await client.latest("A"),
+                await client.latest("B"), await client.snapshot())
+
+    data, latest_a, latest_b, snapshot = serve(tmp_path, mt, queries)
+    assert data == mt.get_price_data("A", START, end)
+    assert latest_a == mt.latest("A") == data[-1]
+    assert latest_b == mt.latest("B")
+    assert snapshot == mt.snapshot()
+
+def test_add_price_and_errors(tmp_path):
+    mt = make_market()
+    mt.add_asset("C")
+
+    async def calls(client):
+        assert await client.latest("C") is None
+        await client.add_price("C", START, 1.25)
+        with pytest.raises(KeyError, match="Z"):
+            await client.add_price("Z", START, 1.0)
+        with pytest.raises(KeyError):
+            await client.get_price_data("Z", START, START)
+        return await client.latest("C")
+
+    assert serve(tmp_path, mt, calls) == (START, (1.25, 1.25, 1.25, 1.25))
+    assert mt.latest("C") == (START, (1.25, 1.25, 1.25, 1.25))
+
+def test_pipelined_requests(tmp_path):
+    mt = MarketTracker()
+    mt.add_asset("A")
+    times = [START + timedelta(minutes=i) for i in range(200)]
+
+    async def pipelined(client):
+        # Adds on one connection arrive in order; spread over the pool they may not
+        await asyncio.gather(*(client.add_price("A", t, float(i)) for i, t in enumerate(times)))
+        return await asyncio.gather(*(client.get_price_data("A", t, t) for t in times[:50]))
+
+    results = serve(tmp_path, mt, pipelined, pool_size=1)
+    assert [r[0][1][0] for r in results] == [float(i) for i in range(50)]
+    assert len(mt.get_price_data("A", times[0], times[-1])) == 200
+
+def test_batch(tmp_path):
+    mt = make_market()
+    end = START + timedelta(days=1)
+
+    async def batch(client):
+        assert await client.batch([]) == []
+        with pytest.raises(ValueError):
+            await client.batch([("delete", ())])
+        return await client.batch([("add_price", ("B", START + timedelta(hours=1), 4.5)),
+                                   ("latest", ("B",)),
+                                   ("latest", ("Z",)),
+                                   ("get_price_data", ("A", START, end)),
+                                   ("snapshot", ())])
+
+    added, latest_b, missing, data, snapshot = serve(tmp_path, mt, batch)
+    assert added is None
+    assert latest_b == (START + timedelta(hours=1), (4.5, 3.5, 4.5, 4.0))
+    assert isinstance(missing, KeyError)
+    assert data == mt.get_price_data("A", START, end)
+    assert snapshot == mt.snapshot()
+
+def test_client_requires_connection(tmp_path):
+    async def main():
+        client = MarketClient(str(tmp_path / "missing.sock"))
+        with pytest.raises(ConnectionError):
+            await client.latest("A")
+    asyncio.run(main())
+    with pytest.raises(ValueError):
+        MarketClient("x", pool_size=0)
+
+def test_close_with_connected_client(tmp_path):
+    async def main():
+        path = str(tmp_path / "market.sock")
+        server = MarketServer(make_market(), path)
+        await server.start()
+        async with MarketClient(path, pool_size=1) as client:
+            assert await client.latest("B") == (START, (3.5, 3.5, 3.5, 3.5))
+            await asyncio.wait_for(server.close(), timeout=5)
+            assert not server._writers
+            with pytest.raises(ConnectionError):
+                await client.latest("B")
+    asyncio.run(main())
+
+def test_socket_path_is_not_taken_over(tmp_path):
+    async def main():
+        path = str(tmp_path / "market.sock")
+        other = tmp_path / "notes.txt"
+        other.write_text("keep me")
+        await MarketServer(make_market(), str(other)).close()  # Never started
+        assert other.read_text() == "keep me"
+        with pytest.raises(OSError):
+            await MarketServer(make_market(), str(other)).start()
+        assert other.read_text() == "keep me"
+        async with MarketServer(make_market(), path):
+            with pytest.raises(OSError):
+                await MarketServer(make_market(), path).start()
+            async with MarketClient(path, pool_size=1) as client:
+                assert await client.latest("B") == (START, (3.5, 3.5, 3.5, 3.5))
+        # A socket left by a server that is gone is replaced
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(path)
+        stale.close()
+        async with MarketServer(make_market(), path):
+            async with MarketClient(path, pool_size=1) as client:
+                assert await client.latest("B") == (START, (3.5, 3.5, 3.5, 3.5))
+        assert not os.path.exists(path)
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+import gc
+import sys
+import tracemalloc
+import pytest
+from MarketTracker import MarketTracker
+from PriceTracker import PriceTracker
+from MemoryUsage import SizeCounter, instance_size
+from AVLTree import AVLNode
+from IndexedHeap import HeapEntry
+from datetime import datetime, timedelta
+import random
+
+START = datetime(2025, 4, 1)
+
+def fill(tracker, num, seed, step=timedelta(hours=1)):
+    random.seed(seed)
+    for i in range(num):
+        tracker.add_price(START + i * step, random.uniform(1, 100))
+
+def test_size_counter_counts_shared_objects_once():
+    counter = SizeCounter()
+    t = (1.5, 2.5)
+    assert counter.add(t) == sys.getsizeof(t)
+    assert counter.add(t) == 0
+    assert counter.add_all([t[0], t[0], t[1]]) == 2 * sys.getsizeof(1.5)
+    assert counter.total == sys.getsizeof(t) + 2 * sys.getsizeof(1.5)
+
+def test_breakdown():
+    pt = PriceTracker()
+    usage = pt.memory_usage()
+    assert usage["time_tree"] == 0
+    empty_heap = sys.getsizeof([]) + sys.getsizeof(set())
+    assert usage["min_heap"] == usage["max_heap"] == empty_heap
+    assert usage["price_data"] == sys.getsizeof({})
+    assert usage["total"] == sys.getsizeof({}) + 2 * empty_heap
+    fill(pt, 500, 1)
+    usage = pt.memory_usage()
+    assert usage["total"] == sum(v for k, v in usage.items() if k != "total")
+    # Every point has an AVL node and each of the 241 prices in the window has two heap
+    # entries, besides the tombstones of expired prices that are not yet compacted
+    assert usage["time_tree"] > 500 * instance_size(AVLNode)
+    for name, heap in (("min_heap", pt._price_heap), ("max_heap", pt._max_heap)):
+        assert len(heap) == 241
+        # The prices in the heaps, also their keys, were already counted in the tree
+        arrays = sys.getsizeof(heap._entries) + sys.getsizeof(heap._dead)
+        expected = arrays + len(heap._entries) * instance_size(HeapEntry)
+        assert usage[name] == pytest.approx(expected, rel=0.01)  # Plus positions above 256
+
+@pytest.mark.parametrize("step", [timedelta(minutes=30), timedelta(hours=6)])
+def test_matches_tracemalloc(step):
+    instance_size(AVLNode), instance_size(HeapEntry)
+    gc.collect()  # Empties the interpreter's free lists, whose reuse tracemalloc does not see
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        pt = PriceTracker()
+        fill(pt, 5000, 2, step)
+        measured = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    assert pt.memory_usage()["total"] == pytest.approx(measured, rel=0.05)
+
+def test_market_memory_usage(tmp_path):
+    mt = MarketTracker(max_resident=2, spill_dir=str(tmp_path))
+    for name in ("A", "B", "C", "D"):
+        mt.add_asset(name)
+    for name in ("A", "B", "C"):
+        fill(mt._get_tracker(mt.asset_id(name), create=True), 50, ord(name))
+    usage = mt.memory_usage()
+    assert set(usage["assets"]) == {"B", "C"}  # A was spilled, D has no prices
+    assert usage["total"]["total"] == usage["assets"]["B"]["total"] + usage["assets"]["C"]["total"]
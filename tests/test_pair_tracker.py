@@ -0,0 +1,107 @@
+import pytest
+import numpy as np
+from MarketTracker import MarketTracker
+from PairTracker import PairTracker
+from datetime import datetime, timedelta
+import random
+
+def make_pair_prices(num, seed):
+    random.seed(seed)
+    cur = datetime(2025, 4, 1)
+    pa, pb = 100.0, 50.0
+    data = []
+    for i in range(num):
+        cur += timedelta(hours=random.uniform(0, 12))
+        shock = random.gauss(0, 0.01)
+        pa *= 1 + shock + random.gauss(0, 0.005)
+        pb *= 1 + 0.5 * shock + random.gauss(0, 0.005)
+        data.append((cur, pa, pb))
+    return data
+
+def brute_force(samples, time, window):
+    ra = [s[1] for s in samples if s[0] >= time - window]
+    rb = [s[2] for s in samples if s[0] >= time - window]
+    return ra, rb
+
+def test_synchronous_ticks_match_numpy():
+    data = make_pair_prices(400, 1)
+    pair = PairTracker("A", "B")
+    samples = []
+    for i, (t, pa, pb) in enumerate(data):
+        pair.update("A", t, pa)
+        pair.update("B", t, pb)
+        if i > 0:
+            samples.append((t, pa / data[i-1][1] - 1, pb / data[i-1][2] - 1))
+        ra, rb = brute_force(samples, t, timedelta(days=10))
+        assert len(pair) == len(ra)
+        if len(ra) >= 2:
+            assert pair.covariance() == pytest.approx(np.cov(ra, rb)[0, 1], rel=1e-6, abs=1e-12)
+            assert pair.correlation() == pytest.approx(np.corrcoef(ra, rb)[0, 1], rel=1e-6)
+        else:
+            assert pair.covariance() is None
+            assert pair.correlation() is None
+
+def test_refresh_time_sampling():
+    pair = PairTracker("A", "B")
+    t = datetime(2025, 4, 1)
+    pair.update("A", t, 1.0)
+    pair.update("A", t + timedelta(hours=1), 2.0)
+    pair.update("B", t + timedelta(hours=2), 10.0)  # First aligned sample, sets the anchor
+    assert len(pair) == 0
+    pair.update("A", t + timedelta(hours=3), 4.0)
+    assert len(pair) == 0  # B has not refreshed yet
+    pair.update("B", t + timedelta(hours=4), 15.0)
+    assert len(pair) == 1
+    assert pair._samples[0][1:] == (1.0, 0.5)
+
+def test_window_expiry():
+    pair = PairTracker("A", "B", window=timedelta(days=1))
+    t = datetime(2025, 4, 1)
+    for i in range(5):
+        pair.update("A", t + timedelta(hours=i), 1.0 + i)
+        pair.update("B", t + timedelta(hours=i), 2.0 + i * i)
+    assert len(pair) == 4
+    pair.update("A", t + timedelta(days=3), 1.0)
+    assert len(pair) == 0
+    assert pair.covariance() is None
+
+def test_invalid_pair():
+    with pytest.raises(ValueError):
+        PairTracker("A", "A")
+    pair = PairTracker("A", "B")
+    with pytest.raises(KeyError):
+        pair.update("C", datetime(2025, 4, 1), 1.0)
+
+def test_market_pairs():
+    mt = MarketTracker()
+    for name in ["A", "B", "C"]:
+        mt.add_asset(name)
+    mt.register_pair("A", "B")
+    mt.register_pair("B", "A")  # Already registered, no effect
+    for (t, pa, pb) in make_pair_prices(200, 2):
+        mt.add_price("A", t, pa)
+        mt.add_price("B", t, pb)
+        mt.add_price("C", t, 1.0)
+    assert mt.correlation("A", "B") == mt.correlation("B", "A")
+    assert mt.correlation("A", "B") > 0.5
+    assert mt.covariance("A", "B") > 0
+    with pytest.raises(KeyError):
+        mt.correlation("A", "C")
+    with pytest.raises(KeyError):
+        mt.register_pair("A", "D")
+
+def test_non_positive_anchor_skips_sample():
+    mt = MarketTracker()
+    for name in ["A", "B"]:
+        mt.add_asset(name)
+    mt.register_pair("A", "B")
+    mt.add_basket("IDX", {"A": 1.0, "B": 1.0})
+    t = datetime(2025, 4, 1)
+    for i, (pa, pb) in enumerate([(1.0, 2.0), (0.0, 2.0), (1.0, 2.0), (2.0, 3.0), (1.0, 1.0)]):
+        mt.add_price("A", t + timedelta(hours=i), pa)
+        mt.add_price("B", t + timedelta(hours=i), pb)
+        assert mt.basket_value("IDX") == pa + pb
+    # The sample anchored at the zero price is skipped
+    ra, rb = [-1.0, 1.0, -0.5], [0.0, 0.5, -2 / 3]
+    assert len(mt._pairs[("A", "B")]) == 3
+    assert mt.covariance("A", "B") == pytest.approx(np.cov(ra, rb)[0, 1])
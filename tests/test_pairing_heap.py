@@ -0,0 +1,98 @@
+import pytest
+import random
+from PairingHeap import PairingHeap, PairingNode
+
+def check_heap(heap):
+    # Walks every tree, checking the links and that no child is smaller than its parent
+    count = 0
+    stack = [] if heap.root is None else [heap.root]
+    assert heap.root is None or (heap.root._prev is None and heap.root._next is None)
+    while stack:
+        node = stack.pop()
+        count += 1
+        prev = node
+        child = node._child
+        while child is not None:
+            assert child._prev is prev
+            assert not child.key < node.key
+            stack.append(child)
+            prev, child = child, child._next
+    assert count == len(heap)
+
+def test_insert_extract_sorted():
+    random.seed(1)
+    keys = [random.randint(0, 1000) for _ in range(500)]
+    heap = PairingHeap()
+    assert heap.root is None
+    for k in keys:
+        heap.insert(k, str(k))
+    check_heap(heap)
+    out = [heap.extract() for _ in range(500)]
+    assert [n.key for n in out] == sorted(keys)
+    assert all(n.value == str(n.key) for n in out)
+    assert len(heap) == 0 and heap.root is None
+    with pytest.raises(KeyError):
+        heap.extract()
+
+def test_delete_and_update_by_handle():
+    random.seed(2)
+    heap, handles = PairingHeap.from_iterable((random.random(), i) for i in range(300))
+    # Extracting pairs up the root's children, so the heap is more than one level deep
+    handles.remove(heap.extract())
+    random.shuffle(handles)
+    for i, h in enumerate(handles[:150]):
+        assert heap.delete_node(h) is h
+        if i % 25 == 0:
+            check_heap(heap)
+    with pytest.raises(KeyError):
+        heap.delete_node(handles[0])  # Already deleted
+    live = handles[150:]
+    for h in live[::3]:
+        heap.update_key(h, random.uniform(-1, 2))
+        check_heap(heap)
+    assert [heap.extract() for _ in range(len(heap))] == sorted(live, key=lambda h: h.key)
+
+def test_sliding_window_matches_min():
+    random.seed(3)
+    heap = PairingHeap()
+    window = []
+    for _ in range(2000):
+        window.append(heap.insert(random.uniform(0, 10)))
+        if len(window) > 50:
+            heap.delete_node(window.pop(random.randrange(len(window))))
+        assert heap.root.key == min(n.key for n in window)
+
+def test_meld():
+    random.seed(4)
+    shards = [PairingHeap.from_iterable((random.randint(0, 99), s) for _ in range(40 * s))[0]
+              for s in range(4)]
+    heap = PairingHeap()
+    for shard in shards:
+        heap.meld(shard)
+        assert len(shard) == 0 and shard.root is None
+    check_heap(heap)
+    assert len(heap) == 240
+    with pytest.raises(ValueError):
+        heap.meld(heap)
+    # Handles from a melded shard stay valid
+    other, nodes = PairingHeap.from_iterable([(5, "a"), (-3, "b")])
+    heap.meld(other)
+    heap.update_key(nodes[0], -10)
+    assert heap.extract() is nodes[0]
+    heap.delete_node(nodes[1])
+    keys = [heap.extract().key for _ in range(len(heap))]
+    assert keys == sorted(keys) and len(keys) == 240
+
+def test_insert_node():
+    heap, other = PairingHeap(), PairingHeap()
+    node = PairingNode(3, "c")
+    assert heap.insert_node(node) is node
+    heap.insert(1)
+    with pytest.raises(ValueError):
+        other.insert_node(node)
+    heap.delete_node(node)
+    with pytest.raises(KeyError):
+        heap.delete_node(node)
+    other.insert(0)
+    other.insert_node(node)
+    assert other.root.key == 0 and len(other) == 2
@@ -0,0 +1,67 @@
+import pytest
+import random
+from PriceTracker import PriceTracker
+from IndexedHeap import IndexedMinHeap
+from Heap import MinHeap
+from test_lab_8 import check_heap
+from datetime import datetime, timedelta
+
+START = datetime(2025, 4, 1)
+
+def test_update_key_linked():
+    random.seed(1)
+    h = MinHeap()
+    nodes = [h.insert(random.randint(0, 100), i) for i in range(100)]
+    for node in random.sample(nodes, 60):
+        h.update_key(node, random.randint(-50, 150))
+        check_heap(h)
+    assert [h.extract().key for _ in range(100)] == sorted(n.key for n in nodes)
+
+def test_update_key_indexed():
+    random.seed(2)
+    h = IndexedMinHeap()
+    entries = [h.insert(random.randint(0, 100), i) for i in range(100)]
+    for entry in random.sample(entries, 60):
+        h.update_key(entry, random.randint(-50, 150))
+        assert h._entries[entry._pos] is entry
+    out = [h.extract() for _ in range(100)]
+    assert [e.key for e in out] == sorted(e.key for e in entries)
+    with pytest.raises(KeyError):
+        h.update_key(out[0], 1)
+
+def test_correct_price_matches_rebuild():
+    random.seed(3)
+    times = [START + timedelta(hours=6 * i) for i in range(100)]
+    prices = [random.uniform(1, 100) for _ in times]
+    pt = PriceTracker()
+    for t, p in zip(times, prices):
+        pt.add_price(t, p)
+    for ix in (99, 90, 60):  # The window holds the last 41 prices
+        prices[ix] = random.uniform(1, 100)
+        pt.correct_price(times[ix], prices[ix])
+        window = prices[59:]
+        assert pt.latest() == (times[-1], (prices[-1], min(window), max(window),
+                                           pytest.approx(sum(window) / len(window))))
+        assert pt.get_price_data(times[ix], times[ix])[0][1][0] == prices[ix]
+    # Adding more prices continues from the corrected window
+    pt.add_price(times[-1] + timedelta(hours=6), 50.0)
+    window = prices[60:] + [50.0]
+    assert pt.latest()[1][1:] == (min(window), max(window), pytest.approx(sum(window) / len(window)))
+
+def test_corrected_point_is_self_consistent():
+    pt = PriceTracker()
+    for i, p in enumerate((5.0, 6.0, 7.0)):
+        pt.add_price(START + timedelta(days=i), p)
+    pt.correct_price(START + timedelta(days=1), 1.0)
+    point = START + timedelta(days=1)
+    assert pt.get_price_data(point, point)[0][1] == (1.0, 1.0, 5.0, pytest.approx(3.0))
+    assert pt.latest()[1] == (7.0, 1.0, 7.0, pytest.approx(13.0 / 3))
+
+def test_correct_price_outside_window():
+    pt = PriceTracker()
+    with pytest.raises(KeyError):
+        pt.correct_price(START, 1.0)
+    pt.add_price(START, 1.0)
+    pt.add_price(START + timedelta(days=11), 2.0)
+    with pytest.raises(KeyError):
+        pt.correct_price(START, 3.0)
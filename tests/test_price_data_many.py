@@ -0,0 +1,48 @@
+import pytest
+from MarketTracker import MarketTracker
+from datetime import datetime, timedelta
+import random
+
+@pytest.fixture(scope="module")
+def market():
+    random.seed(4)
+    mt = MarketTracker()
+    for i in range(6):
+        name = f"S{i}"
+        mt.add_asset(name)
+        cur = datetime(2025, 4, 1)
+        for j in range(150):
+            cur += timedelta(hours=random.uniform(0, 8), microseconds=random.randint(0, 999999))
+            mt.add_price(name, cur, random.uniform(1, 10))
+    mt.add_asset("EMPTY")
+    return mt
+
+def make_requests(num):
+    random.seed(9)
+    names = [f"S{i}" for i in range(6)] + ["EMPTY"]
+    requests = []
+    for i in range(num):
+        start = datetime(2025, 4, 1) + timedelta(hours=random.uniform(0, 600))
+        requests.append((random.choice(names), start, start + timedelta(hours=random.uniform(0, 200))))
+    return requests
+
+def test_get_price_data_uses_tracker_stats(market):
+    tracker = market.market_data["S0"]
+    start, end = datetime(2025, 4, 5), datetime(2025, 4, 20)
+    data = market.get_price_data("S0", start, end)
+    assert data == tracker.get_price_data(start, end)
+    assert len(data) > 0
+    for (t, (price, lo, hi, avg)) in data:
+        assert lo <= price <= hi
+        assert lo <= avg <= hi
+
+def test_many_matches_sequential(market):
+    requests = make_requests(40)
+    expected = [market.get_price_data(*r) for r in requests]
+    assert market.get_price_data_many(requests) == expected
+
+def test_many_empty_and_unknown(market):
+    assert market.get_price_data_many([]) == []
+    with pytest.raises(KeyError):
+        market.get_price_data_many([("S0", datetime(2025, 4, 1), datetime(2025, 4, 2)),
+                                    ("NOPE", datetime(2025, 4, 1), datetime(2025, 4, 2))])
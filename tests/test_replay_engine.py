@@ -0,0 +1,64 @@
+import pytest
+from MarketTracker import MarketTracker
+from ReplayEngine import ReplayEngine, iter_tick_file
+from TickFile import TickWriter
+from datetime import datetime, timedelta
+import random
+
+def make_stream(name, num, seed):
+    random.seed(seed)
+    cur = datetime(2025, 4, 1)
+    ticks = []
+    for i in range(num):
+        cur += timedelta(minutes=random.randint(0, 120))
+        ticks.append((cur, name, random.uniform(1, 50)))
+    return ticks
+
+def test_merge_is_time_ordered_and_stable():
+    streams = [make_stream(f"S{i}", 50 + 10 * i, i) for i in range(5)]
+    engine = ReplayEngine(MarketTracker(), streams)
+    merged = list(engine.merged())
+    expected = sorted((t for s in streams for t in s), key=lambda t: t[0])
+    assert merged == expected  # sorted() is stable, as is the merge
+
+def test_empty_streams():
+    engine = ReplayEngine(MarketTracker(), [[], make_stream("A", 3, 1), []])
+    report = engine.run()
+    assert report.ticks == 3
+    report = ReplayEngine(MarketTracker(), []).run()
+    assert report.ticks == 0
+    assert report.latency["count"] == 0 and report.latency["p99"] is None
+
+def test_run_feeds_market():
+    streams = [make_stream(f"S{i}", 40, i) for i in range(3)]
+    mt, expected = MarketTracker(), MarketTracker()
+    report = ReplayEngine(mt, streams).run()
+    for (t, name, p) in sorted((t for s in streams for t in s), key=lambda t: t[0]):
+        expected.add_asset(name)
+        expected.add_price(name, t, p)
+    assert report.ticks == 120
+    assert report.ticks_per_second > 0
+    assert report.latency["count"] == 120
+    assert report.latency["min"] <= report.latency["p50"] <= report.latency["p99"] <= report.latency["max"]
+    start, end = datetime(2025, 1, 1), datetime(2026, 1, 1)
+    for i in range(3):
+        assert mt.get_price_data(f"S{i}", start, end) == expected.get_price_data(f"S{i}", start, end)
+
+def test_paced_replay():
+    t = datetime(2025, 4, 1)
+    stream = [(t + timedelta(seconds=i), "A", 1.0) for i in range(6)]
+    report = ReplayEngine(MarketTracker(), [stream]).run(speed=50)
+    assert report.elapsed >= 5 / 50
+    with pytest.raises(ValueError):
+        ReplayEngine(MarketTracker(), [stream]).run(speed=0)
+
+def test_tick_file_streams(tmp_path):
+    paths = []
+    for i in range(3):
+        path = str(tmp_path / f"S{i}.bin")
+        stream = make_stream(f"S{i}", 30, i)
+        with TickWriter(path, 8) as w:
+            w.append([n for (_, n, _) in stream], [t for (t, _, _) in stream], [p for (_, _, p) in stream])
+        paths.append(path)
+    engine = ReplayEngine(MarketTracker(), [iter_tick_file(p) for p in paths])
+    assert engine.run().ticks == 90
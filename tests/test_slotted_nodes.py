@@ -0,0 +1,63 @@
+import pytest
+import random
+from AVLTree import AVLTree, AVLNode
+from Heap import MinHeap
+from TreeNode import TreeNode
+
+def check_avl(node, parent=None):
+    # Returns the height of the subtree, checking parents, heights and balance on the way
+    if node is None:
+        return 0
+    assert node.parent is parent
+    l_height, r_height = check_avl(node.left, node), check_avl(node.right, node)
+    assert node.height == 1 + max(l_height, r_height)
+    assert abs(l_height - r_height) <= 1
+    return node.height
+
+def check_heap(node, parent=None):
+    if node is None:
+        return 0
+    assert node.parent is parent
+    assert parent is None or not node.key < parent.key
+    return 1 + check_heap(node.left, node) + check_heap(node.right, node)
+
+def test_nodes_have_no_dict():
+    for node in (TreeNode(1), AVLNode(1)):
+        assert not hasattr(node, "__dict__")
+        with pytest.raises(AttributeError):
+            node.extra = 1
+
+def test_public_setters_still_validate():
+    for node in (TreeNode(1), AVLNode(1)):
+        with pytest.raises(TypeError):
+            node.left = "not a node"
+        with pytest.raises(TypeError):
+            node.right = 5
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_avl_links_and_heights(ordered):
+    random.seed(5)
+    keys = list(range(500)) if ordered else random.sample(range(5000), 500)
+    tree = AVLTree()
+    for i, k in enumerate(keys):
+        tree.insert(k, str(k))
+        if i % 50 == 0:
+            check_avl(tree.root)
+    check_avl(tree.root)
+    random.shuffle(keys)
+    for k in keys[:400]:
+        tree.delete(k)
+    check_avl(tree.root)
+    assert len(tree) == 100
+    assert all(tree.get_value(k) == str(k) for k in keys[400:])
+
+def test_heap_links_after_swaps():
+    random.seed(6)
+    heap = MinHeap()
+    nodes = [heap.insert(random.randint(0, 100)) for _ in range(300)]
+    assert check_heap(heap.root) == 300
+    for node in random.sample(nodes, 100):
+        heap.delete_node(node)
+    for _ in range(100):
+        heap.extract()
+    assert check_heap(heap.root) == len(heap) == 100
@@ -0,0 +1,145 @@
+import pytest
+import numpy as np
+from MarketTracker import MarketTracker
+from TickFile import TickWriter, TickReader, TICK_DTYPE, to_ns
+from datetime import datetime, timedelta
+import random
+
+def make_ticks(num, names, seed, start=datetime(2025, 4, 1)):
+    random.seed(seed)
+    cur = start
+    ticks = []
+    for i in range(num):
+        cur += timedelta(minutes=random.uniform(0, 60), microseconds=random.randint(0, 999999))
+        ticks.append((random.choice(names), cur, random.uniform(1, 50)))
+    return ticks
+
+def write(path, ticks, block_size=16):
+    with TickWriter(path, block_size) as w:
+        w.append([t[0] for t in ticks], [t[1] for t in ticks], [t[2] for t in ticks])
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "ticks.bin")
+    ticks = make_ticks(100, ["A", "B"], 1)
+    write(path, ticks)
+    r = TickReader(path)
+    assert len(r) == 100
+    assert isinstance(r.records, np.memmap)
+    assert r.records.dtype == TICK_DTYPE
+    assert [(r.names[a], t, p) for (a, t, p) in r.records.tolist()] == \
+        [(n, to_ns(t), p) for (n, t, p) in ticks]
+    assert len(r.blocks) == 7
+
+def test_append_extends_partial_block(tmp_path):
+    path = str(tmp_path / "ticks.bin")
+    ticks = make_ticks(60, ["A", "B", "C"], 2)
+    write(path, ticks[:10])
+    write(path, ticks[10:25])
+    write(path, ticks[25:])
+    r = TickReader(path)
+    assert r.block_size == 16
+    assert [r.names[a] for a in r.records["asset"]] == [t[0] for t in ticks]
+    times = r.records["time"]
+    for i, (lo, hi) in enumerate(r.blocks):
+        block = times[16 * i:16 * (i + 1)]
+        assert (lo, hi) == (block.min(), block.max())
+
+def test_range_read_skips_blocks(tmp_path):
+    path = str(tmp_path / "ticks.bin")
+    ticks = make_ticks(400, ["A", "B"], 3)
+    write(path, ticks)
+    r = TickReader(path)
+    start, end = ticks[100][1], ticks[150][1]
+    assert len(list(r.iter_blocks(start, end))) <= 5
+    got = r.read(start, end)
+    assert got["time"].tolist() == [to_ns(t) for (_, t, _) in ticks[100:151]]
+    assert len(r.read(datetime(2030, 1, 1))) == 0
+
+def test_load_ticks_matches_add_price(tmp_path):
+    path = str(tmp_path / "ticks.bin")
+    names = ["A", "B", "C"]
+    ticks = make_ticks(300, names, 4)
+    write(path, ticks)
+    mt, expected = MarketTracker(), MarketTracker()
+    for name in names:
+        expected.add_asset(name)
+    for (name, t, p) in ticks[50:200]:
+        expected.add_price(name, t, p)
+    assert mt.load_ticks(path, ticks[50][1], ticks[199][1], add_assets=True) == 150
+    start, end = datetime(2025, 1, 1), datetime(2026, 1, 1)
+    for name in names:
+        assert mt.get_price_data(name, start, end) == expected.get_price_data(name, start, end)
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / "ticks.bin")
+    names = ["A", "B"]
+    mt = MarketTracker()
+    for name in names:
+        mt.add_asset(name)
+    for (name, t, p) in make_ticks(200, names, 5):
+        mt.add_price(name, t, p)
+    assert mt.save_ticks(path, block_size=32) == 200
+    times = TickReader(path).records["time"]
+    assert (np.diff(times) >= 0).all()
+    restored = MarketTracker()
+    restored.load_ticks(path, add_assets=True)
+    start, end = datetime(2025, 1, 1), datetime(2026, 1, 1)
+    for name in names:
+        assert restored.get_price_data(name, start, end) == mt.get_price_data(name, start, end)
+
+def test_save_twice_and_load(tmp_path):
+    path = str(tmp_path / "ticks.bin")
+    mt = MarketTracker()
+    mt.add_asset("A")
+    t = datetime(2025, 4, 1)
+    for i, p in enumerate([1.0, 7.0, 3.0]):
+        mt.add_price("A", t + timedelta(days=i), p)
+    assert mt.save_ticks(path) == 3
+    assert mt.save_ticks(path) == 3
+    assert len(TickReader(path)) == 3
+    restored = MarketTracker()
+    assert restored.load_ticks(path, add_assets=True) == 3
+    start, end = datetime(2025, 1, 1), datetime(2026, 1, 1)
+    assert restored.get_price_data("A", start, end) == mt.get_price_data("A", start, end)
+    restored.add_price("A", t + timedelta(days=22), 3.0)
+    assert restored.latest("A")[1] == (3.0, 3.0, 3.0, 3.0)
+
+def test_load_rejects_ticks_not_after_last_price(tmp_path):
+    path = str(tmp_path / "ticks.bin")
+    write(path, make_ticks(20, ["A"], 7))
+    mt, expected = MarketTracker(), MarketTracker()
+    mt.load_ticks(path, add_assets=True)
+    expected.load_ticks(path, add_assets=True)
+    with pytest.raises(ValueError):
+        mt.load_ticks(path)
+    start, end = datetime(2025, 1, 1), datetime(2026, 1, 1)
+    assert mt.get_price_data("A", start, end) == expected.get_price_data("A", start, end)
+    csv = tmp_path / "prices.csv"
+    csv.write_text("name,time,price\nB,2025-04-02 00:00:00,1.0\nB,2025-04-01 00:00:00,2.0\n")
+    with pytest.raises(ValueError):
+        mt.load_csv(str(csv), add_assets=True)
+    assert mt.latest("B") is None
+
+def test_not_a_tick_file(tmp_path):
+    path = tmp_path / "junk.bin"
+    path.write_bytes(b"hello world, this is not a tick file")
+    with pytest.raises(ValueError):
+        TickReader(str(path))
+    write(str(tmp_path / "t.bin"), make_ticks(5, ["Z"], 6))
+    with pytest.raises(KeyError):
+        MarketTracker().load_ticks(str(tmp_path / "t.bin"))
+
+def test_reopen_drops_records_past_index(tmp_path):
+    path = str(tmp_path / "ticks.bin")
+    t = datetime(2025, 4, 1)
+    w = TickWriter(path, 4)
+    w.append(["A"] * 3, [t + timedelta(minutes=i) for i in range(3)], [1.0, 2.0, 3.0])
+    w.flush()
+    # Two more records reach the data file, but the writer dies before the index is updated
+    w.append(["A"] * 2, [t + timedelta(minutes=3 + i) for i in range(2)], [10.0, 11.0])
+    w._file.flush()
+    with TickWriter(path) as w2:
+        w2.append(["B"], [t + timedelta(hours=1)], [99.0])
+    r = TickReader(path)
+    assert [(r.names[a], p) for a, _, p in r.records.tolist()] == \
+        [("A", 1.0), ("A", 2.0), ("A", 3.0), ("B", 99.0)]
@@ -0,0 +1,58 @@
+import pytest
+import random
+from MarketTracker import MarketTracker
+from TopK import TopK
+from datetime import datetime, timedelta
+
+START = datetime(2025, 4, 1)
+
+@pytest.mark.parametrize("k", [0, 1, 7, 500])
+def test_top_k_matches_sort(k):
+    random.seed(k)
+    items = [random.randint(0, 60) for _ in range(300)]
+    largest, smallest = TopK(k), TopK(k, largest=False)
+    largest.extend(iter(items))
+    for item in items:
+        smallest.push(item)
+    assert largest.items() == sorted(items, reverse=True)[:k]
+    assert smallest.items() == sorted(items)[:k]
+    assert len(largest) == min(k, 300)
+
+def test_key_and_ties_keep_arrival_order():
+    moves = [("A", 3.0), ("B", -5.0), ("C", 1.0), ("D", 5.0), ("E", -3.0), ("F", 0.5)]
+    top = TopK(3, key=lambda move: abs(move[1]))
+    assert top.extend(moves) == 4  # A, B, C, then D displaces C
+    assert top.items() == [("B", -5.0), ("D", 5.0), ("A", 3.0)]  # E ties A but came later
+    assert top.push(("G", 9.0)) and not top.push(("H", 0.0))
+    assert top.items()[0] == ("G", 9.0)
+    with pytest.raises(ValueError):
+        TopK(-1)
+
+def test_market_top_k():
+    random.seed(9)
+    mt = MarketTracker()
+    mt.add_asset("A")
+    mt.add_asset("B")
+    for i in range(400):
+        mt.add_price("A", START + timedelta(hours=i), random.randint(1, 50))
+    start, end = START + timedelta(days=3), START + timedelta(days=12)
+    data = mt.get_price_data("A", start, end)
+    assert mt.top_k("A", start, end, 5) == sorted(data, key=lambda p: -p[1][0])[:5]
+    assert mt.top_k("A", start, end, 5, field="avg", largest=False) == \
+        sorted(data, key=lambda p: p[1][3])[:5]
+    assert len(mt.top_k("A", start, end, 10 ** 6)) == len(data)
+    assert mt.top_k("B", start, end, 5) == []
+    with pytest.raises(KeyError):
+        mt.top_k("Z", start, end, 5)
+    with pytest.raises(ValueError):
+        mt.top_k("A", start, end, 5, field="volume")
+
+@pytest.mark.parametrize("largest", [True, False])
+def test_eviction_among_ties_keeps_earliest(largest):
+    sign = 1 if largest else -1
+    top = TopK(2, key=lambda x: sign * x[0], largest=largest)
+    top.extend([(5, "a"), (5, "b"), (5, "c"), (6, "d")])
+    assert top.items() == [(6, "d"), (5, "a")]  # b, the later tie, was evicted
+    top = TopK(3, key=lambda x: x[0])
+    top.extend([(5, "a"), (7, "b"), (5, "c"), (5, "d"), (6, "e")])
+    assert top.items() == [(7, "b"), (6, "e"), (5, "a")]
@@ -0,0 +1,140 @@
+import pytest
+import os
+from MarketTracker import MarketTracker
+from PriceTracker import PriceTracker
+from datetime import datetime, timedelta
+import random
+
+def make_ticks(names, num, seed):
+    random.seed(seed)
+    cur = datetime(2025, 4, 1)
+    ticks = []
+    for i in range(num):
+        cur += timedelta(hours=random.uniform(0, 3), microseconds=random.randint(0, 999999))
+        ticks.append((random.choice(names), cur, random.uniform(1, 10)))
+    return ticks
+
+def test_round_trip():
+    pt = PriceTracker()
+    ticks = make_ticks(["A"], 400, 1)
+    for (_, t, p) in ticks[:300]:
+        pt.add_price(t, p)
+    restored = PriceTracker.from_bytes(pt.to_bytes())
+    start, end = datetime(2025, 1, 1), datetime(2026, 1, 1)
+    assert restored.get_price_data(start, end) == pt.get_price_data(start, end)
+    # The rolling window must carry on as if nothing happened
+    for (_, t, p) in ticks[300:]:
+        pt.add_price(t, p)
+        restored.add_price(t, p)
+    assert restored.get_price_data(start, end) == pt.get_price_data(start, end)
+
+def test_round_trip_empty():
+    restored = PriceTracker.from_bytes(PriceTracker().to_bytes())
+    assert restored.get_price_data(datetime(2025, 1, 1), datetime(2026, 1, 1)) == []
+
+def test_invalid_bytes():
+    with pytest.raises(ValueError):
+        PriceTracker.from_bytes(b"nope")
+    with pytest.raises(ValueError):
+        PriceTracker.from_bytes(b"XXXX" + PriceTracker().to_bytes()[4:])
+    pt = PriceTracker()
+    pt.add_price(datetime(2025, 4, 1), 1.0)
+    with pytest.raises(ValueError):
+        PriceTracker.from_bytes(pt.to_bytes()[:-1])
+
+def test_bounded_market_matches_unbounded(tmp_path):
+    names = [f"S{i}" for i in range(8)]
+    bounded = MarketTracker(max_resident=3, spill_dir=str(tmp_path))
+    unbounded = MarketTracker()
+    for name in names:
+        bounded.add_asset(name)
+        unbounded.add_asset(name)
+    start, end = datetime(2025, 1, 1), datetime(2026, 1, 1)
+    for i, (name, t, p) in enumerate(make_ticks(names, 2000, 2)):
+        bounded.add_price(name, t, p)
+        unbounded.add_price(name, t, p)
+        if i % 97 == 0:
+            q = names[i % len(names)]
+            b = bounded._get_tracker(bounded.asset_id(q))
+            u = unbounded._get_tracker(unbounded.asset_id(q))
+            assert (b is None) == (u is None)
+            if b is not None:
+                assert b.get_price_data(start, end) == u.get_price_data(start, end)
+        assert len(bounded.market_data) <= 3
+    for name in names:
+        b = bounded._get_tracker(bounded.asset_id(name))
+        u = unbounded._get_tracker(unbounded.asset_id(name))
+        assert b.get_price_data(start, end) == u.get_price_data(start, end)
+    stats = bounded.cache_stats()
+    assert stats["resident"] == 3
+    assert stats["spilled"] == 5
+    assert len(os.listdir(tmp_path)) == 5
+    assert stats["misses"] > 0 and stats["hits"] > 0
+    assert stats["hit_rate"] == stats["hits"] / (stats["hits"] + stats["misses"])
+    assert stats["reload_time"] > 0
+
+def test_lru_order(tmp_path):
+    mt = MarketTracker(max_resident=2, spill_dir=str(tmp_path))
+    for name in ["A", "B", "C"]:
+        mt.add_asset(name)
+    t = datetime(2025, 4, 1)
+    mt.add_price("A", t, 1.0)
+    mt.add_price("B", t, 2.0)
+    mt.add_price("A", t + timedelta(hours=1), 1.5)
+    mt.add_price("C", t, 3.0)  # B is the least recently used
+    assert sorted(mt.market_data) == ["A", "C"]
+    assert mt.get_matrix(["B"], t, t)[0, 0] == 2.0  # Reloads B and spills A
+    assert sorted(mt.market_data) == ["B", "C"]
+    assert mt.cache_stats()["misses"] == 1
+
+def test_spill_files_are_removed(tmp_path):
+    t = datetime(2025, 4, 1)
+    shared = [MarketTracker(max_resident=1, spill_dir=str(tmp_path)) for _ in range(2)]
+    for i, mt in enumerate(shared):
+        for name in ["A", "B"]:
+            mt.add_asset(name)
+            mt.add_price(name, t, float(i))  # Spills A
+    assert len(os.listdir(tmp_path)) == 2
+    for i, mt in enumerate(shared):  # Markets sharing a directory keep their own files
+        assert mt.get_matrix(["A"], t, t)[0, 0] == float(i)
+    shared[0].close()
+    shared[0].close()
+    assert len(os.listdir(tmp_path)) == 1  # B of the other market
+    del shared, mt
+    assert os.listdir(tmp_path) == []
+    with MarketTracker(max_resident=1) as mt:
+        for name in ["A", "B"]:
+            mt.add_asset(name)
+            mt.add_price(name, t, 1.0)
+        spill_dir = mt._spill_dir
+        assert os.path.isdir(spill_dir)
+    assert not os.path.exists(spill_dir)
+
+def test_snapshot_does_not_reload(tmp_path):
+    mt = MarketTracker(max_resident=2, spill_dir=str(tmp_path))
+    unbounded = MarketTracker()
+    for market in (mt, unbounded):
+        for i, name in enumerate(["A", "B", "C", "D"]):
+            market.add_asset(name)
+            for h in range(3):
+                market.add_price(name, datetime(2025, 4, 1, h), i + h / 2)
+        market.add_asset("E")
+    assert sorted(mt.market_data) == ["C", "D"]
+    assert mt.snapshot() == unbounded.snapshot()
+    assert mt.latest("A") == unbounded.latest("A")
+    assert mt.latest("E") is None
+    assert sorted(mt.market_data) == ["C", "D"]
+    assert mt.cache_stats()["misses"] == 0
+    mt.add_price("A", datetime(2025, 4, 2), 9.0)  # Reloads A, whose point is no longer cached
+    unbounded.add_price("A", datetime(2025, 4, 2), 9.0)
+    assert mt.snapshot() == unbounded.snapshot()
+
+def test_unbounded_has_no_cache_stats():
+    mt = MarketTracker()
+    mt.add_asset("A")
+    mt.add_price("A", datetime(2025, 4, 1), 1.0)
+    stats = mt.cache_stats()
+    assert stats["hit_rate"] is None
+    assert stats["resident"] == 1
+    with pytest.raises(ValueError):
+        MarketTracker(max_resident=0)
@@ -0,0 +1,86 @@
+import pytest
+from MarketTracker import MarketTracker
+from PriceTracker import PriceTracker
+from TrackerStats import LatencyHistogram, _bucket_index, _bucket_upper
+from datetime import datetime, timedelta
+import random
+
+START = datetime(2025, 4, 1)
+
+def test_buckets_are_contiguous():
+    for value in range(5000):
+        ix = _bucket_index(value)
+        assert _bucket_upper(ix) >= value
+        assert ix == 0 or _bucket_upper(ix - 1) < value
+    for value in (10 ** 6, 123456789, 2 ** 40 + 5):
+        upper = _bucket_upper(_bucket_index(value))
+        assert value <= upper <= value * 1.0625
+
+def test_histogram_percentiles():
+    h = LatencyHistogram()
+    assert h.summary()["p50"] is None
+    values = list(range(1, 1001))
+    random.seed(4)
+    random.shuffle(values)
+    for v in values:
+        h.record(v)
+    summary = h.summary()
+    assert summary["count"] == 1000
+    assert summary["min"] == 1 and summary["max"] == 1000
+    assert summary["mean"] == pytest.approx(500.5)
+    for p, exact in (("p50", 500), ("p90", 900), ("p99", 990), ("p99.9", 999)):
+        assert exact <= summary[p] <= exact * 1.0625
+
+def test_histogram_merge():
+    a, b, both = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for v in range(0, 300, 3):
+        a.record(v)
+        both.record(v)
+    for v in range(10 ** 5, 10 ** 6, 9999):
+        b.record(v)
+        both.record(v)
+    a.merge(b)
+    assert a.summary() == both.summary()
+
+def test_price_tracker_stats():
+    pt = PriceTracker()
+    pt.add_price(START, 1.0)
+    assert pt.stats()["ticks"] is None
+    stats = pt.enable_stats()
+    for i in range(1, 30):
+        pt.add_price(START + timedelta(days=i), float(i))
+    result = pt.stats()
+    assert result["ticks"] == stats.ticks == 29
+    assert result["expired"] == 30 - 11  # The window holds the last 11 daily prices
+    assert result["window"] == 11
+    assert result["tree_size"] == 30
+    assert 5 <= result["tree_height"] <= 7
+    assert set(result["latency"]) == {"expire", "heap", "tree"}
+    assert all(s["count"] == 29 for s in result["latency"].values())
+    pt.disable_stats()
+    pt.add_price(START + timedelta(days=40), 1.0)
+    assert stats.ticks == 29
+
+def test_market_stats_survive_spills(tmp_path):
+    mt = MarketTracker(max_resident=1, spill_dir=str(tmp_path))
+    with pytest.raises(RuntimeError):
+        mt.stats()
+    for name in ("A", "B", "C"):
+        mt.add_asset(name)
+    mt.add_price("A", START, 1.0)
+    mt.enable_stats()
+    for i in range(1, 6):
+        for name in ("A", "B"):
+            mt.add_price(name, START + timedelta(hours=i), float(i))
+    mt.add_asset("D")
+    mt.add_price("D", START, 2.0)
+    result = mt.stats()
+    assert result["ticks"] == 11
+    assert result["latency"]["tree"]["count"] == 11
+    assert set(result["assets"]) == {"A", "B", "D"}
+    assert result["assets"]["A"]["ticks"] == 5
+    assert result["assets"]["A"]["window"] is None  # Spilled
+    assert result["assets"]["D"]["window"] == 1
+    mt.disable_stats()
+    with pytest.raises(RuntimeError):
+        mt.stats()